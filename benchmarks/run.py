@@ -0,0 +1,115 @@
+"""Measure throughput and latency of every ElementalLive method against a local stand-in server
+
+    python -m benchmarks.run --output benchmark-results.json
+
+Each method runs single-threaded and from a thread pool sharing one client; results are
+written as JSON so runs can be compared between commits.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from elemental import ElementalLive
+
+from .stub_server import StubElementalServer
+
+EVENT_XML = '<live_event><name>benchmark</name></live_event>'
+
+OPERATIONS: Dict[str, Callable[[ElementalLive], object]] = {
+    'create_event': lambda client: client.create_event(EVENT_XML),
+    'update_event': lambda client: client.update_event('1', EVENT_XML),
+    'delete_event': lambda client: client.delete_event('1'),
+    'cancel_event': lambda client: client.cancel_event('1'),
+    'start_event': lambda client: client.start_event('1'),
+    'stop_event': lambda client: client.stop_event('1'),
+    'reset_event': lambda client: client.reset_event('1'),
+    'event_pause_output': lambda client: client.event_pause_output('1', '1'),
+    'event_unpause_output': lambda client: client.event_unpause_output('1', '1'),
+    'event_start_output': lambda client: client.event_start_output('1', '1'),
+    'event_stop_output': lambda client: client.event_stop_output('1', '1'),
+    'describe_event': lambda client: client.describe_event('1'),
+    'get_event_xml': lambda client: client.get_event_xml('1'),
+    'get_event_status': lambda client: client.get_event_status('1'),
+    'event_can_delete': lambda client: client.event_can_delete('1'),
+    'iter_events': lambda client: sum(1 for _ in client.iter_events(page_size=500)),
+    'find_devices_in_use': lambda client: client.find_devices_in_use(),
+    'get_input_devices': lambda client: client.get_input_devices(),
+    'get_input_device_by_id': lambda client: client.get_input_device_by_id('1'),
+    'generate_preview': lambda client: client.generate_preview('1'),
+}
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def measure(operation: Callable[[ElementalLive], object], client: ElementalLive, iterations: int,
+            concurrency: int) -> Dict[str, float]:
+    def timed(_: int) -> float:
+        started = time.perf_counter()
+        operation(client)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    if concurrency == 1:
+        latencies = [timed(i) for i in range(iterations)]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = list(executor.map(timed, range(iterations)))
+    elapsed = time.perf_counter() - started
+    return {
+        'iterations': iterations,
+        'throughput_rps': iterations / elapsed,
+        'mean_ms': statistics.mean(latencies) * 1000,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=2000, help='events in the scaled event list')
+    parser.add_argument('--devices', type=int, default=2000, help='devices in the scaled device list')
+    parser.add_argument('--iterations', type=int, default=200, help='calls per method and mode')
+    parser.add_argument('--list-iterations', type=int, default=10,
+                        help='calls per mode for methods reading the scaled lists')
+    parser.add_argument('--concurrency', type=int, default=8, help='threads for the concurrent mode')
+    parser.add_argument('--only', nargs='*', choices=sorted(OPERATIONS), help='methods to run')
+    parser.add_argument('--output', default='benchmark-results.json', help='where to write the JSON results')
+    args = parser.parse_args(argv)
+
+    results = []
+    with StubElementalServer(events=args.events, devices=args.devices) as server:
+        client = ElementalLive(server.url, 'benchmark', 'benchmark', pool_maxsize=args.concurrency)
+        for name in args.only or OPERATIONS:
+            list_heavy = name in ('iter_events', 'find_devices_in_use', 'get_input_devices', 'get_input_device_by_id')
+            iterations = args.list_iterations if list_heavy else args.iterations
+            for mode, concurrency in (('single', 1), ('concurrent', args.concurrency)):
+                result = dict(method=name, mode=mode, concurrency=concurrency,
+                              **measure(OPERATIONS[name], client, iterations, concurrency))
+                results.append(result)
+                print(f"{name:24} {mode:10} {result['throughput_rps']:9.1f} req/s "
+                      f"p50 {result['p50_ms']:8.2f} ms  p99 {result['p99_ms']:8.2f} ms", file=sys.stderr)
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            'meta': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                'events': args.events,
+                'devices': args.devices,
+            },
+            'results': results,
+        }, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
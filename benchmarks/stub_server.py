@@ -0,0 +1,137 @@
+"""Local stand-in for an Elemental Live appliance serving the test fixtures
+
+The event and device lists are scaled up from tests/fixtures so list-heavy calls
+can be measured against appliances holding thousands of entries.
+"""
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES = os.path.join(os.path.dirname(__file__), os.pardir, 'tests', 'fixtures')
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+
+def fixture(file_name: str) -> bytes:
+    with open(os.path.join(FIXTURES, file_name), 'rb') as f:
+        return f.read()
+
+
+def _element(document: bytes, tag: str) -> str:
+    text = document.decode('utf-8')
+    return text[text.index(f'<{tag} '):text.rindex(f'</{tag}>') + len(f'</{tag}>')]
+
+
+def scaled_events(count: int) -> Tuple[bytes, ...]:
+    """Copies of the fixture live_event with distinct ids and devices"""
+    template = _element(fixture('sample_event_list.xml'), 'live_event')
+    return tuple(
+        template.replace('/live_events/105', f'/live_events/{event_id}').replace('HD-SDI 1', f'HD-SDI {event_id}')
+        .encode('utf-8')
+        for event_id in range(1, count + 1))
+
+
+def scaled_device_list(count: int) -> bytes:
+    template = _element(fixture('sample_device_list.xml'), 'device')
+    template = template[:template.index('</device>') + len('</device>')]
+    devices = (re.sub(r'<id>\d+</id>', f'<id>{device_id}</id>', template)
+               .replace('/devices/1', f'/devices/{device_id}')
+               .replace('HD-SDI 1', f'HD-SDI {device_id}')
+               .replace('<channel>1</channel>', f'<channel>{device_id}</channel>')
+               for device_id in range(1, count + 1))
+    return f'{XML_DECLARATION}<device_list>{"".join(devices)}</device_list>'.encode('utf-8')
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server: 'StubElementalServer'
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _reply(self, body: bytes, status: int = 200, content_type: str = 'application/xml') -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path == '/live_events':
+            self._reply(self.server.event_list_page(parse_qs(url.query)))
+        elif re.fullmatch(r'/live_events/\d+/status', url.path):
+            self._reply(self.server.responses['status'])
+        elif re.fullmatch(r'/live_events/\d+', url.path):
+            self._reply(self.server.responses['event'])
+        elif url.path == '/devices':
+            self._reply(self.server.responses['devices'])
+        elif re.fullmatch(r'/devices/\d+', url.path):
+            self._reply(self.server.responses['device'])
+        else:
+            self._reply(b'<errors><error>Not found</error></errors>', status=404)
+
+    def do_POST(self) -> None:
+        self._read_body()
+        path = urlparse(self.path).path
+        if path == '/live_events':
+            self._reply(self.server.responses['created'], status=201)
+        elif path == '/inputs/generate_preview':
+            self._reply(self.server.responses['preview'], content_type='application/json')
+        elif re.fullmatch(r'/live_events/\d+/\w+', path):
+            self._reply(b'<live_event/>')
+        else:
+            self._reply(b'<errors><error>Not found</error></errors>', status=404)
+
+    def do_PUT(self) -> None:
+        self._read_body()
+        self._reply(self.server.responses['event'])
+
+    def do_DELETE(self) -> None:
+        self._reply(b'<live_event/>')
+
+
+class StubElementalServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, events: int = 2000, devices: int = 2000, port: int = 0) -> None:
+        super().__init__(('127.0.0.1', port), StubRequestHandler)
+        self.events = scaled_events(events)
+        self.responses: Dict[str, bytes] = {
+            'created': fixture('success_response_for_create.xml'),
+            'event': fixture('sample_event.xml'),
+            'status': fixture('sample_event.xml'),
+            'device': fixture('sample_single_device.xml'),
+            'devices': scaled_device_list(devices),
+            'preview': fixture('success_response_for_generate_preview.json'),
+        }
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_port}'
+
+    def event_list_page(self, query: Dict) -> bytes:
+        if 'per_page' in query:
+            per_page = int(query['per_page'][0])
+            start = (int(query.get('page', ['1'])[0]) - 1) * per_page
+            events = self.events[start:start + per_page]
+        else:
+            events = self.events
+        return XML_DECLARATION.encode('utf-8') + b'<live_event_list>' + b''.join(events) + b'</live_event_list>'
+
+    def __enter__(self) -> 'StubElementalServer':
+        self._thread = threading.Thread(target=self.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+        self.server_close()
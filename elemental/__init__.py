@@ -1,4 +1,19 @@
-from .client import (ConnectionTimeout, ElementalException, ElementalLive,
-                     InvalidRequest, InvalidResponse, NotFound)
+from .allocator import DeviceAllocator
+from .async_client import AsyncElementalLive
+from .bus import EventBus, EventChange
+from .client import (CircuitOpen, ConnectionTimeout, DeadlineExceeded,
+                     DevicesUnavailable, ElementalException, ElementalLive,
+                     InvalidRequest, InvalidResponse, NotFound,
+                     UnexpectedStatus)
+from .fleet import ElementalFleet
+from .models import LiveEvent
+from .poller import EventStatusPoller
+from .reconciler import Reconciler
+from .resilience import CircuitBreaker, RetryPolicy
+from .snapshots import SnapshotStore
+from .templates import EventTemplate
 
-__all__ = ('ConnectionTimeout', 'ElementalException', 'ElementalLive', 'InvalidResponse', 'InvalidRequest', 'NotFound')
+__all__ = ('AsyncElementalLive', 'CircuitBreaker', 'CircuitOpen', 'ConnectionTimeout', 'DeadlineExceeded',
+           'DeviceAllocator', 'DevicesUnavailable', 'ElementalException', 'ElementalFleet', 'ElementalLive',
+           'EventBus', 'EventChange', 'EventStatusPoller', 'EventTemplate', 'InvalidResponse', 'InvalidRequest',
+           'LiveEvent', 'NotFound', 'Reconciler', 'RetryPolicy', 'SnapshotStore', 'UnexpectedStatus')
@@ -0,0 +1,180 @@
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import (Callable, Dict, Iterable, Iterator, List, NamedTuple,
+                    Optional, Tuple, cast)
+
+from .client import DeviceAvailabilityDict, DevicesUnavailable, ElementalLive
+
+# (device_type, channel_type, quad, channel); None stands for "any"
+DeviceKey = Tuple[Optional[str], Optional[str], Optional[bool], Optional[str]]
+
+# Every combination of the four key fields being matched or left open
+_KEY_MASKS = tuple(itertools.product((True, False), repeat=4))
+
+
+def _device_key(device: DeviceAvailabilityDict) -> DeviceKey:
+    return device['device_type'], device['channel_type'], device['quad'] == 'true', device['channel']
+
+
+def _bucket_keys(key: DeviceKey) -> Iterator[DeviceKey]:
+    for mask in _KEY_MASKS:
+        yield cast(DeviceKey, tuple(field if keep else None for field, keep in zip(key, mask)))
+
+
+class DeviceReservation(NamedTuple):
+    device: DeviceAvailabilityDict
+    expires_at: float
+
+
+class DeviceAllocator:
+    """Hand out free input devices of one appliance without two local workers getting the same one
+
+    The inventory from ``get_input_devices`` is indexed by every combination of device_type,
+    channel_type, quad and channel, so finding N free devices matching any of them does not
+    scan the device list. Reserved devices are held back until they are committed (the event
+    using them was created), released, or reservation_ttl seconds pass. The inventory is
+    reloaded on first use, on ``refresh()``, and when older than inventory_ttl seconds.
+
+    The appliance only reports devices of started events as in use, so committed devices
+    stay out of the pool until a reload shows them in use or, with commit_ttl, until that
+    many seconds have passed since the commit (e.g. the event was never started).
+    """
+
+    def __init__(self, client: ElementalLive, reservation_ttl: float = 60.0, inventory_ttl: Optional[float] = None,
+                 commit_ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic) -> None:
+        self.client = client
+        self.reservation_ttl = reservation_ttl
+        self.inventory_ttl = inventory_ttl
+        self.commit_ttl = commit_ttl
+        self.clock = clock
+        self.devices: Dict[str, DeviceAvailabilityDict] = {}
+        self._free: Dict[DeviceKey, Dict[str, None]] = {}
+        self._reservations: Dict[str, DeviceReservation] = {}
+        self._expiry: List[Tuple[float, int, DeviceReservation]] = []
+        self._sequence = itertools.count()
+        # device id -> when it was committed
+        self._committed: Dict[str, float] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def refresh(self, timeout: Optional[int] = None) -> None:
+        devices = self.client.get_input_devices(timeout=timeout)
+        with self._lock:
+            now = self.clock()
+            self.devices = {device['id']: device for device in devices}
+            # Once the appliance reports a committed device as in use it keeps track of it itself
+            self._committed = {
+                device_id: committed_at for device_id, committed_at in self._committed.items()
+                if device_id in self.devices and self.devices[device_id]['availability']
+                and (self.commit_ttl is None or now - committed_at < self.commit_ttl)}
+            self._free = {}
+            for device in devices:
+                if (device['availability'] and device['id'] not in self._reservations
+                        and device['id'] not in self._committed):
+                    self._add_free(device)
+            self._loaded_at = now
+
+    def _add_free(self, device: DeviceAvailabilityDict) -> None:
+        for key in _bucket_keys(_device_key(device)):
+            self._free.setdefault(key, {})[device['id']] = None
+
+    def _remove_free(self, device: DeviceAvailabilityDict) -> None:
+        for key in _bucket_keys(_device_key(device)):
+            self._free[key].pop(device['id'], None)
+
+    def _expire_reservations(self, now: float) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            _, _, reservation = heapq.heappop(self._expiry)
+            self._return(reservation)
+
+    def _return(self, reservation: DeviceReservation) -> None:
+        device_id = reservation.device['id']
+        if self._reservations.get(device_id) is not reservation:
+            return
+        del self._reservations[device_id]
+        device = self.devices.get(device_id)
+        if device is not None and device['availability'] and device_id not in self._committed:
+            self._add_free(device)
+
+    def _ensure_inventory(self, timeout: Optional[int]) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is None or (self.inventory_ttl is not None and self.clock() - loaded_at >= self.inventory_ttl):
+            self.refresh(timeout=timeout)
+
+    def free_count(self, device_type: Optional[str] = None, channel_type: Optional[str] = None,
+                   quad: Optional[bool] = None, channel: Optional[str] = None, timeout: Optional[int] = None) -> int:
+        self._ensure_inventory(timeout)
+        with self._lock:
+            self._expire_reservations(self.clock())
+            return len(self._free.get((device_type, channel_type, quad, channel), ()))
+
+    def reserve(self, count: int = 1, device_type: Optional[str] = None, channel_type: Optional[str] = None,
+                quad: Optional[bool] = None, channel: Optional[str] = None,
+                timeout: Optional[int] = None) -> List[DeviceReservation]:
+        """Reserve count free devices matching every given field, or none of them
+
+        Raises DevicesUnavailable when fewer than count matching devices are free.
+        """
+        self._ensure_inventory(timeout)
+        with self._lock:
+            now = self.clock()
+            self._expire_reservations(now)
+            free = self._free.get((device_type, channel_type, quad, channel), {})
+            if len(free) < count:
+                raise DevicesUnavailable(
+                    f"{count} free devices requested on {self.client.server_url}, {len(free)} available")
+            reservations = []
+            for device_id in list(itertools.islice(free, count)):
+                device = self.devices[device_id]
+                self._remove_free(device)
+                reservation = DeviceReservation(device=device, expires_at=now + self.reservation_ttl)
+                self._reservations[device_id] = reservation
+                heapq.heappush(self._expiry, (reservation.expires_at, next(self._sequence), reservation))
+                reservations.append(reservation)
+            return reservations
+
+    def release(self, reservations: Iterable[DeviceReservation]) -> None:
+        """Give devices back, e.g. because creating the event using them failed"""
+        with self._lock:
+            for reservation in reservations:
+                self._return(reservation)
+
+    def commit(self, reservations: Iterable[DeviceReservation]) -> None:
+        """Mark devices as taken by an event, keeping them out of the pool until the appliance reports them in use
+
+        Raises DevicesUnavailable when some reservations lapsed first: those devices may
+        already belong to another worker. The reservations still held are committed anyway.
+        """
+        with self._lock:
+            now = self.clock()
+            self._expire_reservations(now)
+            lapsed = []
+            for reservation in reservations:
+                device_id = reservation.device['id']
+                if self._reservations.get(device_id) is not reservation:
+                    lapsed.append(device_id)
+                    continue
+                del self._reservations[device_id]
+                self._committed[device_id] = now
+        if lapsed:
+            raise DevicesUnavailable(
+                f"Reservations of devices {', '.join(lapsed)} on {self.client.server_url} lapsed before being committed")
+
+    @contextmanager
+    def reserved(self, count: int = 1, device_type: Optional[str] = None, channel_type: Optional[str] = None,
+                 quad: Optional[bool] = None, channel: Optional[str] = None,
+                 timeout: Optional[int] = None) -> Iterator[List[DeviceReservation]]:
+        """Reserve devices for the block, committing them when it succeeds and releasing them when it raises
+
+        Raises DevicesUnavailable after the block when a reservation lapsed while it ran.
+        """
+        reservations = self.reserve(count, device_type, channel_type, quad, channel, timeout)
+        try:
+            yield reservations
+        except BaseException:
+            self.release(reservations)
+            raise
+        self.commit(reservations)
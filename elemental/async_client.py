@@ -0,0 +1,225 @@
+import asyncio
+from typing import List, NamedTuple, Optional, Set
+
+from .client import (UNDELETABLE_STATUSES, BaseElementalLive,
+                     ConnectionTimeout, DeviceAvailabilityDict, EventIdDict,
+                     EventStatusDict, EventXml, InvalidRequest,
+                     InvalidResponse, NotFound, PreviewUrlDict, _parse_device,
+                     _parse_device_list, _parse_devices_in_use,
+                     _parse_event_id, _parse_event_info, _parse_preview,
+                     _parse_status, _parsing, _preview_request_body)
+from .models import LiveEvent
+from .templates import _event_body
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore
+
+
+class AsyncResponse(NamedTuple):
+    """Fully read response, exposing the attributes the parsers use on requests.Response"""
+    status_code: int
+    content: bytes
+    text: str
+
+
+class AsyncElementalLive(BaseElementalLive):
+    """asyncio counterpart of ElementalLive, backed by an aiohttp.ClientSession
+
+    Requires the optional ``aiohttp`` dependency (``pip install python-elemental[async]``).
+    The session is created lazily on first use so the client can be built outside
+    a running event loop; close it with ``await client.close()`` or use the client
+    as an async context manager. A session passed in is left open for its owner.
+
+    timeout bounds connecting and each read, like the requests timeout of ElementalLive,
+    and timeouts map onto the same exceptions: ConnectionTimeout when the connection
+    could not be made, InvalidRequest otherwise.
+    """
+
+    def __init__(self, server_url: str, user: Optional[str] = None, api_key: Optional[str] = None,
+                 timeout: Optional[int] = 5, header_refresh_margin: int = 10,
+                 session: Optional['aiohttp.ClientSession'] = None) -> None:
+        if aiohttp is None:
+            raise ImportError("AsyncElementalLive requires aiohttp, install python-elemental[async]")
+        super().__init__(server_url, user, api_key, timeout, header_refresh_margin)
+        self.session = session
+        self._owns_session = session is None
+
+    async def __aenter__(self) -> 'AsyncElementalLive':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self.session is not None and self._owns_session:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+        return self.session
+
+    async def send_request(self, http_method: str, url: str, headers: dict,
+                           body: Optional[str] = "", timeout: Optional[int] = None) -> AsyncResponse:
+        # Send request according to different methods
+        timeout = timeout or self.timeout
+        try:
+            async with self._get_session().request(
+                    method=http_method, url=url, data=body, headers=headers,
+                    timeout=aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout)) as response:
+                content = await response.read()
+                status_code = response.status
+        except aiohttp.ConnectionTimeoutError as e:
+            raise ConnectionTimeout(f"{http_method}: {url} failed\n{e}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise InvalidRequest(f"{http_method}: {url} failed\n{e}")
+        text = content.decode('utf-8', errors='replace')
+        if status_code == 404:
+            raise NotFound(
+                f"{http_method}: {url} failed\nResponse: "
+                f"{status_code}\n{text}")
+        if status_code not in (200, 201):
+            raise InvalidResponse(
+                f"{http_method}: {url} failed\nResponse: "
+                f"{status_code}\n{text}")
+        return AsyncResponse(status_code=status_code, content=content, text=text)
+
+    async def create_event(self, event_xml: EventXml, timeout: Optional[int] = None) -> EventIdDict:
+        url = f'{self.server_url}/live_events'
+        headers = self.generate_headers(url)
+        response = await self.send_request(
+            http_method="POST", url=url, headers=headers, body=_event_body(event_xml), timeout=timeout)
+        with _parsing("POST", url):
+            return _parse_event_id(response.content)
+
+    async def update_event(self, event_id: str, event_xml: EventXml, restart: Optional[bool] = False,
+                           timeout: Optional[int] = None) -> None:
+        url = f'{self.server_url}/live_events/{event_id}'
+        if restart:
+            url += '?unlocked=1'
+        headers = self.generate_headers(url)
+        await self.send_request(
+            http_method="PUT", url=url, headers=headers, body=_event_body(event_xml), timeout=timeout)
+
+    async def delete_event(self, event_id: str, timeout: Optional[int] = None) -> None:
+        url = f'{self.server_url}/live_events/{event_id}'
+        headers = self.generate_headers(url)
+        await self.send_request(http_method="DELETE", url=url, headers=headers, timeout=timeout)
+
+    async def cancel_event(self, event_id: str, timeout: Optional[int] = None) -> None:
+        url = f'{self.server_url}/live_events/{event_id}/cancel'
+        headers = self.generate_headers(url)
+        await self.send_request(http_method="POST", url=url, headers=headers, timeout=timeout)
+
+    async def start_event(self, event_id: str, timeout: Optional[int] = None) -> None:
+        url = f'{self.server_url}/live_events/{event_id}/start'
+        body = "<start></start>"
+        headers = self.generate_headers(url)
+        await self.send_request(http_method="POST", url=url, headers=headers, body=body, timeout=timeout)
+
+    async def stop_event(self, event_id: str, timeout: Optional[int] = None) -> None:
+        url = f'{self.server_url}/live_events/{event_id}/stop'
+        body = "<stop></stop>"
+        headers = self.generate_headers(url)
+        await self.send_request(http_method="POST", url=url, headers=headers, body=body, timeout=timeout)
+
+    async def _output_action(self, event_id: str, output_id: str, action: str, timeout: Optional[int]) -> None:
+        url = f'{self.server_url}/live_events/{event_id}/{action}'
+        body = f"<output_id>{output_id}</output_id>"
+        headers = self.generate_headers(url)
+        await self.send_request(http_method="POST", url=url, headers=headers, body=body, timeout=timeout)
+
+    async def event_pause_output(self, event_id: str, output_id: str, timeout: Optional[int] = None) -> None:
+        await self._output_action(event_id, output_id, 'pause_output', timeout)
+
+    async def event_unpause_output(self, event_id: str, output_id: str, timeout: Optional[int] = None) -> None:
+        await self._output_action(event_id, output_id, 'unpause_output', timeout)
+
+    async def event_start_output(self, event_id: str, output_id: str, timeout: Optional[int] = None) -> None:
+        await self._output_action(event_id, output_id, 'start_output', timeout)
+
+    async def event_stop_output(self, event_id: str, output_id: str, timeout: Optional[int] = None) -> None:
+        await self._output_action(event_id, output_id, 'stop_output', timeout)
+
+    async def reset_event(self, event_id: str, timeout: Optional[int] = None) -> None:
+        url = f'{self.server_url}/live_events/{event_id}/reset'
+        headers = self.generate_headers(url)
+        await self.send_request(http_method="POST", url=url, headers=headers, body="", timeout=timeout)
+
+    async def describe_event(self, event_id: str, timeout: Optional[int] = None) -> EventStatusDict:
+        url = f'{self.server_url}/live_events/{event_id}'
+        headers = self.generate_headers(url)
+        response = await self.send_request(http_method="GET", url=url,
+                                           headers=headers, timeout=timeout)
+        with _parsing("GET", url):
+            return _parse_event_info(response.content)
+
+    async def get_event(self, event_id: str, timeout: Optional[int] = None) -> LiveEvent:
+        url = f'{self.server_url}/live_events/{event_id}'
+        headers = self.generate_headers(url)
+        response = await self.send_request(http_method="GET", url=url, headers=headers, timeout=timeout)
+        with _parsing("GET", url):
+            return LiveEvent.from_xml(response.content)
+
+    async def get_event_xml(self, event_id: str, timeout: Optional[int] = None) -> str:
+        url = f'{self.server_url}/live_events/{event_id}'
+        headers = self.generate_headers(url)
+        response = await self.send_request(http_method="GET", url=url,
+                                           headers=headers, timeout=timeout)
+        return response.text
+
+    async def get_event_status(self, event_id: str, timeout: Optional[int] = None) -> str:
+        url = f'{self.server_url}/live_events/{event_id}/status'
+        headers = self.generate_headers(url)
+        response = await self.send_request(http_method="GET", url=url, headers=headers, timeout=timeout)
+        with _parsing("GET", url):
+            return _parse_status(response.content)
+
+    async def find_devices_in_use(self, timeout: Optional[int] = None) -> Set[Optional[str]]:
+        events_url = f'{self.server_url}/live_events?filter=active'
+        events_headers = self.generate_headers(events_url)
+        events = await self.send_request(
+            http_method="GET", url=events_url, headers=events_headers, timeout=timeout)
+        with _parsing("GET", events_url):
+            return _parse_devices_in_use(events.text)
+
+    async def get_input_devices(self, timeout: Optional[int] = None) -> List[DeviceAvailabilityDict]:
+        devices_url = f'{self.server_url}/devices'
+        devices_headers = self.generate_headers(devices_url)
+        # The device list and the active events are independent, fetch them concurrently
+        devices, devices_in_use = await asyncio.gather(
+            self.send_request(http_method="GET", url=devices_url, headers=devices_headers, timeout=timeout),
+            self.find_devices_in_use())
+        with _parsing("GET", devices_url):
+            return _parse_device_list(devices.content, devices_in_use)
+
+    async def get_input_device_by_id(self, input_device_id: str,
+                                     timeout: Optional[int] = None) -> DeviceAvailabilityDict:
+        devices_url = f'{self.server_url}/devices/{input_device_id}'
+        devices_headers = self.generate_headers(devices_url)
+        devices, devices_in_use = await asyncio.gather(
+            self.send_request(http_method="GET", url=devices_url, headers=devices_headers, timeout=timeout),
+            self.find_devices_in_use())
+        with _parsing("GET", devices_url):
+            return _parse_device(devices.content, devices_in_use)
+
+    async def generate_preview(self, input_id: str, timeout: Optional[int] = None) -> PreviewUrlDict:
+        url = f'{self.server_url}/inputs/generate_preview'
+        headers = self.generate_headers(url)
+
+        headers['Accept'] = '*/*'
+        headers['Content-Type'] = 'application/x-www-form-urlencoded; ' \
+                                  'charset=UTF-8'
+
+        data = _preview_request_body(input_id)
+        response = await self.send_request(
+            http_method="POST", url=url, headers=headers, body=data, timeout=timeout)
+
+        return _parse_preview(self.server_url, response.status_code, response.content)
+
+    async def event_can_delete(self, channel_id: str, timeout: Optional[int] = None) -> bool:
+        channel_info = await self.describe_event(channel_id, timeout=timeout)
+        return channel_info['status'] not in UNDELETABLE_STATUSES
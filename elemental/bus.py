@@ -0,0 +1,163 @@
+import asyncio
+import functools
+import logging
+import threading
+from typing import (AsyncIterator, Callable, Collection, Dict, Iterable, List,
+                    NamedTuple, Optional)
+
+from .client import ElementalLive, EventSummaryDict
+from .poller import _PollingThread
+
+logger = logging.getLogger(__name__)
+
+CREATED = 'created'
+DELETED = 'deleted'
+STATUS_CHANGED = 'status_changed'
+DESTINATIONS_CHANGED = 'destinations_changed'
+
+CHANGE_KINDS = (CREATED, DELETED, STATUS_CHANGED, DESTINATIONS_CHANGED)
+
+
+class EventChange(NamedTuple):
+    """One difference between two consecutive listings of an appliance
+
+    previous is None for CREATED and current is None for DELETED.
+    """
+    kind: str
+    server_url: str
+    event_id: str
+    previous: Optional[EventSummaryDict]
+    current: Optional[EventSummaryDict]
+
+
+ChangeCallback = Callable[[EventChange], None]
+
+
+def diff_events(server_url: str, previous: Dict[str, EventSummaryDict],
+                current: Dict[str, EventSummaryDict]) -> List[EventChange]:
+    changes = []
+    for event_id, event in current.items():
+        before = previous.get(event_id)
+        if before is None:
+            changes.append(EventChange(CREATED, server_url, event_id, None, event))
+            continue
+        if before['status'] != event['status']:
+            changes.append(EventChange(STATUS_CHANGED, server_url, event_id, before, event))
+        if before['destinations'] != event['destinations']:
+            changes.append(EventChange(DESTINATIONS_CHANGED, server_url, event_id, before, event))
+    for event_id, before in previous.items():
+        if event_id not in current:
+            changes.append(EventChange(DELETED, server_url, event_id, before, None))
+    return changes
+
+
+class _Subscription(NamedTuple):
+    callback: ChangeCallback
+    kinds: Optional[Collection[str]]
+    server_urls: Optional[Collection[str]]
+
+    def wants(self, change: EventChange) -> bool:
+        return ((self.kinds is None or change.kind in self.kinds)
+                and (self.server_urls is None or change.server_url in self.server_urls))
+
+
+class EventBus:
+    """Poll each appliance on one background thread and fan its event changes out to subscribers
+
+    Every interval seconds each appliance is listed once with ``iter_events`` and the listing
+    is diffed with the previous one, however many subscribers there are. The first listing
+    of an appliance only sets the baseline (read it from ``snapshot``); later ones publish
+    EventChange records to callbacks registered with ``subscribe`` and to ``stream`` async
+    iterators. Callbacks run on the polling threads and must not block for long.
+    """
+
+    def __init__(self, clients: Iterable[ElementalLive], interval: float = 5.0, page_size: int = 100,
+                 timeout: Optional[int] = None) -> None:
+        self.clients: Dict[str, ElementalLive] = {client.server_url: client for client in clients}
+        self.interval = interval
+        self.page_size = page_size
+        self.timeout = timeout
+        self._snapshots: Dict[str, Dict[str, EventSummaryDict]] = {}
+        self._subscriptions: List[_Subscription] = []
+        self._lock = threading.Lock()
+        self._threads: List[_PollingThread] = []
+
+    def snapshot(self, server_url: str) -> Dict[str, EventSummaryDict]:
+        """Events of server_url as of its last successful listing, keyed by id"""
+        with self._lock:
+            return dict(self._snapshots.get(server_url, {}))
+
+    def subscribe(self, callback: ChangeCallback, kinds: Optional[Collection[str]] = None,
+                  server_urls: Optional[Collection[str]] = None) -> Callable[[], None]:
+        """Call callback with every matching EventChange; returns a function that unsubscribes it"""
+        subscription = _Subscription(callback, kinds, server_urls)
+        with self._lock:
+            self._subscriptions.append(subscription)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if subscription in self._subscriptions:
+                    self._subscriptions.remove(subscription)
+        return unsubscribe
+
+    async def stream(self, kinds: Optional[Collection[str]] = None, server_urls: Optional[Collection[str]] = None,
+                     max_queued: int = 1000) -> AsyncIterator[EventChange]:
+        """Yield matching changes on the running event loop
+
+        At most max_queued changes wait for the consumer; past that the oldest are dropped.
+        """
+        loop = asyncio.get_running_loop()
+        queue: 'asyncio.Queue[EventChange]' = asyncio.Queue(max_queued)
+
+        def offer(change: EventChange) -> None:
+            if queue.full():
+                logger.warning("Event change stream is full, dropping %s", queue.get_nowait())
+            queue.put_nowait(change)
+
+        def publish(change: EventChange) -> None:
+            loop.call_soon_threadsafe(offer, change)
+
+        unsubscribe = self.subscribe(publish, kinds, server_urls)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            unsubscribe()
+
+    def poll(self, server_url: str) -> List[EventChange]:
+        """List server_url once and publish what changed since the previous listing"""
+        client = self.clients[server_url]
+        current = {event['id']: event for event in client.iter_events(page_size=self.page_size, timeout=self.timeout)}
+        with self._lock:
+            previous = self._snapshots.get(server_url)
+            self._snapshots[server_url] = current
+            subscriptions = list(self._subscriptions)
+        if previous is None:
+            return []
+
+        changes = diff_events(server_url, previous, current)
+        for change in changes:
+            for subscription in subscriptions:
+                if subscription.wants(change):
+                    try:
+                        subscription.callback(change)
+                    except Exception:
+                        logger.exception("Event change callback failed for %s on %s", change.event_id, server_url)
+        return changes
+
+    def start(self) -> None:
+        """Start one daemon polling thread per appliance"""
+        if self._threads:
+            return
+        for server_url in self.clients:
+            thread = _PollingThread(functools.partial(self.poll, server_url), self.interval, f'EventBus({server_url})',
+                                    server_url)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        for thread in self._threads:
+            thread.stop()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
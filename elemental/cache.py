@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import (Any, Callable, Dict, Generic, Hashable, Optional, Tuple,
+                    TypeVar)
+
+V = TypeVar('V')
+T = TypeVar('T')
+
+MISSING: Any = object()
+
+
+class TTLCache(Generic[V]):
+    """Thread-safe mapping whose entries expire ttl seconds after they were stored
+
+    When max_entries is set the least recently used entries are evicted first.
+    ``hits`` and ``misses`` count lookups so callers can tell whether the cache pays off.
+    """
+
+    def __init__(self, ttl: float, max_entries: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[float, V]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> V:
+        """Return the fresh value stored for key, or MISSING"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self.clock() >= entry[0]:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop key, or every entry when key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one call whose outcome they all share
+
+    The first caller of ``run`` for a key runs fn; callers arriving while it runs wait and
+    get the same result, or the same exception, without calling fn. With a ttl, a result
+    also keeps being returned for that many seconds after it arrived. ``calls`` counts fn
+    invocations and ``shared`` the callers that were answered without one.
+    """
+
+    def __init__(self, ttl: float = 0, max_entries: Optional[int] = 1024,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.results: Optional[TTLCache[Any]] = TTLCache(ttl, max_entries, clock) if ttl > 0 else None
+        self.calls = 0
+        self.shared = 0
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def run(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            if self.results is not None:
+                result = self.results.get(key)
+                if result is not MISSING:
+                    self.shared += 1
+                    return result
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                self.calls += 1
+            else:
+                self.shared += 1
+        assert future is not None
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                self._finish(key, future)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            # Invalidated while running: the result may predate the change, so it is not reused
+            if self._finish(key, future) and self.results is not None:
+                self.results.set(key, result)
+        future.set_result(result)
+        return result
+
+    def _finish(self, key: Hashable, future: Future) -> bool:
+        if self._in_flight.get(key) is not future:
+            return False
+        del self._in_flight[key]
+        return True
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Forget the result of key, or of every key; later callers no longer join calls already in flight"""
+        with self._lock:
+            if key is None:
+                self._in_flight.clear()
+            else:
+                self._in_flight.pop(key, None)
+            if self.results is not None:
+                self.results.invalidate(key)
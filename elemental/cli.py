@@ -0,0 +1,159 @@
+"""Run operations against one or many Elemental Live appliances, printing newline-delimited JSON
+
+    elemental --all status | jq 'select(.status == "error")'
+    elemental -s http://elemental-1 -s http://elemental-2 stop 12 13
+    elemental --all output pause 12 3
+
+Appliances are given with --server (repeatable) or, with --all, read from the
+comma-separated ELEMENTAL_SERVERS variable, before or after the command; credentials come from --user/--api-key or
+ELEMENTAL_USER/ELEMENTAL_API_KEY. Every appliance/event pair is handled concurrently
+and each result is printed as soon as it arrives, one JSON object per line. Failures
+are printed as objects with an "error" key and make the command exit with status 1.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Tuple)
+
+from .client import ElementalException, ElementalLive, _map_concurrently
+
+Record = Dict[str, Any]
+
+# (server_url, event_id or None, output_id or None)
+Target = Tuple[str, Optional[str], Optional[str]]
+
+
+def _status(client: ElementalLive, event_id: Optional[str], output_id: Optional[str],
+            timeout: Optional[int]) -> Iterator[Record]:
+    if event_id is None:
+        for event in client.iter_events(timeout=timeout):
+            yield {'event_id': event['id'], 'name': event['name'], 'status': event['status']}
+    else:
+        yield {'event_id': event_id, 'status': client.get_event_status(event_id, timeout=timeout)}
+
+
+def _describe(client: ElementalLive, event_id: Optional[str], output_id: Optional[str],
+              timeout: Optional[int]) -> Iterator[Record]:
+    assert event_id is not None
+    yield dict(client.describe_event(event_id, timeout=timeout), event_id=event_id)
+
+
+def _devices(client: ElementalLive, event_id: Optional[str], output_id: Optional[str],
+             timeout: Optional[int]) -> Iterator[Record]:
+    for device in client.get_input_devices(timeout=timeout):
+        yield dict(device)
+
+
+def _event_action(name: str) -> Callable[[ElementalLive, Optional[str], Optional[str], Optional[int]],
+                                         Iterator[Record]]:
+    def run(client: ElementalLive, event_id: Optional[str], output_id: Optional[str],
+            timeout: Optional[int]) -> Iterator[Record]:
+        assert event_id is not None
+        getattr(client, f'{name}_event')(event_id, timeout=timeout)
+        yield {'event_id': event_id, 'action': name, 'ok': True}
+    return run
+
+
+def _output_action(name: str) -> Callable[[ElementalLive, Optional[str], Optional[str], Optional[int]],
+                                          Iterator[Record]]:
+    def run(client: ElementalLive, event_id: Optional[str], output_id: Optional[str],
+            timeout: Optional[int]) -> Iterator[Record]:
+        assert event_id is not None and output_id is not None
+        getattr(client, f'event_{name}_output')(event_id, output_id, timeout=timeout)
+        yield {'event_id': event_id, 'output_id': output_id, 'action': name, 'ok': True}
+    return run
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='elemental', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-s', '--server', action='append', default=[], help='appliance URL, may be repeated')
+    parser.add_argument('--all', action='store_true', help='every appliance listed in ELEMENTAL_SERVERS')
+    parser.add_argument('--user', default=os.environ.get('ELEMENTAL_USER'))
+    parser.add_argument('--api-key', default=os.environ.get('ELEMENTAL_API_KEY'))
+    parser.add_argument('--timeout', type=int, default=5, help='seconds per request')
+    parser.add_argument('--workers', type=int, default=32, help='requests in flight at once')
+    commands = parser.add_subparsers(dest='command', required=True)
+    # --server and --all are also accepted after the command; their own dests keep both places counting
+    appliance_options = argparse.ArgumentParser(add_help=False)
+    appliance_options.add_argument('-s', '--server', action='append', default=[], dest='command_server',
+                                   help='appliance URL, may be repeated')
+    appliance_options.add_argument('--all', action='store_true', dest='command_all',
+                                   help='every appliance listed in ELEMENTAL_SERVERS')
+
+    def add_command(name: str, **kwargs: Any) -> argparse.ArgumentParser:
+        return commands.add_parser(name, parents=[appliance_options], **kwargs)
+
+    status = add_command('status', help='status of the given events, or of every event')
+    status.add_argument('event_ids', nargs='*')
+    status.set_defaults(run=_status)
+    describe = add_command('describe', help='status and destinations of events')
+    describe.add_argument('event_ids', nargs='+')
+    describe.set_defaults(run=_describe)
+    for action in ('start', 'stop', 'cancel'):
+        command = add_command(action, help=f'{action} events')
+        command.add_argument('event_ids', nargs='+')
+        command.set_defaults(run=_event_action(action))
+    output = add_command('output', help='pause or unpause an output of events')
+    output.add_argument('action', choices=('pause', 'unpause'))
+    output.add_argument('event_ids', nargs='+', metavar='event_id')
+    output.add_argument('output_id')
+    output.set_defaults(run=None)
+    devices = add_command('devices', help='input devices and whether they are in use')
+    devices.set_defaults(run=_devices, event_ids=[])
+    return parser
+
+
+def _server_urls(args: argparse.Namespace) -> List[str]:
+    server_urls = list(args.server) + list(args.command_server)
+    if args.all or args.command_all:
+        server_urls.extend(url.strip() for url in os.environ.get('ELEMENTAL_SERVERS', '').split(',') if url.strip())
+    return list(dict.fromkeys(server_urls))
+
+
+def _targets(server_urls: Iterable[str], event_ids: List[str], output_id: Optional[str]) -> List[Target]:
+    if not event_ids:
+        return [(server_url, None, None) for server_url in server_urls]
+    return [(server_url, event_id, output_id) for server_url in server_urls for event_id in event_ids]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    server_urls = _server_urls(args)
+    if not server_urls:
+        parser.error('no appliance given, use --server or --all with ELEMENTAL_SERVERS set')
+
+    run = args.run or _output_action(args.action)
+    clients = {url: ElementalLive(url, args.user, args.api_key, timeout=args.timeout, pool_maxsize=args.workers)
+               for url in server_urls}
+    targets = _targets(server_urls, args.event_ids, getattr(args, 'output_id', None))
+
+    output_lock = threading.Lock()
+
+    def write(server_url: str, record: Record) -> None:
+        with output_lock:
+            sys.stdout.write(json.dumps(dict(server_url=server_url, **record)) + '\n')
+            sys.stdout.flush()
+
+    def call(target: Target) -> None:
+        server_url, event_id, output_id = target
+        for record in run(clients[server_url], event_id, output_id, args.timeout):
+            write(server_url, record)
+
+    failed = False
+    try:
+        for (server_url, event_id, output_id), future in _map_concurrently(call, targets, args.workers):
+            try:
+                future.result()
+            except ElementalException as e:
+                failed = True
+                write(server_url, {'event_id': event_id, 'error': str(e), 'error_type': type(e).__name__})
+    except BrokenPipeError:
+        # The reader (e.g. head) went away, nothing left to report to
+        sys.stderr.close()
+        return 1
+    return 1 if failed else 0
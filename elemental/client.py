@@ -1,12 +1,35 @@
-import ast
+import functools
 import hashlib
+import json
+import logging
+import random
+import threading
 import time
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional, Set, TypedDict
-from urllib.parse import urlparse
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import as_completed
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import MappingProxyType
+from typing import (TYPE_CHECKING, Any, Callable, Collection, Dict, FrozenSet,
+                    Hashable, Iterable, Iterator, List, Mapping, Optional, Set,
+                    Tuple, TypedDict, TypeVar, Union, cast)
+from urllib.parse import urlencode, urlparse
 
 import requests
-import xmltodict  # type: ignore
+from requests.adapters import HTTPAdapter
+
+from .cache import MISSING, SingleFlight, TTLCache
+from .fingerprint import event_changed, event_fingerprint
+from .models import LiveEvent
+from .resilience import CircuitBreaker, RetryPolicy
+from .templates import BoundEventTemplate, _event_body
+
+if TYPE_CHECKING:
+    from .snapshots import SnapshotStore
+
+logger = logging.getLogger(__name__)
 
 
 class ElementalException(Exception):
@@ -34,6 +57,37 @@ class ConnectionTimeout(ElementalException):
     pass
 
 
+class DeadlineExceeded(ElementalException):
+    """Exception reported for calls that did not finish before a batch deadline"""
+    pass
+
+
+class CircuitOpen(ElementalException):
+    """Exception raised by 'request' without contacting an appliance whose circuit breaker is open"""
+    pass
+
+
+class DevicesUnavailable(ElementalException):
+    """Exception raised by 'DeviceAllocator.reserve' when too few matching devices are free"""
+    pass
+
+
+class UnexpectedStatus(ElementalException):
+    """Exception raised by 'wait_for_status' when an event reaches a status it cannot recover from"""
+
+    def __init__(self, message: str, status: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+OUTPUT_ACTIONS = ('pause', 'unpause', 'start', 'stop')
+
+# Events in these states have to be stopped or cancelled before they can be deleted
+UNDELETABLE_STATUSES = ('pending', 'running', 'preprocessing', 'postprocessing')
+
+K = TypeVar('K')
+T = TypeVar('T')
+
 EventIdDict = TypedDict('EventIdDict', {'id': str})
 
 EventStatusDict = TypedDict('EventStatusDict', {'origin_url': str, 'backup_url': Optional[str], 'status': str})
@@ -53,15 +107,251 @@ DeviceAvailabilityDict = TypedDict('DeviceAvailabilityDict', {
 
 PreviewUrlDict = TypedDict('PreviewUrlDict', {'preview_url': str})
 
+PreviewThumbnailDict = TypedDict('PreviewThumbnailDict', {'preview_url': str, 'thumbnail': bytes})
+
+PreviewBatchDict = TypedDict('PreviewBatchDict', {
+    'results': Dict[str, Union[PreviewUrlDict, PreviewThumbnailDict]],
+    'errors': Dict[str, ElementalException]
+})
+
+EventXml = Union[str, BoundEventTemplate]
+
+# One per send_request call. time_to_headers is the time until the response headers were
+# parsed (requests does not expose the connect time on its own), total_time includes
+# retries and reading the body. Both are in seconds.
+RequestMetricsDict = TypedDict('RequestMetricsDict', {
+    'operation': Optional[str],
+    'server_url': str,
+    'http_method': str,
+    'url': str,
+    'status_code': Optional[int],
+    'attempts': int,
+    'time_to_headers': Optional[float],
+    'total_time': float,
+    'request_bytes': int,
+    'response_bytes': Optional[int],
+    'exception': Optional[str]
+})
+
+# error is None when the action succeeded
+OutputCommandResultDict = TypedDict('OutputCommandResultDict', {
+    'server_url': str,
+    'event_id': str,
+    'output_id': str,
+    'action': str,
+    'error': Optional[ElementalException]
+})
+
+EventSummaryDict = TypedDict('EventSummaryDict', {
+    'id': str,
+    'name': Optional[str],
+    'status': str,
+    'destinations': List[Optional[str]],
+    'device_names': List[Optional[str]]
+})
+
+
+_current_operation: ContextVar[Optional[str]] = ContextVar('elemental_operation', default=None)
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+@contextmanager
+def _operation_scope(name: str) -> Iterator[None]:
+    token = _current_operation.set(name)
+    try:
+        yield
+    finally:
+        _current_operation.reset(token)
+
+
+@contextmanager
+def _parsing(http_method: str, url: str) -> Iterator[None]:
+    """Report a body that is not the XML expected (e.g. a proxy's error page) as InvalidResponse"""
+    try:
+        yield
+    except ET.ParseError as e:
+        raise InvalidResponse(f"{http_method}: {url} returned an unreadable response\n{e}")
+
+
+def _operation(method: F) -> F:
+    """Label requests sent while method runs with its name, for request metrics"""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with _operation_scope(method.__name__):
+            return method(*args, **kwargs)
+    return cast(F, wrapper)
+
+
+def _map_concurrently(fn: Callable[[K], T], keys: Iterable[K], max_workers: int,
+                      deadline: Optional[float] = None) -> Iterator[Tuple[K, 'Future[T]']]:
+    """Run fn for every key on a bounded thread pool, yielding (key, future) as each call finishes
+
+    When deadline (in seconds) runs out, iteration stops and calls still queued are cancelled.
+    """
+    keys = list(keys)
+    if not keys:
+        return
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(keys)))
+    futures = {executor.submit(fn, key): key for key in keys}
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            yield futures[future], future
+    except FutureTimeoutError:
+        pass
+    finally:
+        # Consumers may stop early, don't leave queued calls behind
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _parse_event_id(content: bytes) -> EventIdDict:
+    xml_root = ET.fromstring(content)
+    ids = xml_root.findall('id')
+    return {'id': str(ids[0].text)}
+
+
+def _parse_status(text):
+    return LiveEvent.from_xml(text).status
+
+
+def _parse_event_info(content: Union[bytes, str]) -> EventStatusDict:
+    event = LiveEvent.from_xml(content)
+    return EventStatusDict(status=event.status, origin_url=event.origin_url, backup_url=event.backup_url)
+
+
+def _event_summary(event: ET.Element) -> EventSummaryDict:
+    event_id = event.findtext('id') or event.get('href', '').rsplit('/', 1)[-1]
+    return EventSummaryDict(
+        id=event_id,
+        name=event.findtext('name'),
+        status=event.findtext('status') or 'unknown',
+        destinations=[destination.findtext('uri') for destination in event.iter('destination')],
+        device_names=[device_name.text for device_name in event.iter('device_name')],
+    )
+
+
+def _iter_event_summaries(chunks: Iterable[bytes]) -> Iterator[EventSummaryDict]:
+    """Incrementally parse a live_event_list, yielding each event as soon as its closing tag arrives"""
+    parser: ET.XMLPullParser = ET.XMLPullParser(events=('start', 'end'))
+    root: Optional[ET.Element] = None
+    depth = 0
+    for chunk in chunks:
+        parser.feed(chunk)
+        for parse_event in parser.read_events():
+            event, element = cast(Tuple[str, ET.Element], parse_event)
+            if event == 'start':
+                if root is None:
+                    root = element
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 1 and root is not None and element.tag == 'live_event':
+                yield _event_summary(element)
+                # Drop the parsed event so memory stays flat however long the list is
+                root.clear()
+    parser.close()
+
+
+def _parse_devices_in_use(text: str) -> Set[Optional[str]]:
+    events_list = ET.fromstring(text)
+
+    # Find in use devices from active events
+    in_use_devices = set()
+    for device_name in events_list.iter('device_name'):
+        in_use_devices.add(device_name.text)
+
+    return in_use_devices
+
+
+_DEVICE_FIELDS = frozenset({'id', 'name', 'device_name', 'device_number', 'device_type', 'description', 'channel',
+                            'channel_type', 'quad'})
+
+
+def _iter_devices(chunks: Iterable[bytes]) -> Iterator[Dict[str, Optional[str]]]:
+    """Incrementally parse device elements, keeping only the fields DeviceAvailabilityDict needs"""
+    parser: ET.XMLPullParser = ET.XMLPullParser(events=('end',))
+
+    def devices() -> Iterator[Dict[str, Optional[str]]]:
+        for parse_event in parser.read_events():
+            _, element = cast(Tuple[str, ET.Element], parse_event)
+            if element.tag == 'device':
+                yield {child.tag: child.text for child in element if child.tag in _DEVICE_FIELDS}
+                element.clear()
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from devices()
+    parser.close()
+    yield from devices()
+
+
+def _device_availability(device_info: Dict, devices_in_use: Collection[Optional[str]]) -> DeviceAvailabilityDict:
+    return DeviceAvailabilityDict(
+        id=device_info['id'],
+        name=device_info['name'],
+        description=device_info['description'],
+        device_name=device_info['device_name'],
+        device_number=device_info['device_number'],
+        device_type=device_info['device_type'],
+        availability=(device_info['device_name'] not in devices_in_use),
+        channel=device_info['channel'],
+        channel_type=device_info['channel_type'],
+        quad=device_info['quad'],
+    )
+
+
+def _parse_device_list(content: bytes, devices_in_use: Collection[Optional[str]]) -> List[DeviceAvailabilityDict]:
+    devices_information = sorted(_iter_devices([content]), key=lambda d: int(d['id'] or 0))
+    return [_device_availability(device_info, devices_in_use) for device_info in devices_information]
+
+
+def _parse_device(content: bytes, devices_in_use: Collection[Optional[str]]) -> DeviceAvailabilityDict:
+    return _device_availability(next(_iter_devices([content])), devices_in_use)
+
+
+def _preview_request_body(input_id: str) -> str:
+    return f"input_key=0&live_event[inputs_attributes][0][source_type]=" \
+           f"DeviceInput&live_event[inputs_attributes][0]" \
+           f"[device_input_attributes][sdi_settings_attributes]" \
+           f"[input_format]=Auto&live_event[inputs_attributes][0]" \
+           f"[device_input_attributes][device_id]={input_id}"
+
+
+def _parse_preview(server_url: str, status_code: int, content: bytes) -> PreviewUrlDict:
+    try:
+        response_parse = json.loads(content)
+    except ValueError:
+        raise InvalidResponse(f"Response: {status_code}\n{content.decode('utf-8', 'replace')}")
+
+    if 'type' in response_parse and response_parse['type'] == 'error':
+        raise ElementalException(
+            f"Response: {status_code}\n{content.decode('utf-8', 'replace')}")
+    else:
+        preview_url = f'{server_url}/images/thumbs/' \
+                      f'p_{response_parse["preview_image_id"]}_job_0.jpg'
+        return {'preview_url': preview_url}
+
+
+class BaseElementalLive:
+    """Connection settings and request signing shared by the sync and async clients
+
+    Signed headers are valid for AUTH_EXPIRATION seconds, so they are cached per URL
+    and reused until header_refresh_margin seconds before they expire.
+    """
+    AUTH_EXPIRATION = 120
+    MAX_SIGNED_URLS = 1024
 
-class ElementalLive:
     def __init__(self, server_url: str, user: Optional[str] = None, api_key: Optional[str] = None,
-                 timeout: Optional[int] = 5) -> None:
+                 timeout: Optional[int] = 5, header_refresh_margin: int = 10) -> None:
         self.server_url = server_url
         self.user = user
         self.api_key = api_key
         self.timeout = timeout
-        self.session = requests.Session()
+        self.header_refresh_margin = header_refresh_margin
+        self._signed_headers: Dict[Optional[str], Tuple[int, Mapping[str, str]]] = {}
+        self._signed_headers_lock = threading.Lock()
 
     def generate_headers(self, url: Optional[str] = "") -> Dict[str, str]:
         # Generate headers according to how users create ElementalLive class
@@ -70,34 +360,250 @@ class ElementalLive:
                 'Accept': 'application/xml',
                 'Content-Type': 'application/xml'
             }
-        else:
-            expiration = int(time.time() + 120)
-            parse = urlparse(url)
-            pre_hash = f"{str(parse.path)}{self.user}{self.api_key}{expiration}"
-            digest = hashlib.md5(pre_hash.encode('utf-8')).hexdigest()
-            final_hash = f"{self.api_key}{digest}"
-            key = hashlib.md5(final_hash.encode('utf-8')).hexdigest()
+        now = time.time()
+        cached = self._signed_headers.get(url)
+        if cached is not None and now < cached[0] - self.header_refresh_margin:
+            # Callers are free to mutate what they get, only ever hand out copies
+            return dict(cached[1])
 
-            return {
-                'X-Auth-User': str(self.user),
-                'X-Auth-Expires': str(expiration),
-                'X-Auth-Key': key,
-                'Accept': 'application/xml',
-                'Content-Type': 'application/xml'
-            }
+        expiration = int(now + self.AUTH_EXPIRATION)
+        parse = urlparse(url)
+        pre_hash = f"{str(parse.path)}{self.user}{self.api_key}{expiration}"
+        digest = hashlib.md5(pre_hash.encode('utf-8')).hexdigest()
+        final_hash = f"{self.api_key}{digest}"
+        key = hashlib.md5(final_hash.encode('utf-8')).hexdigest()
+
+        headers = {
+            'X-Auth-User': str(self.user),
+            'X-Auth-Expires': str(expiration),
+            'X-Auth-Key': key,
+            'Accept': 'application/xml',
+            'Content-Type': 'application/xml'
+        }
+        with self._signed_headers_lock:
+            if len(self._signed_headers) >= self.MAX_SIGNED_URLS:
+                self._signed_headers = {cached_url: entry for cached_url, entry in self._signed_headers.items()
+                                        if now < entry[0] - self.header_refresh_margin}
+                if len(self._signed_headers) >= self.MAX_SIGNED_URLS:
+                    self._signed_headers = {}
+            self._signed_headers[url] = (expiration, MappingProxyType(dict(headers)))
+        return headers
+
+
+class ElementalLive(BaseElementalLive):
+    """Blocking client for one Elemental Live appliance
+
+    Set devices_in_use_ttl to share the active-devices lookup between device queries for
+    that many seconds; it is dropped whenever this client creates, starts, stops, cancels
+    or deletes an event, and devices_in_use_cache.hits/misses tell how well it works.
+
+    retry_policy retries idempotent requests after connection failures and 5xx answers.
+    With a circuit_breaker, requests fail immediately with CircuitOpen while the appliance
+    is considered down.
+
+    Set fingerprint_ttl to let update_event_if_changed remember, for that many seconds, the
+    fingerprint of the document each event was last found matching or set to instead of
+    fetching its XML.
+
+    Set thumbnail_ttl to keep up to thumbnail_cache_size preview JPEGs downloaded by
+    fetch_preview_thumbnail for that many seconds, least recently used first out.
+
+    metrics_sink is called once per send_request with a RequestMetricsDict describing the
+    logical operation, outcome, timings and payload sizes of the call.
+
+    With a snapshot_store, describe_event, get_event_xml and get_input_devices answer from
+    what the store recorded (possibly in an earlier process) and, once that is older than
+    snapshot_ttl seconds, refresh it on a background thread: stale while revalidate. Only
+    a read the store has never seen waits for the appliance. Events and devices this client
+    changes are dropped from the store so its own writes are never read back stale.
+
+    Set coalesce_reads to let threads reading the same GET URL at once (e.g. describe_event
+    and get_event_xml of one event) share one request: the first sends it and the others
+    wait for its response, and with coalesce_ttl that response is reused for that many
+    seconds more. Each caller parses the shared response itself. Writes through this
+    client drop reusable responses. read_coalescer.calls/shared tell how much it saves.
+
+    Thread safety: one instance may be shared by any number of threads. Requests go through
+    a single pooled session, and the header cache, devices cache and circuit breaker are
+    guarded by locks. Keep pool_maxsize at least as large as the number of threads calling
+    concurrently (or set pool_block) so connections are reused instead of discarded.
+    """
+
+    def __init__(self, server_url: str, user: Optional[str] = None, api_key: Optional[str] = None,
+                 timeout: Optional[int] = 5, header_refresh_margin: int = 10,
+                 devices_in_use_ttl: Optional[float] = None, retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None, pool_connections: int = 10,
+                 pool_maxsize: int = 10, pool_block: bool = False, keep_alive: bool = True,
+                 metrics_sink: Optional[Callable[[RequestMetricsDict], None]] = None,
+                 thumbnail_ttl: Optional[float] = None, thumbnail_cache_size: int = 256,
+                 fingerprint_ttl: Optional[float] = None, snapshot_store: Optional['SnapshotStore'] = None,
+                 snapshot_ttl: float = 0, coalesce_reads: bool = False, coalesce_ttl: float = 0) -> None:
+        super().__init__(server_url, user, api_key, timeout, header_refresh_margin)
+        self.metrics_sink = metrics_sink
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.devices_in_use_cache: Optional[TTLCache[FrozenSet[Optional[str]]]] = \
+            TTLCache(devices_in_use_ttl) if devices_in_use_ttl is not None else None
+        self.thumbnail_cache: Optional[TTLCache[PreviewThumbnailDict]] = \
+            TTLCache(thumbnail_ttl, max_entries=thumbnail_cache_size) if thumbnail_ttl is not None else None
+        self.event_fingerprints: Optional[TTLCache[str]] = \
+            TTLCache(fingerprint_ttl) if fingerprint_ttl is not None else None
+        self.snapshot_store = snapshot_store
+        self.snapshot_ttl = snapshot_ttl
+        self._snapshot_refreshes: Dict[Hashable, Future] = {}
+        self._snapshot_executor: Optional[ThreadPoolExecutor] = None
+        self._snapshot_lock = threading.Lock()
+        self.read_coalescer: Optional[SingleFlight] = SingleFlight(coalesce_ttl) if coalesce_reads else None
+
+    def _invalidate_devices_in_use(self) -> None:
+        if self.devices_in_use_cache is not None:
+            self.devices_in_use_cache.invalidate()
+        if self.snapshot_store is not None:
+            self.snapshot_store.forget_devices(self.server_url)
+        if self.read_coalescer is not None:
+            self.read_coalescer.invalidate()
+
+    def _invalidate_event(self, event_id: str) -> None:
+        if self.snapshot_store is not None:
+            self.snapshot_store.forget_event(self.server_url, event_id)
+        if self.read_coalescer is not None:
+            self.read_coalescer.invalidate()
+
+    def _get(self, url: str, parse: Callable[[requests.Response], T], timeout: Optional[int]) -> T:
+        """GET url and parse the response; when coalescing, every read of url shares the response and parses its own"""
+        def fetch() -> requests.Response:
+            headers = self.generate_headers(url)
+            return self.send_request(http_method="GET", url=url, headers=headers, timeout=timeout)
+        response = fetch() if self.read_coalescer is None else self.read_coalescer.run(('GET', url), fetch)
+        with _parsing("GET", url):
+            return parse(response)
+
+    def _read_snapshot(self, key: Hashable, stored: Optional[Tuple[T, float]], fetch: Callable[[], T]) -> T:
+        """Return the stored value, refreshing it in the background when stale, or fetch it when absent"""
+        if stored is None:
+            return fetch()
+        value, fetched_at = stored
+        assert self.snapshot_store is not None
+        if self.snapshot_store.clock() - fetched_at >= self.snapshot_ttl:
+            self._refresh_snapshot(key, fetch)
+        return value
+
+    def _refresh_snapshot(self, key: Hashable, fetch: Callable[[], Any]) -> None:
+        with self._snapshot_lock:
+            if key in self._snapshot_refreshes:
+                return
+            if self._snapshot_executor is None:
+                self._snapshot_executor = ThreadPoolExecutor(max_workers=4,
+                                                             thread_name_prefix=f'snapshots({self.server_url})')
+            future = self._snapshot_executor.submit(fetch)
+            self._snapshot_refreshes[key] = future
+
+        def done(future: Future) -> None:
+            with self._snapshot_lock:
+                self._snapshot_refreshes.pop(key, None)
+            error = future.exception()
+            if isinstance(error, NotFound):
+                # Gone from the appliance: stop serving the stored copy
+                self._forget_snapshot(key)
+            elif error is not None:
+                logger.warning("Refreshing snapshot %s of %s failed: %s", key, self.server_url, error)
+        future.add_done_callback(done)
+
+    def _forget_snapshot(self, key: Hashable) -> None:
+        assert self.snapshot_store is not None
+        if key == 'devices':
+            self._invalidate_devices_in_use()
+        else:
+            _, event_id = cast(Tuple[str, str], key)
+            self._invalidate_event(event_id)
 
     def send_request(self, http_method: str, url: str, headers: Dict[str, str],
-                     body: Optional[str] = "", timeout: Optional[int] = None) -> requests.Response:
+                     body: Optional[str] = "", timeout: Optional[int] = None,
+                     stream: bool = False) -> requests.Response:
         # Send request according to different methods
+        if self.metrics_sink is None:
+            return self._send_request(http_method, url, headers, body, timeout, stream, {})
+
+        trace: Dict[str, Any] = {}
+        started = time.perf_counter()
+        exception = None
         try:
-            timeout = timeout or self.timeout
-            response = self.session.request(
-                method=http_method, url=url, data=body, headers=headers, timeout=timeout)
-
-        except requests.exceptions.ConnectTimeout as e:
-            raise ConnectionTimeout(f"{http_method}: {url} failed\n{e}")
-        except requests.exceptions.RequestException as e:
-            raise InvalidRequest(f"{http_method}: {url} failed\n{e}")
+            return self._send_request(http_method, url, headers, body, timeout, stream, trace)
+        except ElementalException as e:
+            exception = type(e).__name__
+            raise
+        finally:
+            self._record_metrics(http_method, url, body, stream, trace, time.perf_counter() - started, exception)
+
+    def _record_metrics(self, http_method: str, url: str, body: Optional[str], stream: bool, trace: Dict[str, Any],
+                        total_time: float, exception: Optional[str]) -> None:
+        response = trace.get('response')
+        response_bytes = None
+        if response is not None:
+            if stream:
+                content_length = response.headers.get('Content-Length')
+                response_bytes = int(content_length) if content_length is not None else None
+            else:
+                response_bytes = len(response.content or b'')
+        metrics = RequestMetricsDict(
+            operation=_current_operation.get(),
+            server_url=self.server_url,
+            http_method=http_method,
+            url=url,
+            status_code=response.status_code if response is not None else None,
+            attempts=trace.get('attempts', 0),
+            time_to_headers=response.elapsed.total_seconds() if response is not None else None,
+            total_time=total_time,
+            request_bytes=len(body.encode('utf-8')) if body else 0,
+            response_bytes=response_bytes,
+            exception=exception,
+        )
+        try:
+            self.metrics_sink(metrics)  # type: ignore
+        except Exception:
+            logger.exception("Metrics sink failed for %s %s", http_method, url)
+
+    def _send_request(self, http_method: str, url: str, headers: Dict[str, str], body: Optional[str],
+                      timeout: Optional[int], stream: bool, trace: Dict[str, Any]) -> requests.Response:
+        timeout = timeout or self.timeout
+        attempt = 1
+        while True:
+            trace['attempts'] = attempt
+            if self.circuit_breaker is not None and not self.circuit_breaker.allow_request():
+                raise CircuitOpen(f"{http_method}: {url} not sent, circuit open for {self.server_url}")
+            try:
+                response = self.session.request(
+                    method=http_method, url=url, data=body, headers=headers, timeout=timeout, stream=stream)
+
+            except requests.exceptions.RequestException as e:
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
+                retryable = isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+                if retryable and self._retry(http_method, attempt):
+                    attempt += 1
+                    continue
+                if isinstance(e, requests.exceptions.ConnectTimeout):
+                    raise ConnectionTimeout(f"{http_method}: {url} failed\n{e}")
+                raise InvalidRequest(f"{http_method}: {url} failed\n{e}")
+
+            trace['response'] = response
+            if self.circuit_breaker is not None:
+                if response.status_code >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+            if response.status_code >= 500 and self._retry(http_method, attempt, response.status_code):
+                response.close()
+                attempt += 1
+                continue
+            break
+
         if response.status_code == 404:
             raise NotFound(
                 f"{http_method}: {url} failed\nResponse: "
@@ -108,178 +614,333 @@ class ElementalLive:
                 f"{response.status_code}\n{response.text}")
         return response
 
-    def create_event(self, event_xml: str, timeout: Optional[int] = None) -> EventIdDict:
+    def _retry(self, http_method: str, attempt: int, status_code: Optional[int] = None) -> bool:
+        # Wait out the backoff and return True when the failed attempt should be sent again
+        if self.retry_policy is None or not self.retry_policy.should_retry(http_method, attempt, status_code):
+            return False
+        time.sleep(self.retry_policy.backoff(attempt))
+        return True
+
+    @_operation
+    def create_event(self, event_xml: EventXml, timeout: Optional[int] = None) -> EventIdDict:
         url = f'{self.server_url}/live_events'
         headers = self.generate_headers(url)
-        response = self.send_request(
-            http_method="POST", url=url, headers=headers, body=event_xml, timeout=timeout)
-        xml_root = ET.fromstring(response.content)
-        ids = xml_root.findall('id')
-        event_id = str(ids[0].text)
-
-        return {'id': event_id}
+        try:
+            response = self.send_request(
+                http_method="POST", url=url, headers=headers, body=_event_body(event_xml), timeout=timeout)
+        finally:
+            self._invalidate_devices_in_use()
+        with _parsing("POST", url):
+            return _parse_event_id(response.content)
 
-    def update_event(self, event_id: str, event_xml: str, restart: Optional[bool] = False,
+    @_operation
+    def update_event(self, event_id: str, event_xml: EventXml, restart: Optional[bool] = False,
                      timeout: Optional[int] = None) -> None:
         url = f'{self.server_url}/live_events/{event_id}'
         if restart:
             url += '?unlocked=1'
         headers = self.generate_headers(url)
-        self.send_request(
-            http_method="PUT", url=url, headers=headers, body=event_xml, timeout=timeout)
+        if self.event_fingerprints is not None:
+            self.event_fingerprints.invalidate(event_id)
+        try:
+            self.send_request(
+                http_method="PUT", url=url, headers=headers, body=_event_body(event_xml), timeout=timeout)
+        finally:
+            self._invalidate_event(event_id)
+
+    @_operation
+    def update_event_if_changed(self, event_id: str, event_xml: EventXml, restart: Optional[bool] = False,
+                                timeout: Optional[int] = None) -> bool:
+        """update_event only when the event lacks some of event_xml, returning whether it was sent
 
+        The event's current XML is read from the appliance and compared with event_changed,
+        so ordering, whitespace, server-managed fields and settings event_xml leaves out
+        (the appliance reports them with their defaults) never cause a PUT. With
+        fingerprint_ttl, an event last found matching or set to this document is skipped
+        without reading it again.
+        """
+        body = _event_body(event_xml)
+        desired = event_fingerprint(body)
+        if self.event_fingerprints is not None and self.event_fingerprints.get(event_id) == desired:
+            return False
+        changed = event_changed(self.get_current_event_xml(event_id, timeout=timeout), body)
+        if changed:
+            self.update_event(event_id, body, restart=restart, timeout=timeout)
+        if self.event_fingerprints is not None:
+            self.event_fingerprints.set(event_id, desired)
+        return changed
+
+    @_operation
     def delete_event(self, event_id: str, timeout: Optional[int] = None) -> None:
         url = f'{self.server_url}/live_events/{event_id}'
         headers = self.generate_headers(url)
-        self.send_request(http_method="DELETE", url=url, headers=headers, timeout=timeout)
+        try:
+            self.send_request(http_method="DELETE", url=url, headers=headers, timeout=timeout)
+        finally:
+            self._invalidate_devices_in_use()
+            self._invalidate_event(event_id)
+            if self.event_fingerprints is not None:
+                self.event_fingerprints.invalidate(event_id)
 
+    @_operation
     def cancel_event(self, event_id: str, timeout: Optional[int] = None) -> None:
         url = f'{self.server_url}/live_events/{event_id}/cancel'
         headers = self.generate_headers(url)
-        self.send_request(http_method="POST", url=url, headers=headers, timeout=timeout)
+        try:
+            self.send_request(http_method="POST", url=url, headers=headers, timeout=timeout)
+        finally:
+            self._invalidate_devices_in_use()
+            self._invalidate_event(event_id)
 
+    @_operation
     def start_event(self, event_id: str, timeout: Optional[int] = None) -> None:
         url = f'{self.server_url}/live_events/{event_id}/start'
         body = "<start></start>"
         headers = self.generate_headers(url)
-        self.send_request(http_method="POST", url=url, headers=headers, body=body, timeout=timeout)
+        try:
+            self.send_request(http_method="POST", url=url, headers=headers, body=body, timeout=timeout)
+        finally:
+            self._invalidate_devices_in_use()
+            self._invalidate_event(event_id)
 
+    @_operation
     def stop_event(self, event_id: str, timeout: Optional[int] = None) -> None:
         url = f'{self.server_url}/live_events/{event_id}/stop'
         body = "<stop></stop>"
         headers = self.generate_headers(url)
-        self.send_request(http_method="POST", url=url, headers=headers, body=body, timeout=timeout)
+        try:
+            self.send_request(http_method="POST", url=url, headers=headers, body=body, timeout=timeout)
+        finally:
+            self._invalidate_devices_in_use()
+            self._invalidate_event(event_id)
 
+    @_operation
     def event_pause_output(self, event_id: str, output_id: str, timeout: Optional[int] = None) -> None:
         url = f'{self.server_url}/live_events/{event_id}/pause_output'
         body = f"<output_id>{output_id}</output_id>"
         headers = self.generate_headers(url)
         self.send_request(http_method="POST", url=url, headers=headers, body=body, timeout=timeout)
 
+    @_operation
     def event_unpause_output(self, event_id: str, output_id: str, timeout: Optional[int] = None) -> None:
         url = f'{self.server_url}/live_events/{event_id}/unpause_output'
         body = f"<output_id>{output_id}</output_id>"
         headers = self.generate_headers(url)
         self.send_request(http_method="POST", url=url, headers=headers, body=body, timeout=timeout)
 
+    @_operation
     def event_start_output(self, event_id: str, output_id: str, timeout: Optional[int] = None) -> None:
         url = f'{self.server_url}/live_events/{event_id}/start_output'
         body = f"<output_id>{output_id}</output_id>"
         headers = self.generate_headers(url)
         self.send_request(http_method="POST", url=url, headers=headers, body=body, timeout=timeout)
 
+    @_operation
     def event_stop_output(self, event_id: str, output_id: str, timeout: Optional[int] = None) -> None:
         url = f'{self.server_url}/live_events/{event_id}/stop_output'
         body = f"<output_id>{output_id}</output_id>"
         headers = self.generate_headers(url)
         self.send_request(http_method="POST", url=url, headers=headers, body=body, timeout=timeout)
 
+    def control_outputs(self, commands: Iterable[Tuple[str, str, str]], max_workers: int = 10,
+                        deadline: Optional[float] = None,
+                        timeout: Optional[int] = None) -> List[OutputCommandResultDict]:
+        """Run many (event_id, output_id, action) commands concurrently, action being one of OUTPUT_ACTIONS
+
+        Returns one outcome per command in input order; commands that did not finish within
+        deadline seconds are reported with DeadlineExceeded.
+        """
+        commands = list(commands)
+        actions = {
+            'pause': self.event_pause_output,
+            'unpause': self.event_unpause_output,
+            'start': self.event_start_output,
+            'stop': self.event_stop_output,
+        }
+        for _, _, action in commands:
+            if action not in actions:
+                raise ValueError(f"Unknown output action {action}, expected one of {', '.join(OUTPUT_ACTIONS)}")
+
+        def run(index: int) -> None:
+            event_id, output_id, action = commands[index]
+            actions[action](event_id, output_id, timeout=timeout)
+
+        errors: Dict[int, Optional[ElementalException]] = {}
+        for index, future in _map_concurrently(run, range(len(commands)), max_workers, deadline):
+            try:
+                future.result()
+                errors[index] = None
+            except ElementalException as e:
+                errors[index] = e
+        return [OutputCommandResultDict(
+            server_url=self.server_url, event_id=event_id, output_id=output_id, action=action,
+            error=errors[index] if index in errors
+            else DeadlineExceeded(f"{event_id}: {action} of output {output_id} not finished within {deadline}s"))
+            for index, (event_id, output_id, action) in enumerate(commands)]
+
+    @_operation
     def reset_event(self, event_id: str, timeout: Optional[int] = None) -> None:
         url = f'{self.server_url}/live_events/{event_id}/reset'
         headers = self.generate_headers(url)
-        self.send_request(http_method="POST", url=url, headers=headers, body="", timeout=timeout)
+        try:
+            self.send_request(http_method="POST", url=url, headers=headers, body="", timeout=timeout)
+        finally:
+            self._invalidate_event(event_id)
 
+    @_operation
     def describe_event(self, event_id: str, timeout: Optional[int] = None) -> EventStatusDict:
-        url = f'{self.server_url}/live_events/{event_id}'
-        headers = self.generate_headers(url)
-        response = self.send_request(http_method="GET", url=url,
-                                     headers=headers, timeout=timeout)
-        event_info = {}
-
-        destinations = list(ET.fromstring(response.text).iter('destination'))
-        uri = destinations[0].find('uri') if destinations else None
-        event_info['origin_url'] = uri.text if uri is not None else ''
-        if len(destinations) > 1:
-            uri = destinations[1].find('uri')
-            event_info['backup_url'] = uri.text if uri is not None else ''
-
-        event_info['status'] = self._parse_status(response.text)
-
-        return EventStatusDict(
-            status=str(event_info['status']),
-            origin_url=str(event_info['origin_url']),
-            backup_url=event_info.get('backup_url')
-        )
+        if self.snapshot_store is not None:
+            return self._read_snapshot(
+                ('event', event_id), self.snapshot_store.describe_event(self.server_url, event_id),
+                lambda: _parse_event_info(self._fetch_event_xml(event_id, timeout)))
+        return self._get(f'{self.server_url}/live_events/{event_id}',
+                         lambda response: _parse_event_info(response.content), timeout)
 
+    @_operation
+    def get_event(self, event_id: str, timeout: Optional[int] = None) -> LiveEvent:
+        return self._get(f'{self.server_url}/live_events/{event_id}',
+                         lambda response: LiveEvent.from_xml(response.content), timeout)
+
+    @_operation
     def get_event_xml(self, event_id: str, timeout: Optional[int] = None) -> str:
-        url = f'{self.server_url}/live_events/{event_id}'
-        headers = self.generate_headers(url)
-        response = self.send_request(http_method="GET", url=url,
-                                     headers=headers, timeout=timeout)
-        return response.text
+        if self.snapshot_store is not None:
+            return self._read_snapshot(('event', event_id), self.snapshot_store.get_event_xml(self.server_url, event_id),
+                                       lambda: self._fetch_event_xml(event_id, timeout))
+        return self._fetch_event_xml(event_id, timeout)
+
+    def _fetch_event_xml(self, event_id: str, timeout: Optional[int]) -> str:
+        def parse(response: requests.Response) -> str:
+            if self.snapshot_store is not None:
+                self.snapshot_store.record_event(self.server_url, event_id, response.content)
+            return response.text
+        return self._get(f'{self.server_url}/live_events/{event_id}', parse, timeout)
+
+    def get_current_event_xml(self, event_id: str, timeout: Optional[int] = None) -> str:
+        """get_event_xml from the appliance itself, never from the snapshot store"""
+        if self.snapshot_store is None:
+            return self.get_event_xml(event_id, timeout=timeout)
+        # Skip the snapshot: a stale one could hide a change that still has to be made
+        with _operation_scope('get_event_xml'):
+            return self._fetch_event_xml(event_id, timeout)
 
+    def get_event_fingerprint(self, event_id: str, timeout: Optional[int] = None) -> str:
+        """event_fingerprint of the event's current XML, remembered for fingerprint_ttl seconds when set"""
+        if self.event_fingerprints is not None:
+            cached = self.event_fingerprints.get(event_id)
+            if cached is not MISSING:
+                return cached
+        fingerprint = event_fingerprint(self.get_current_event_xml(event_id, timeout=timeout))
+        if self.event_fingerprints is not None:
+            self.event_fingerprints.set(event_id, fingerprint)
+        return fingerprint
+
+    @_operation
     def get_event_status(self, event_id: str, timeout: Optional[int] = None) -> str:
-        url = f'{self.server_url}/live_events/{event_id}/status'
-        headers = self.generate_headers(url)
-        response = self.send_request(http_method="GET", url=url, headers=headers, timeout=timeout)
-        return self._parse_status(response.text)
+        return self._get(f'{self.server_url}/live_events/{event_id}/status',
+                         lambda response: self._parse_status(response.content), timeout)
 
-    def find_devices_in_use(self, timeout: Optional[int] = None) -> Set[Optional[str]]:
-        events_url = f'{self.server_url}/live_events?filter=active'
-        events_headers = self.generate_headers(events_url)
-        events = self.send_request(
-            http_method="GET", url=events_url, headers=events_headers, timeout=timeout)
-        events_list = ET.fromstring(events.text)
+    def wait_for_status(self, event_id: str, targets: Iterable[str], deadline: float = 60,
+                        fail_on: Iterable[str] = ('error', 'cancelled', 'complete'),
+                        on_status: Optional[Callable[[str], None]] = None, initial_interval: float = 0.25,
+                        max_interval: float = 5, timeout: Optional[int] = None) -> str:
+        """Poll get_event_status until the event reaches one of targets and return that status
+
+        Polls start initial_interval apart and back off exponentially (with jitter) up to
+        max_interval, so a fast transition is noticed quickly without flooding the appliance.
+        Raises UnexpectedStatus as soon as a status in fail_on (and not in targets) is seen,
+        and DeadlineExceeded after deadline seconds. on_status is called with every newly
+        observed status.
+        """
+        targets = set(targets)
+        fail_on = set(fail_on) - targets
+        expires = time.monotonic() + deadline
+        interval = initial_interval
+        last_status = None
+        while True:
+            status = self.get_event_status(event_id, timeout=timeout)
+            if status != last_status:
+                last_status = status
+                if on_status is not None:
+                    on_status(status)
+            if status in targets:
+                return status
+            if status in fail_on:
+                raise UnexpectedStatus(f"{event_id}: reached '{status}' while waiting for {sorted(targets)}", status)
+            remaining = expires - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceeded(f"{event_id}: still '{status}' after {deadline}s")
+            time.sleep(min(remaining, interval / 2 + random.uniform(0, interval / 2)))
+            interval = min(interval * 2, max_interval)
+
+    def wait_until_running(self, event_id: str, deadline: float = 60,
+                           on_status: Optional[Callable[[str], None]] = None, timeout: Optional[int] = None) -> str:
+        return self.wait_for_status(event_id, ('running',), deadline=deadline, on_status=on_status, timeout=timeout)
 
-        # Find in use devices from active events
-        in_use_devices = set()
-        for device_name in events_list.iter('device_name'):
-            in_use_devices.add(device_name.text)
+    def iter_events(self, filter: Optional[str] = None, page_size: int = 100,
+                    timeout: Optional[int] = None) -> Iterator[EventSummaryDict]:
+        """Lazily walk /live_events page by page, yielding one lightweight record per event
 
+        filter is passed through to the appliance (e.g. 'active'). Each page is streamed and
+        parsed incrementally, so the first events are available before the page has downloaded.
+        """
+        page = 1
+        while True:
+            query: Dict[str, Union[int, str]] = {'page': page, 'per_page': page_size}
+            if filter is not None:
+                query['filter'] = filter
+            url = f'{self.server_url}/live_events?{urlencode(query)}'
+            headers = self.generate_headers(url)
+            with _operation_scope('iter_events'):
+                response = self.send_request(http_method="GET", url=url, headers=headers, timeout=timeout, stream=True)
+            count = 0
+            try:
+                for event in _iter_event_summaries(response.iter_content(chunk_size=64 * 1024)):
+                    count += 1
+                    yield event
+            except requests.exceptions.RequestException as e:
+                raise InvalidRequest(f"GET: {url} failed while streaming\n{e}")
+            except ET.ParseError as e:
+                raise InvalidResponse(f"GET: {url} returned an unreadable event list\n{e}")
+            finally:
+                response.close()
+            if count < page_size:
+                return
+            page += 1
+
+    @_operation
+    def find_devices_in_use(self, timeout: Optional[int] = None) -> Set[Optional[str]]:
+        if self.devices_in_use_cache is not None:
+            cached = self.devices_in_use_cache.get('active')
+            if cached is not MISSING:
+                return set(cached)
+        in_use_devices = self._get(f'{self.server_url}/live_events?filter=active',
+                                   lambda response: _parse_devices_in_use(response.text), timeout)
+        if self.devices_in_use_cache is not None:
+            self.devices_in_use_cache.set('active', frozenset(in_use_devices))
         return in_use_devices
 
+    @_operation
     def get_input_devices(self, timeout: Optional[int] = None) -> List[DeviceAvailabilityDict]:
-        devices_url = f'{self.server_url}/devices'
-        devices_headers = self.generate_headers(devices_url)
-        devices = self.send_request(
-            http_method="GET", url=devices_url, headers=devices_headers, timeout=timeout)
-        devices_information = xmltodict.parse(devices.text)[
-            'device_list']['device']
-
-        devices_in_use = self.find_devices_in_use()
-
-        for device in devices_information:
-            device.pop('@href')
-            device['availability'] = \
-                (device['device_name'] not in devices_in_use)
-
-        devices_information = sorted(devices_information, key=lambda d: int(d["id"]))
-        return [DeviceAvailabilityDict(
-            id=device_info['id'],
-            name=device_info['name'],
-            description=device_info['description'],
-            device_name=device_info['device_name'],
-            device_number=device_info['device_number'],
-            device_type=device_info['device_type'],
-            availability=device_info['availability'],
-            channel=device_info['channel'],
-            channel_type=device_info['channel_type'],
-            quad=device_info['quad'],
-        ) for device_info in devices_information]
+        if self.snapshot_store is not None:
+            return self._read_snapshot('devices', self.snapshot_store.get_input_devices(self.server_url),
+                                       lambda: self._fetch_input_devices(timeout))
+        return self._fetch_input_devices(timeout)
+
+    def _fetch_input_devices(self, timeout: Optional[int]) -> List[DeviceAvailabilityDict]:
+        def parse(response: requests.Response) -> List[DeviceAvailabilityDict]:
+            devices_in_use = self.find_devices_in_use()
+            devices = _parse_device_list(response.content, devices_in_use)
+            if self.snapshot_store is not None:
+                self.snapshot_store.record_devices(self.server_url, devices)
+            return devices
+        return self._get(f'{self.server_url}/devices', parse, timeout)
 
+    @_operation
     def get_input_device_by_id(self, input_device_id: str, timeout: Optional[int] = None) -> DeviceAvailabilityDict:
-        devices_url = f'{self.server_url}/devices/{input_device_id}'
-        devices_headers = self.generate_headers(devices_url)
-        devices = self.send_request(
-            http_method="GET", url=devices_url, headers=devices_headers, timeout=timeout)
-        device_info = xmltodict.parse(devices.text)['device']
-        devices_in_use = self.find_devices_in_use()
-        device_info['availability'] = (device_info['device_name']
-                                       not in devices_in_use)
-        device_info.pop('@href')
-        return DeviceAvailabilityDict(
-            id=device_info['id'],
-            name=device_info['name'],
-            description=device_info['description'],
-            device_name=device_info['device_name'],
-            device_number=device_info['device_number'],
-            device_type=device_info['device_type'],
-            availability=device_info['availability'],
-            channel=device_info['channel'],
-            channel_type=device_info['channel_type'],
-            quad=device_info['quad'],
-        )
+        return self._get(f'{self.server_url}/devices/{input_device_id}',
+                         lambda response: _parse_device(response.content, self.find_devices_in_use()), timeout)
 
+    @_operation
     def generate_preview(self, input_id: str, timeout: Optional[int] = None) -> PreviewUrlDict:
         url = f'{self.server_url}/inputs/generate_preview'
         headers = self.generate_headers(url)
@@ -289,28 +950,101 @@ class ElementalLive:
                                   'charset=UTF-8'
 
         # generate body
-        data = f"input_key=0&live_event[inputs_attributes][0][source_type]=" \
-               f"DeviceInput&live_event[inputs_attributes][0]" \
-               f"[device_input_attributes][sdi_settings_attributes]" \
-               f"[input_format]=Auto&live_event[inputs_attributes][0]" \
-               f"[device_input_attributes][device_id]={input_id}"
+        data = _preview_request_body(input_id)
         response = self.send_request(
             http_method="POST", url=url, headers=headers, body=data, timeout=timeout)
 
-        response_parse = ast.literal_eval(response.text)
+        return _parse_preview(self.server_url, response.status_code, response.content)
+
+    @_operation
+    def fetch_preview_thumbnail(self, input_id: str, timeout: Optional[int] = None) -> PreviewThumbnailDict:
+        """Generate a preview of input_id and download its JPEG, served from thumbnail_cache while fresh"""
+        if self.thumbnail_cache is not None:
+            cached = self.thumbnail_cache.get(input_id)
+            if cached is not MISSING:
+                return cached
+        preview_url = self.generate_preview(input_id, timeout=timeout)['preview_url']
+        headers = self.generate_headers(preview_url)
+        headers['Accept'] = 'image/jpeg'
+        response = self.send_request(http_method="GET", url=preview_url, headers=headers, timeout=timeout)
+        preview = PreviewThumbnailDict(preview_url=preview_url, thumbnail=response.content)
+        if self.thumbnail_cache is not None:
+            self.thumbnail_cache.set(input_id, preview)
+        return preview
 
-        if 'type' in response_parse and response_parse['type'] == 'error':
-            raise ElementalException(
-                f"Response: {response.status_code}\n{response.text}")
+    def generate_previews(self, input_ids: Iterable[str], fetch_thumbnails: bool = False, max_workers: int = 10,
+                          deadline: Optional[float] = None, timeout: Optional[int] = None) -> PreviewBatchDict:
+        """Generate previews of many inputs concurrently, optionally downloading their JPEGs too
+
+        Inputs that failed, or did not finish within deadline seconds, are reported under ``errors``.
+        """
+        input_ids = list(input_ids)
+        if fetch_thumbnails:
+            operation: Callable[[str], Union[PreviewUrlDict, PreviewThumbnailDict]] = \
+                lambda input_id: self.fetch_preview_thumbnail(input_id, timeout=timeout)
         else:
-            preview_url = f'{self.server_url}/images/thumbs/' \
-                          f'p_{response_parse["preview_image_id"]}_job_0.jpg'
-            return {'preview_url': preview_url}
+            operation = lambda input_id: self.generate_preview(input_id, timeout=timeout)
+        previews = PreviewBatchDict(results={}, errors={})
+        for input_id, future in _map_concurrently(operation, input_ids, max_workers, deadline):
+            try:
+                previews['results'][input_id] = future.result()
+            except ElementalException as e:
+                previews['errors'][input_id] = e
+        for input_id in input_ids:
+            if input_id not in previews['results'] and input_id not in previews['errors']:
+                previews['errors'][input_id] = DeadlineExceeded(f"{input_id}: not finished within {deadline}s")
+        return previews
+
+    def _run_batch(self, operation: Callable[[str], None], event_ids: List[str], max_workers: int,
+                   deadline: Optional[float]) -> Dict[str, Optional[ElementalException]]:
+        outcomes: Dict[str, Optional[ElementalException]] = {}
+        for event_id, future in _map_concurrently(operation, event_ids, max_workers, deadline):
+            try:
+                future.result()
+                outcomes[event_id] = None
+            except ElementalException as e:
+                outcomes[event_id] = e
+        return {event_id: outcomes[event_id] if event_id in outcomes
+                else DeadlineExceeded(f"{event_id}: not finished within {deadline}s")
+                for event_id in event_ids}
+
+    def start_events(self, event_ids: Iterable[str], max_workers: int = 10, deadline: Optional[float] = None,
+                     timeout: Optional[int] = None) -> Dict[str, Optional[ElementalException]]:
+        """Start many events concurrently, mapping each event id to None or the exception it raised
+
+        Events still in flight when deadline (seconds) runs out are reported as DeadlineExceeded.
+        """
+        return self._run_batch(lambda event_id: self.start_event(event_id, timeout=timeout),
+                               list(event_ids), max_workers, deadline)
+
+    def stop_events(self, event_ids: Iterable[str], max_workers: int = 10, deadline: Optional[float] = None,
+                    timeout: Optional[int] = None) -> Dict[str, Optional[ElementalException]]:
+        return self._run_batch(lambda event_id: self.stop_event(event_id, timeout=timeout),
+                               list(event_ids), max_workers, deadline)
+
+    def cancel_events(self, event_ids: Iterable[str], max_workers: int = 10, deadline: Optional[float] = None,
+                      timeout: Optional[int] = None) -> Dict[str, Optional[ElementalException]]:
+        return self._run_batch(lambda event_id: self.cancel_event(event_id, timeout=timeout),
+                               list(event_ids), max_workers, deadline)
+
+    def reset_events(self, event_ids: Iterable[str], max_workers: int = 10, deadline: Optional[float] = None,
+                     timeout: Optional[int] = None) -> Dict[str, Optional[ElementalException]]:
+        return self._run_batch(lambda event_id: self.reset_event(event_id, timeout=timeout),
+                               list(event_ids), max_workers, deadline)
+
+    def delete_events(self, event_ids: Iterable[str], max_workers: int = 10, deadline: Optional[float] = None,
+                      timeout: Optional[int] = None) -> Dict[str, Optional[ElementalException]]:
+        return self._run_batch(lambda event_id: self.delete_event(event_id, timeout=timeout),
+                               list(event_ids), max_workers, deadline)
 
     def event_can_delete(self, channel_id: str, timeout: Optional[int] = None) -> bool:
-        channel_info = self.describe_event(channel_id, timeout=timeout)
-        return channel_info['status'] not in ('pending', 'running', 'preprocessing', 'postprocessing',)
+        if self.snapshot_store is None:
+            channel_info = self.describe_event(channel_id, timeout=timeout)
+        else:
+            # Skip the snapshot: a stale one could let a running event be deleted
+            with _operation_scope('describe_event'):
+                channel_info = _parse_event_info(self._fetch_event_xml(channel_id, timeout))
+        return channel_info['status'] not in UNDELETABLE_STATUSES
 
     def _parse_status(self, text):
-        status = ET.fromstring(text).find('status')
-        return status.text if status is not None else 'unknown'
+        return _parse_status(text)
@@ -0,0 +1,72 @@
+"""Order- and whitespace-insensitive fingerprints of live_event documents
+
+Two documents get the same fingerprint when they only differ in sibling order,
+whitespace, elements marked nil="true", or fields the appliance manages itself
+(ids, hrefs, status and runtime statistics). ``event_covers`` relaxes that to the
+settings a desired document actually specifies, since an appliance reports every
+setting, defaults included; ``event_changed`` combines both and is what deciding
+whether an event needs an update should use.
+"""
+import hashlib
+import xml.etree.ElementTree as ET
+from typing import List, Union
+
+SERVER_MANAGED_ELEMENTS = frozenset({
+    'id', 'active_input_id', 'node_id', 'node', 'submitted', 'status', 'average_fps', 'buffer_avg', 'buffer_max',
+    'dropped_frames', 'start_time', 'complete_time', 'elapsed', 'elapsed_time_in_words', 'active', 'error_clear_time',
+    'audit_messages', 'error_messages',
+})
+
+SERVER_MANAGED_ATTRIBUTES = frozenset({'href', 'product', 'version'})
+
+
+def _compared_children(element: ET.Element) -> List[ET.Element]:
+    return [child for child in element if child.tag not in SERVER_MANAGED_ELEMENTS and child.get('nil') != 'true']
+
+
+def _digest(element: ET.Element) -> bytes:
+    # Children are hashed first and sorted by digest, so sibling order never matters
+    children = sorted(_digest(child) for child in _compared_children(element))
+    attributes = sorted((name, value) for name, value in element.attrib.items()
+                        if name not in SERVER_MANAGED_ATTRIBUTES)
+    node = hashlib.sha256(repr((element.tag, attributes, (element.text or '').strip())).encode('utf-8'))
+    for child in children:
+        node.update(child)
+    return node.digest()
+
+
+def event_fingerprint(event_xml: Union[bytes, str]) -> str:
+    return _digest(ET.fromstring(event_xml)).hex()
+
+
+def _covers(actual: ET.Element, desired: ET.Element) -> bool:
+    if actual.tag != desired.tag:
+        return False
+    if any(actual.get(name) != value for name, value in desired.attrib.items()
+           if name not in SERVER_MANAGED_ATTRIBUTES):
+        return False
+    wanted = _compared_children(desired)
+    if not wanted:
+        return (actual.text or '').strip() == (desired.text or '').strip()
+    # Each desired child needs an actual child of its own; the first one that matches is taken
+    available = _compared_children(actual)
+    for child in wanted:
+        match = next((candidate for candidate in available if _covers(candidate, child)), None)
+        if match is None:
+            return False
+        available.remove(match)
+    return True
+
+
+def event_covers(event_xml: Union[bytes, str], desired_xml: Union[bytes, str]) -> bool:
+    """Whether event_xml has every element, attribute and value of desired_xml, ignoring what fingerprints ignore"""
+    return _covers(ET.fromstring(event_xml), ET.fromstring(desired_xml))
+
+
+def event_changed(event_xml: Union[bytes, str], desired_xml: Union[bytes, str]) -> bool:
+    """Whether applying desired_xml would change the event described by event_xml
+
+    True when their fingerprints differ and event_xml does not cover desired_xml either.
+    """
+    actual, desired = ET.fromstring(event_xml), ET.fromstring(desired_xml)
+    return _digest(actual) != _digest(desired) and not _covers(actual, desired)
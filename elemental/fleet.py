@@ -0,0 +1,132 @@
+import time
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Tuple, TypedDict)
+
+from .client import (OUTPUT_ACTIONS, DeviceAvailabilityDict,
+                     ElementalException, ElementalLive, EventStatusDict,
+                     NotFound, OutputCommandResultDict, _map_concurrently)
+
+FleetResultDict = TypedDict('FleetResultDict', {
+    'results': Dict[str, Any],
+    'errors': Dict[str, ElementalException]
+})
+
+FleetDeviceDict = TypedDict('FleetDeviceDict', {'server_url': str, 'device': DeviceAvailabilityDict})
+
+
+class ElementalFleet:
+    """Many ElementalLive appliances queried concurrently on a bounded thread pool
+
+    Every fan-out call returns its results keyed by ``server_url``; appliances that
+    fail are reported under ``errors`` instead of aborting the whole sweep.
+    """
+
+    def __init__(self, clients: Iterable[ElementalLive], max_workers: int = 10) -> None:
+        self.clients: Dict[str, ElementalLive] = {client.server_url: client for client in clients}
+        self.max_workers = max_workers
+
+    @classmethod
+    def from_urls(cls, server_urls: Iterable[str], user: Optional[str] = None, api_key: Optional[str] = None,
+                  timeout: Optional[int] = 5, max_workers: int = 10) -> 'ElementalFleet':
+        return cls([ElementalLive(url, user, api_key, timeout) for url in server_urls], max_workers=max_workers)
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def iter_map(self, operation: Callable[[ElementalLive], Any], server_urls: Optional[Iterable[str]] = None
+                 ) -> Iterator[Tuple[str, Any, Optional[ElementalException]]]:
+        """Yield (server_url, result, error) for every appliance as soon as its call finishes"""
+        urls = list(self.clients) if server_urls is None else list(server_urls)
+        for server_url, future in _map_concurrently(
+                lambda url: operation(self.clients[url]), urls, self.max_workers):
+            try:
+                yield server_url, future.result(), None
+            except ElementalException as e:
+                yield server_url, None, e
+
+    def map(self, operation: Callable[[ElementalLive], Any],
+            server_urls: Optional[Iterable[str]] = None) -> FleetResultDict:
+        fleet_result = FleetResultDict(results={}, errors={})
+        for server_url, result, error in self.iter_map(operation, server_urls):
+            if error is None:
+                fleet_result['results'][server_url] = result
+            else:
+                fleet_result['errors'][server_url] = error
+        return fleet_result
+
+    def get_input_devices(self, timeout: Optional[int] = None) -> FleetResultDict:
+        return self.map(lambda client: client.get_input_devices(timeout=timeout))
+
+    def describe_event(self, event_id: str, timeout: Optional[int] = None) -> FleetResultDict:
+        return self.map(lambda client: client.describe_event(event_id, timeout=timeout))
+
+    def get_event_status(self, event_id: str, timeout: Optional[int] = None) -> FleetResultDict:
+        return self.map(lambda client: client.get_event_status(event_id, timeout=timeout))
+
+    def find_free_device(self, device_type: Optional[str] = None, channel_type: Optional[str] = None,
+                         timeout: Optional[int] = None) -> Optional[FleetDeviceDict]:
+        """Return the first available device found on any appliance, without waiting for the slower ones"""
+        def free_devices(client: ElementalLive) -> List[DeviceAvailabilityDict]:
+            return [device for device in client.get_input_devices(timeout=timeout)
+                    if device['availability']
+                    and device_type in (None, device['device_type'])
+                    and channel_type in (None, device['channel_type'])]
+
+        for server_url, devices, error in self.iter_map(free_devices):
+            if devices:
+                return FleetDeviceDict(server_url=server_url, device=devices[0])
+        return None
+
+    def control_outputs(self, commands: Iterable[Tuple[str, str, str, str]], max_workers: int = 10,
+                        deadline: Optional[float] = None,
+                        timeout: Optional[int] = None) -> List[OutputCommandResultDict]:
+        """Run (server_url, event_id, output_id, action) commands, every appliance's share concurrently
+
+        Commands are grouped per appliance and every group goes through that client's
+        ``control_outputs`` at the same time, each with up to max_workers calls in flight.
+        deadline covers the whole call rather than each appliance. Returns one outcome per
+        command in input order.
+        """
+        commands = list(commands)
+        groups: Dict[str, List[int]] = {}
+        for index, (server_url, _, _, action) in enumerate(commands):
+            if server_url not in self.clients:
+                raise ValueError(f"{server_url} is not part of the fleet")
+            if action not in OUTPUT_ACTIONS:
+                raise ValueError(f"Unknown output action {action}, expected one of {', '.join(OUTPUT_ACTIONS)}")
+            groups.setdefault(server_url, []).append(index)
+        expires = None if deadline is None else time.monotonic() + deadline
+
+        def control(server_url: str) -> List[OutputCommandResultDict]:
+            remaining = None if expires is None else max(0.0, expires - time.monotonic())
+            return self.clients[server_url].control_outputs([commands[index][1:] for index in groups[server_url]],
+                                                            max_workers=max_workers, deadline=remaining,
+                                                            timeout=timeout)
+
+        outcomes: Dict[int, OutputCommandResultDict] = {}
+        # One worker per appliance: a slow appliance must not hold the others back
+        for server_url, future in _map_concurrently(control, list(groups), len(groups)):
+            try:
+                results = future.result()
+            except ElementalException as e:
+                results = [OutputCommandResultDict(server_url=server_url, event_id=commands[index][1],
+                                                   output_id=commands[index][2], action=commands[index][3], error=e)
+                           for index in groups[server_url]]
+            for index, outcome in zip(groups[server_url], results):
+                outcomes[index] = outcome
+        return [outcomes[index] for index in range(len(commands))]
+
+    def locate_event(self, event_id: str, timeout: Optional[int] = None) -> FleetResultDict:
+        """Describe event_id on every appliance, keeping only the appliances that know it
+
+        Appliances answering 404 are dropped, any other failure is reported under ``errors``.
+        """
+        def describe(client: ElementalLive) -> Optional[EventStatusDict]:
+            try:
+                return client.describe_event(event_id, timeout=timeout)
+            except NotFound:
+                return None
+
+        located = self.map(describe)
+        located['results'] = {url: info for url, info in located['results'].items() if info is not None}
+        return located
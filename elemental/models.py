@@ -0,0 +1,65 @@
+import xml.etree.ElementTree as ET
+from typing import NamedTuple, Optional, Tuple, Union
+
+
+class EventInput(NamedTuple):
+    id: Optional[str]
+    order: Optional[str]
+    device_name: Optional[str]
+
+
+class EventOutput(NamedTuple):
+    id: Optional[str]
+    output_group_id: Optional[str]
+    order: Optional[str]
+    name_modifier: Optional[str]
+    extension: Optional[str]
+    stream_assembly_name: Optional[str]
+
+
+class LiveEvent:
+    """Snapshot of a live_event built from a single parse of the response
+
+    Every field is decoded from that parse up front and the document is not kept,
+    so long-lived snapshots only hold small tuples and an instance can be shared
+    between threads without any locking.
+    """
+    __slots__ = ('id', 'name', 'status', 'destinations', 'inputs', 'outputs', 'device_names')
+
+    def __init__(self, element: ET.Element) -> None:
+        self.id = element.findtext('id') or element.get('href', '').rsplit('/', 1)[-1]
+        self.name = element.findtext('name')
+        self.status = element.findtext('status') or 'unknown'
+        # uri of every destination, in document order
+        self.destinations: Tuple[Optional[str], ...] = tuple(
+            destination.findtext('uri') for destination in element.iter('destination'))
+        self.inputs: Tuple[EventInput, ...] = tuple(
+            EventInput(id=input.findtext('id'), order=input.findtext('order'),
+                       device_name=input.findtext('device_input/device_name'))
+            for input in element.iterfind('input'))
+        self.outputs: Tuple[EventOutput, ...] = tuple(
+            EventOutput(id=output.findtext('id'), output_group_id=output_group.findtext('id'),
+                        order=output.findtext('order'), name_modifier=output.findtext('name_modifier'),
+                        extension=output.findtext('extension'), stream_assembly_name=output.findtext('stream_assembly_name'))
+            for output_group in element.iterfind('output_group') for output in output_group.iterfind('output'))
+        self.device_names: Tuple[Optional[str], ...] = tuple(
+            device_name.text for device_name in element.iter('device_name'))
+
+    @classmethod
+    def from_xml(cls, content: Union[bytes, str]) -> 'LiveEvent':
+        return cls(ET.fromstring(content))
+
+    def __repr__(self) -> str:
+        return f'LiveEvent(id={self.id!r}, name={self.name!r}, status={self.status!r})'
+
+    @property
+    def origin_url(self) -> str:
+        destinations = self.destinations
+        return str(destinations[0]) if destinations and destinations[0] is not None else ''
+
+    @property
+    def backup_url(self) -> Optional[str]:
+        destinations = self.destinations
+        if len(destinations) < 2:
+            return None
+        return destinations[1] or ''
@@ -0,0 +1,126 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .client import ElementalLive
+
+logger = logging.getLogger(__name__)
+
+# Called with (event_id, previous_status, current_status); a status of None means the
+# event was not seen on the appliance (yet, or anymore)
+StatusChangeCallback = Callable[[str, Optional[str], Optional[str]], None]
+
+
+class _PollingThread:
+    """Daemon thread calling poll every interval seconds until stopped
+
+    Whatever poll raises is logged and the next tick goes ahead anyway: the thread is the
+    only one polling its appliance. Shared by EventStatusPoller and EventBus.
+    """
+
+    def __init__(self, poll: Callable[[], Any], interval: float, name: str, server_url: str) -> None:
+        self.poll = poll
+        self.interval = interval
+        self.server_url = server_url
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the thread to finish after its current tick; join() waits for it"""
+        self._stopped.set()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        self._thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Polling %s failed", self.server_url)
+            self._stopped.wait(self.interval)
+
+
+class EventStatusPoller:
+    """Track the status of many events on one appliance with as few list requests as possible
+
+    Every tick walks ``iter_events`` once, stopping as soon as every watched event was seen,
+    instead of one ``get_event_status`` request per event. Callbacks only run for events
+    whose status changed since the previous tick; an event first seen counts as changing
+    from None, one that was never seen does not change at all.
+    """
+
+    def __init__(self, client: ElementalLive, event_ids: Iterable[str] = (), interval: float = 5.0,
+                 page_size: int = 100, timeout: Optional[int] = None) -> None:
+        self.client = client
+        self.interval = interval
+        self.page_size = page_size
+        self.timeout = timeout
+        self.statuses: Dict[str, Optional[str]] = {}
+        self._watched: Set[str] = set(event_ids)
+        self._callbacks: List[StatusChangeCallback] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[_PollingThread] = None
+
+    def watch(self, event_id: str) -> None:
+        with self._lock:
+            self._watched.add(event_id)
+
+    def unwatch(self, event_id: str) -> None:
+        with self._lock:
+            self._watched.discard(event_id)
+            self.statuses.pop(event_id, None)
+
+    def on_change(self, callback: StatusChangeCallback) -> None:
+        self._callbacks.append(callback)
+
+    def poll(self) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """Refresh every watched event once, returning {event_id: (previous, current)} for transitions"""
+        with self._lock:
+            watched = set(self._watched)
+        if not watched:
+            return {}
+
+        current: Dict[str, Optional[str]] = {}
+        for event in self.client.iter_events(page_size=self.page_size, timeout=self.timeout):
+            if event['id'] in watched:
+                current[event['id']] = event['status']
+                if len(current) == len(watched):
+                    break
+
+        changes = {}
+        with self._lock:
+            for event_id in watched & self._watched:
+                previous = self.statuses.get(event_id)
+                status = current.get(event_id)
+                if previous != status:
+                    changes[event_id] = (previous, status)
+                self.statuses[event_id] = status
+
+        for event_id, (previous, status) in changes.items():
+            for callback in self._callbacks:
+                try:
+                    callback(event_id, previous, status)
+                except Exception:
+                    logger.exception("Status change callback failed for event %s", event_id)
+        return changes
+
+    def start(self) -> None:
+        """Poll every interval seconds on a daemon thread until stop() is called"""
+        if self._thread is not None:
+            return
+        self._thread = _PollingThread(self.poll, self.interval, f'EventStatusPoller({self.client.server_url})',
+                                      self.client.server_url)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread.join(timeout)
+            self._thread = None
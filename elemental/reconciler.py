@@ -0,0 +1,221 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, TypedDict
+
+from .client import (UNDELETABLE_STATUSES, ElementalException, ElementalLive,
+                     EventSummaryDict, EventXml, _map_concurrently)
+from .fingerprint import event_changed
+from .fleet import ElementalFleet, FleetResultDict
+from .templates import _event_body
+
+logger = logging.getLogger(__name__)
+
+DesiredEventDict = TypedDict('DesiredEventDict', {
+    'server_url': str,
+    'name': str,
+    'event_xml': EventXml,
+    'running': bool
+})
+
+# action is one of create, update, reset, start, stop, cancel and delete; event_id is None
+# until a planned create has run. event_xml is only set for create and update.
+PlannedOperationDict = TypedDict('PlannedOperationDict', {
+    'server_url': str,
+    'event_name': str,
+    'event_id': Optional[str],
+    'action': str,
+    'restart': bool,
+    'event_xml': Optional[EventXml]
+})
+
+ReconcilePlanDict = TypedDict('ReconcilePlanDict', {
+    'operations': List[PlannedOperationDict],
+    'errors': Dict[str, ElementalException]
+})
+
+ReconcileResultDict = TypedDict('ReconcileResultDict', {
+    'plan': ReconcilePlanDict,
+    'applied': List[PlannedOperationDict],
+    'errors': List[Tuple[PlannedOperationDict, ElementalException]]
+})
+
+RUNNING_STATUSES = ('preprocessing', 'running')
+FINISHED_STATUSES = ('complete', 'cancelled', 'error')
+
+# Chains that free devices run before the ones that may need them
+_RELEASING_ACTIONS = frozenset({'stop', 'cancel', 'delete'})
+
+
+class Reconciler:
+    """Converge the events of a fleet onto a desired state
+
+    Events are matched by name on their appliance. Actual state is read with one
+    paged ``iter_events`` walk per appliance, and each matched event's XML is read once from
+    the appliance (``get_current_event_xml``) and compared with ``event_changed``, the same
+    test ``update_event_if_changed`` uses, so settings the desired XML leaves out are not
+    treated as changes. Only events that differ produce operations. With prune, events that are not desired are
+    cancelled when ``event_can_delete`` would refuse them, then deleted.
+
+    ``plan`` is a dry run; ``apply`` runs a plan, one event's operations in order and up to
+    max_workers events at a time, stopping and deleting before creating and starting.
+    """
+
+    def __init__(self, fleet: ElementalFleet, prune: bool = False, max_workers: int = 10,
+                 settle_deadline: float = 60, timeout: Optional[int] = None) -> None:
+        self.fleet = fleet
+        self.prune = prune
+        self.max_workers = max_workers
+        self.settle_deadline = settle_deadline
+        self.timeout = timeout
+
+    def snapshot(self, server_urls: Optional[Iterable[str]] = None) -> FleetResultDict:
+        """Every event of every appliance (or of server_urls), as lists of EventSummaryDict"""
+        return self.fleet.map(lambda client: list(client.iter_events(timeout=self.timeout)), server_urls)
+
+    def plan(self, desired: Iterable[DesiredEventDict]) -> ReconcilePlanDict:
+        desired_by_url: Dict[str, Dict[str, DesiredEventDict]] = {}
+        for event in desired:
+            if event['server_url'] not in self.fleet.clients:
+                raise ValueError(f"{event['server_url']} is not part of the fleet")
+            desired_by_url.setdefault(event['server_url'], {})[event['name']] = event
+
+        server_urls = list(self.fleet.clients) if self.prune else list(desired_by_url)
+        snapshot = self.snapshot(server_urls)
+        actual: Dict[str, List[EventSummaryDict]] = snapshot['results']
+
+        matched: List[Tuple[DesiredEventDict, EventSummaryDict]] = []
+        operations: List[PlannedOperationDict] = []
+        for server_url, events in actual.items():
+            wanted = desired_by_url.get(server_url, {})
+            seen = set()
+            for summary in events:
+                name = summary['name'] or ''
+                if name in wanted and name not in seen:
+                    seen.add(name)
+                    matched.append((wanted[name], summary))
+                elif self.prune:
+                    operations.extend(self._prune(server_url, summary))
+            for name, event in wanted.items():
+                if name not in seen:
+                    operations.append(_operation(server_url, name, None, 'create', event_xml=event['event_xml']))
+                    if event['running']:
+                        operations.append(_operation(server_url, name, None, 'start'))
+
+        changed = self._changed(matched)
+        for event, summary in matched:
+            operations.extend(self._converge(event, summary, changed.get((event['server_url'], summary['id']), True)))
+        return ReconcilePlanDict(operations=operations, errors=snapshot['errors'])
+
+    def _changed(self, matched: Sequence[Tuple[DesiredEventDict, EventSummaryDict]]) -> Dict[Tuple[str, str], bool]:
+        """Whether each matched event's XML lacks some of the desired one; unknown counts as changed"""
+        def compare(index: int) -> bool:
+            event, summary = matched[index]
+            current = self.fleet.clients[event['server_url']].get_current_event_xml(summary['id'], timeout=self.timeout)
+            return event_changed(current, _event_body(event['event_xml']))
+
+        changed = {}
+        for index, future in _map_concurrently(compare, range(len(matched)), self.max_workers):
+            event, summary = matched[index]
+            try:
+                changed[event['server_url'], summary['id']] = future.result()
+            except ElementalException:
+                logger.warning("Could not compare %s on %s, planning an update", summary['id'], event['server_url'],
+                               exc_info=True)
+        return changed
+
+    def _prune(self, server_url: str, summary: EventSummaryDict) -> List[PlannedOperationDict]:
+        name = summary['name'] or ''
+        operations = []
+        if summary['status'] in UNDELETABLE_STATUSES:
+            operations.append(_operation(server_url, name, summary['id'], 'cancel'))
+        operations.append(_operation(server_url, name, summary['id'], 'delete'))
+        return operations
+
+    def _converge(self, event: DesiredEventDict, summary: EventSummaryDict,
+                  changed: bool) -> List[PlannedOperationDict]:
+        status, server_url, name, event_id = summary['status'], event['server_url'], event['name'], summary['id']
+        operations = []
+        if not event['running'] and status in RUNNING_STATUSES:
+            operations.append(_operation(server_url, name, event_id, 'stop'))
+        if changed:
+            operations.append(_operation(server_url, name, event_id, 'update', event_xml=event['event_xml'],
+                                         restart=event['running'] and status in RUNNING_STATUSES))
+        if event['running'] and status in FINISHED_STATUSES:
+            operations.append(_operation(server_url, name, event_id, 'reset'))
+        if event['running'] and status not in RUNNING_STATUSES + ('postprocessing',):
+            operations.append(_operation(server_url, name, event_id, 'start'))
+        return operations
+
+    def apply(self, plan: ReconcilePlanDict) -> ReconcileResultDict:
+        chains: Dict[Tuple[str, str, Optional[str]], List[PlannedOperationDict]] = {}
+        for operation in plan['operations']:
+            chains.setdefault((operation['server_url'], operation['event_name'], operation['event_id']),
+                              []).append(operation)
+        result = ReconcileResultDict(plan=plan, applied=[], errors=[])
+        releasing: List[List[PlannedOperationDict]] = []
+        others: List[List[PlannedOperationDict]] = []
+        for chain in chains.values():
+            releasing_chain = any(operation['action'] in _RELEASING_ACTIONS for operation in chain)
+            (releasing if releasing_chain else others).append(chain)
+        for phase in (releasing, others):
+            for _, future in _map_concurrently(self._run_chain, phase, self.max_workers):
+                applied, error = future.result()
+                result['applied'].extend(applied)
+                if error is not None:
+                    result['errors'].append(error)
+        return result
+
+    def _run_chain(self, chain: List[PlannedOperationDict]
+                   ) -> Tuple[List[PlannedOperationDict], Optional[Tuple[PlannedOperationDict, ElementalException]]]:
+        """Run one event's operations in order, stopping at the first failure"""
+        client = self.fleet.clients[chain[0]['server_url']]
+        event_id = chain[0]['event_id']
+        applied: List[PlannedOperationDict] = []
+        for planned in chain:
+            operation = _operation(planned['server_url'], planned['event_name'], event_id, planned['action'],
+                                   planned['event_xml'], planned['restart'])
+            try:
+                event_id = self._run(client, operation)
+            except ElementalException as e:
+                return applied, (operation, e)
+            operation['event_id'] = event_id
+            applied.append(operation)
+        return applied, None
+
+    def _run(self, client: ElementalLive, operation: PlannedOperationDict) -> str:
+        action, event_id, timeout = operation['action'], operation['event_id'], self.timeout
+        if action == 'create':
+            return client.create_event(_event_body(operation['event_xml'] or ''), timeout=timeout)['id']
+        assert event_id is not None
+        if action == 'update':
+            client.update_event(event_id, _event_body(operation['event_xml'] or ''), restart=operation['restart'],
+                                timeout=timeout)
+        elif action == 'reset':
+            client.reset_event(event_id, timeout=timeout)
+        elif action == 'start':
+            client.start_event(event_id, timeout=timeout)
+        elif action == 'stop':
+            client.stop_event(event_id, timeout=timeout)
+        elif action == 'cancel':
+            client.cancel_event(event_id, timeout=timeout)
+            client.wait_for_status(event_id, FINISHED_STATUSES, deadline=self.settle_deadline, fail_on=(),
+                                   timeout=timeout)
+        elif action == 'delete':
+            client.delete_event(event_id, timeout=timeout)
+        else:
+            raise ValueError(f"Unknown reconcile action {action}")
+        return event_id
+
+    def reconcile(self, desired: Iterable[DesiredEventDict], dry_run: bool = False) -> ReconcileResultDict:
+        """Plan and, unless dry_run, apply; appliances that could not be listed are skipped"""
+        plan = self.plan(desired)
+        for server_url, error in plan['errors'].items():
+            logger.warning("Skipping %s, its events could not be listed: %s", server_url, error)
+        if dry_run:
+            return ReconcileResultDict(plan=plan, applied=[], errors=[])
+        return self.apply(plan)
+
+
+def _operation(server_url: str, event_name: str, event_id: Optional[str], action: str,
+               event_xml: Optional[EventXml] = None, restart: bool = False) -> PlannedOperationDict:
+    return PlannedOperationDict(server_url=server_url, event_name=event_name, event_id=event_id, action=action,
+                                restart=restart, event_xml=event_xml)
@@ -0,0 +1,90 @@
+import random
+import threading
+import time
+from typing import Callable, Collection, Optional
+
+
+class RetryPolicy:
+    """When and how long to wait before sending a failed request again
+
+    Only idempotent methods are retried, after a connection failure or one of
+    retry_statuses, waiting a random ("full jitter") share of an exponentially
+    growing backoff capped at backoff_max seconds.
+    """
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+    def __init__(self, max_attempts: int = 3, backoff_base: float = 0.2, backoff_max: float = 5.0,
+                 retry_statuses: Collection[int] = (502, 503, 504),
+                 methods: Collection[str] = IDEMPOTENT_METHODS) -> None:
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.methods = frozenset(method.upper() for method in methods)
+
+    def should_retry(self, http_method: str, attempt: int, status_code: Optional[int] = None) -> bool:
+        """Whether attempt (1-based) may be followed by another one; status_code is None for connection failures"""
+        if attempt >= self.max_attempts or http_method.upper() not in self.methods:
+            return False
+        return status_code is None or status_code in self.retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Stop calling an appliance after failure_threshold consecutive failures
+
+    While open every call is rejected; after reset_timeout seconds a single probe
+    is let through (half-open) and its outcome closes or re-opens the circuit.
+    Share one instance between all clients talking to the same appliance.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if self.clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._state = self.CLOSED
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self.clock()
+                self._probing = False
@@ -0,0 +1,310 @@
+"""Stateful stand-in for an Elemental Live appliance, for load and soak testing
+
+    with ElementalSimulator(devices=8, latency=0.01) as simulator:
+        client = ElementalLive(simulator.url)
+        event_id = client.create_event(event_xml)['id']
+        client.start_event(event_id)
+
+Events move through pending -> preprocessing -> running -> postprocessing -> complete
+on a timer, starting an event occupies its input device, and every request can be
+slowed down or failed on purpose.
+"""
+import json
+import random
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import parse_qs, urlparse
+
+ACTIVE_STATUSES = ('preprocessing', 'running', 'postprocessing')
+
+# Placeholder JPEG bytes, served for every preview thumbnail
+THUMBNAIL = bytes.fromhex(
+    'ffd8ffe000104a46494600010100000100010000ffdb004300080606070605080707070909080a0c140d0c0b0b0c1912130f141d1a1f'
+    '1e1d1a1c1c20242e2720222c231c1c2837292c30313434341f27393d38323c2e333432ffc0000b080001000101011100ffc4001f0000'
+    '010501010101010100000000000000000102030405060708090a0bffc400b5100002010303020403050504040000017d010203000411'
+    '05122131410613516107227114328191a1082342b1c11552d1f02433627282090a161718191a25262728292a3435363738393a434445'
+    '464748494a535455565758595a636465666768696a737475767778797a838485868788898a92939495969798999aa2a3a4a5a6a7a8a9'
+    'aab2b3b4b5b6b7b8b9bac2c3c4c5c6c7c8c9cad2d3d4d5d6d7d8d9dae1e2e3e4e5e6e7e8e9eaf1f2f3f4f5f6f7f8f9faffda0008010100'
+    '003f00fbd3ffd9')
+
+
+class SimulatorError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class SimulatedEvent:
+    """One live event and the timestamps driving its status"""
+
+    def __init__(self, event_id: str, document: ET.Element) -> None:
+        self.id = event_id
+        self.document = document
+        self.status = 'pending'
+        self.status_until: Optional[float] = None
+        self.next_status: Optional[str] = None
+        self.paused_outputs: Set[str] = set()
+        self.stopped_outputs: Set[str] = set()
+
+    @property
+    def device_names(self) -> List[str]:
+        return [element.text for element in self.document.iter('device_name') if element.text]
+
+    def transition(self, status: str, after: Optional[float] = None, next_status: Optional[str] = None) -> None:
+        self.status = status
+        self.status_until = after
+        self.next_status = next_status
+
+    def advance(self, now: float) -> None:
+        if self.status_until is not None and self.next_status is not None and now >= self.status_until:
+            self.transition(self.next_status)
+
+    def to_xml(self) -> bytes:
+        document = ET.Element('live_event', {'href': f'/live_events/{self.id}', 'product': 'Elemental Live Simulator'})
+        ET.SubElement(document, 'id').text = self.id
+        for child in self.document:
+            if child.tag not in ('id', 'status'):
+                document.append(child)
+        ET.SubElement(document, 'status').text = self.status
+        return ET.tostring(document)
+
+    def status_xml(self) -> bytes:
+        document = ET.Element('live_event', {'href': f'/live_events/{self.id}'})
+        ET.SubElement(document, 'status').text = self.status
+        return ET.tostring(document)
+
+
+class ElementalSimulator(ThreadingHTTPServer):
+    """Local-socket simulator of the endpoints ElementalLive calls
+
+    devices: number of HD-SDI inputs the appliance has.
+    preprocessing_time / postprocessing_time: seconds spent in those statuses.
+    latency: seconds added to every request, or a callable returning them.
+    error_rate: share of requests answered with a 500 before touching any state.
+    """
+    daemon_threads = True
+
+    def __init__(self, devices: int = 16, preprocessing_time: float = 0.5, postprocessing_time: float = 0.5,
+                 latency: Union[float, Callable[[], float]] = 0.0, error_rate: float = 0.0, seed: Optional[int] = None,
+                 port: int = 0, clock: Callable[[], float] = time.monotonic) -> None:
+        super().__init__(('127.0.0.1', port), SimulatorRequestHandler)
+        self.devices = [(str(device_id), f'HD-SDI {device_id}') for device_id in range(1, devices + 1)]
+        self.preprocessing_time = preprocessing_time
+        self.postprocessing_time = postprocessing_time
+        self.latency = latency
+        self.error_rate = error_rate
+        self.clock = clock
+        self.requests = 0
+        self.events: Dict[str, SimulatedEvent] = {}
+        # Only events waiting on a timer need advancing, keeps requests O(1) with thousands of events
+        self._timed: Set[SimulatedEvent] = set()
+        self._random = random.Random(seed)
+        self._next_event_id = 1
+        self._next_preview_id = 1
+        self._lock = threading.RLock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_port}'
+
+    def __enter__(self) -> 'ElementalSimulator':
+        self._thread = threading.Thread(target=self.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+        self.server_close()
+
+    # Request plumbing
+
+    def before_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+            failed = self.error_rate and self._random.random() < self.error_rate
+        latency = self.latency() if callable(self.latency) else self.latency
+        if latency:
+            time.sleep(latency)
+        if failed:
+            raise SimulatorError(500, 'Injected failure')
+
+    def handle(self, method: str, path: str, query: Dict[str, List[str]], body: bytes) -> Tuple[int, str, bytes]:
+        """Return (status, content type, body) for one request"""
+        self.before_request()
+        with self._lock:
+            now = self.clock()
+            for event in list(self._timed):
+                event.advance(now)
+                if event.status_until is None:
+                    self._timed.discard(event)
+            return self._route(method, path, query, body, now)
+
+    def _route(self, method: str, path: str, query: Dict[str, List[str]], body: bytes,
+               now: float) -> Tuple[int, str, bytes]:
+        xml = 'application/xml'
+        if path == '/live_events' and method == 'GET':
+            return 200, xml, self._event_list(query)
+        if path == '/live_events' and method == 'POST':
+            return 201, xml, self._create_event(body).to_xml()
+        match = re.fullmatch(r'/live_events/(\d+)(?:/(\w+))?', path)
+        if match:
+            event = self._event(match.group(1))
+            action = match.group(2)
+            if action is None and method == 'GET':
+                return 200, xml, event.to_xml()
+            if action is None and method == 'PUT':
+                event.document = _parse_event_xml(body)
+                return 200, xml, event.to_xml()
+            if action is None and method == 'DELETE':
+                self._delete_event(event)
+                return 200, xml, event.to_xml()
+            if action == 'status' and method == 'GET':
+                return 200, xml, event.status_xml()
+            if method == 'POST' and action is not None:
+                self._event_action(event, action, body, now)
+                return 200, xml, event.status_xml()
+        if path == '/devices' and method == 'GET':
+            return 200, xml, self._device_list()
+        match = re.fullmatch(r'/devices/(\d+)', path)
+        if match and method == 'GET':
+            return 200, xml, self._device(match.group(1))
+        if path == '/inputs/generate_preview' and method == 'POST':
+            return 200, 'application/json', self._generate_preview(body)
+        if path.startswith('/images/thumbs/') and method == 'GET':
+            return 200, 'image/jpeg', THUMBNAIL
+        raise SimulatorError(404, f'No route for {method} {path}')
+
+    # Events
+
+    def _event(self, event_id: str) -> SimulatedEvent:
+        try:
+            return self.events[event_id]
+        except KeyError:
+            raise SimulatorError(404, f'Live Event {event_id} not found')
+
+    def _create_event(self, body: bytes) -> SimulatedEvent:
+        event = SimulatedEvent(str(self._next_event_id), _parse_event_xml(body))
+        self._next_event_id += 1
+        self.events[event.id] = event
+        return event
+
+    def _delete_event(self, event: SimulatedEvent) -> None:
+        if event.status in ('pending',) + ACTIVE_STATUSES:
+            raise SimulatorError(422, f'Live Event {event.id} is not deletable!')
+        del self.events[event.id]
+        self._timed.discard(event)
+
+    def _event_action(self, event: SimulatedEvent, action: str, body: bytes, now: float) -> None:
+        if action == 'start':
+            if event.status in ACTIVE_STATUSES:
+                raise SimulatorError(422, f'Live Event {event.id} is already running')
+            busy = set(event.device_names) & self.devices_in_use()
+            if busy:
+                raise SimulatorError(422, f'Device already in use: {", ".join(sorted(busy))}')
+            event.transition('preprocessing', now + self.preprocessing_time, 'running')
+            self._timed.add(event)
+        elif action == 'stop':
+            if event.status not in ACTIVE_STATUSES:
+                raise SimulatorError(422, f'Live Event {event.id} is not running')
+            event.transition('postprocessing', now + self.postprocessing_time, 'complete')
+            self._timed.add(event)
+        elif action == 'cancel':
+            event.transition('cancelled')
+        elif action == 'reset':
+            event.transition('pending')
+            event.paused_outputs.clear()
+            event.stopped_outputs.clear()
+        elif action in ('pause_output', 'unpause_output', 'start_output', 'stop_output'):
+            output_id = ET.fromstring(body).text if body else None
+            if not output_id:
+                raise SimulatorError(422, 'output_id is required')
+            target = event.paused_outputs if action.endswith('pause_output') else event.stopped_outputs
+            if action in ('pause_output', 'stop_output'):
+                target.add(output_id)
+            else:
+                target.discard(output_id)
+        else:
+            raise SimulatorError(404, f'Unknown action {action}')
+
+    def _event_list(self, query: Dict[str, List[str]]) -> bytes:
+        events = list(self.events.values())
+        if query.get('filter') == ['active']:
+            events = [event for event in events if event.status in ACTIVE_STATUSES]
+        if 'per_page' in query:
+            per_page = int(query['per_page'][0])
+            start = (int(query.get('page', ['1'])[0]) - 1) * per_page
+            events = events[start:start + per_page]
+        return b'<?xml version="1.0" encoding="UTF-8"?>\n<live_event_list>' + \
+            b''.join(event.to_xml() for event in events) + b'</live_event_list>'
+
+    # Devices
+
+    def devices_in_use(self) -> Set[str]:
+        return {name for event in self.events.values() if event.status in ACTIVE_STATUSES
+                for name in event.device_names}
+
+    def _device_xml(self, device_id: str, device_name: str) -> str:
+        channel = device_name.rsplit(' ', 1)[-1]
+        return (f'<device href="/devices/{device_id}"><id>{device_id}</id><name/>'
+                f'<device_name>{device_name}</device_name><device_number>0</device_number>'
+                f'<device_type>AJA</device_type><description>AJA Capture Card</description>'
+                f'<channel>{channel}</channel><channel_type>HD-SDI</channel_type><quad>false</quad></device>')
+
+    def _device_list(self) -> bytes:
+        devices = ''.join(self._device_xml(device_id, name) for device_id, name in self.devices)
+        return f'<?xml version="1.0" encoding="UTF-8"?>\n<device_list>{devices}</device_list>'.encode('utf-8')
+
+    def _device(self, device_id: str) -> bytes:
+        for candidate_id, name in self.devices:
+            if candidate_id == device_id:
+                return f'<?xml version="1.0" encoding="UTF-8"?>\n{self._device_xml(device_id, name)}'.encode('utf-8')
+        raise SimulatorError(404, f'Device {device_id} not found')
+
+    def _generate_preview(self, body: bytes) -> bytes:
+        form = parse_qs(body.decode('utf-8'))
+        device_id = form.get('live_event[inputs_attributes][0][device_input_attributes][device_id]', [''])[0]
+        names = dict(self.devices)
+        if device_id not in names:
+            return json.dumps({'type': 'error', 'message': 'Input is invalid. Device not found.'}).encode('utf-8')
+        if names[device_id] in self.devices_in_use():
+            return json.dumps({'type': 'error', 'message': 'Input is invalid. Device already in use.'}).encode('utf-8')
+        preview_id = self._next_preview_id
+        self._next_preview_id += 1
+        return json.dumps({'preview_image_id': preview_id}).encode('utf-8')
+
+
+def _parse_event_xml(body: bytes) -> ET.Element:
+    try:
+        return ET.fromstring(body)
+    except ET.ParseError as e:
+        raise SimulatorError(422, f'Invalid live_event XML: {e}')
+
+
+class SimulatorRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server: ElementalSimulator
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _dispatch(self) -> None:
+        url = urlparse(self.path)
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        try:
+            status, content_type, payload = self.server.handle(self.command, url.path, parse_qs(url.query), body)
+        except SimulatorError as e:
+            status, content_type = e.status, 'application/xml'
+            payload = f'<?xml version="1.0" encoding="UTF-8"?>\n<errors><error>{e}</error></errors>'.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _dispatch
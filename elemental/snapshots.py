@@ -0,0 +1,166 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import (Callable, Iterable, List, Optional, Sequence, Tuple,
+                    TypedDict, Union)
+
+from .client import DeviceAvailabilityDict, EventStatusDict
+from .models import LiveEvent
+
+# One event as last fetched, with the wall-clock time it was fetched at
+StoredEventDict = TypedDict('StoredEventDict', {
+    'server_url': str,
+    'id': str,
+    'name': Optional[str],
+    'status': str,
+    'destinations': List[Optional[str]],
+    'device_names': List[Optional[str]],
+    'fetched_at': float
+})
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS events (
+    server_url TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    name TEXT,
+    status TEXT NOT NULL,
+    origin_url TEXT NOT NULL,
+    backup_url TEXT,
+    destinations TEXT NOT NULL,
+    device_names TEXT NOT NULL,
+    event_xml TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (server_url, event_id)
+);
+CREATE INDEX IF NOT EXISTS events_status ON events (status);
+CREATE TABLE IF NOT EXISTS event_destinations (
+    server_url TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    uri TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS event_destinations_uri ON event_destinations (uri);
+CREATE INDEX IF NOT EXISTS event_destinations_event ON event_destinations (server_url, event_id);
+CREATE TABLE IF NOT EXISTS device_lists (
+    server_url TEXT PRIMARY KEY,
+    devices TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+'''
+
+
+class SnapshotStore:
+    """Persistent record of what appliances last answered, kept in one SQLite database
+
+    Events are stored from their live_event XML (the document behind both describe_event
+    and get_event_xml) and device lists as returned by get_input_devices, each with the
+    wall-clock time it was fetched. Pass a store to ElementalLive to serve those reads from
+    it while it revalidates in the background; ``find_events`` answers fleet-wide questions
+    such as "running events sending to this destination" from indexes, without a request.
+
+    path is a file name, or ':memory:' for a store that lives as long as the object. One
+    instance may be shared by any number of threads and clients.
+    """
+
+    def __init__(self, path: str = ':memory:', clock: Callable[[], float] = time.time) -> None:
+        self.path = path
+        self.clock = clock
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            if path != ':memory:':
+                # Readers in other processes are not blocked by the writer
+                self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _write(self, statements: Iterable[Tuple[str, Sequence]]) -> None:
+        with self._lock:
+            self._connection.execute('BEGIN')
+            try:
+                for statement, parameters in statements:
+                    self._connection.execute(statement, parameters)
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+            self._connection.execute('COMMIT')
+
+    def _query(self, statement: str, parameters: Sequence = ()) -> List[tuple]:
+        with self._lock:
+            return self._connection.execute(statement, parameters).fetchall()
+
+    def record_event(self, server_url: str, event_id: str, event_xml: Union[bytes, str],
+                     fetched_at: Optional[float] = None) -> None:
+        """Store the live_event document of event_id as fetched at fetched_at (default now)"""
+        event = LiveEvent.from_xml(event_xml)
+        if isinstance(event_xml, bytes):
+            event_xml = event_xml.decode('utf-8')
+        fetched_at = self.clock() if fetched_at is None else fetched_at
+        destinations = list(event.destinations)
+        self._write([
+            ('DELETE FROM event_destinations WHERE server_url = ? AND event_id = ?', (server_url, event_id)),
+            ('INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+             (server_url, event_id, event.name, event.status, event.origin_url, event.backup_url,
+              json.dumps(destinations), json.dumps(list(event.device_names)), event_xml, fetched_at)),
+        ] + [('INSERT INTO event_destinations VALUES (?, ?, ?)', (server_url, event_id, uri))
+             for uri in dict.fromkeys(destinations) if uri is not None])
+
+    def forget_event(self, server_url: str, event_id: str) -> None:
+        self._write([
+            ('DELETE FROM event_destinations WHERE server_url = ? AND event_id = ?', (server_url, event_id)),
+            ('DELETE FROM events WHERE server_url = ? AND event_id = ?', (server_url, event_id)),
+        ])
+
+    def get_event_xml(self, server_url: str, event_id: str) -> Optional[Tuple[str, float]]:
+        """(event_xml, fetched_at) of event_id, or None when it was never recorded"""
+        rows = self._query('SELECT event_xml, fetched_at FROM events WHERE server_url = ? AND event_id = ?',
+                           (server_url, event_id))
+        return (rows[0][0], rows[0][1]) if rows else None
+
+    def describe_event(self, server_url: str, event_id: str) -> Optional[Tuple[EventStatusDict, float]]:
+        """(describe_event result, fetched_at) of event_id, or None when it was never recorded"""
+        rows = self._query('SELECT status, origin_url, backup_url, fetched_at FROM events '
+                           'WHERE server_url = ? AND event_id = ?', (server_url, event_id))
+        if not rows:
+            return None
+        status, origin_url, backup_url, fetched_at = rows[0]
+        return EventStatusDict(status=status, origin_url=origin_url, backup_url=backup_url), fetched_at
+
+    def find_events(self, server_url: Optional[str] = None, status: Optional[str] = None,
+                    destination: Optional[str] = None) -> List[StoredEventDict]:
+        """Recorded events matching every given filter, ordered by appliance and id"""
+        conditions, parameters = [], []
+        if server_url is not None:
+            conditions.append('e.server_url = ?')
+            parameters.append(server_url)
+        if status is not None:
+            conditions.append('e.status = ?')
+            parameters.append(status)
+        if destination is not None:
+            conditions.append('EXISTS (SELECT 1 FROM event_destinations d WHERE d.uri = ? '
+                              'AND d.server_url = e.server_url AND d.event_id = e.event_id)')
+            parameters.append(destination)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+        rows = self._query('SELECT server_url, event_id, name, status, destinations, device_names, fetched_at '
+                           f'FROM events e{where} ORDER BY server_url, CAST(event_id AS INTEGER), event_id',
+                           parameters)
+        return [StoredEventDict(server_url=row[0], id=row[1], name=row[2], status=row[3],
+                                destinations=json.loads(row[4]), device_names=json.loads(row[5]), fetched_at=row[6])
+                for row in rows]
+
+    def record_devices(self, server_url: str, devices: List[DeviceAvailabilityDict],
+                       fetched_at: Optional[float] = None) -> None:
+        fetched_at = self.clock() if fetched_at is None else fetched_at
+        self._write([('INSERT OR REPLACE INTO device_lists VALUES (?, ?, ?)',
+                      (server_url, json.dumps(devices), fetched_at))])
+
+    def forget_devices(self, server_url: str) -> None:
+        self._write([('DELETE FROM device_lists WHERE server_url = ?', (server_url,))])
+
+    def get_input_devices(self, server_url: str) -> Optional[Tuple[List[DeviceAvailabilityDict], float]]:
+        """(get_input_devices result, fetched_at) of server_url, or None when it was never recorded"""
+        rows = self._query('SELECT devices, fetched_at FROM device_lists WHERE server_url = ?', (server_url,))
+        return (json.loads(rows[0][0]), rows[0][1]) if rows else None
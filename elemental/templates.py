@@ -0,0 +1,93 @@
+"""Render many live_event documents from one parsed base event
+
+    template = EventTemplate(base_xml, {
+        'device_name': 'input/device_input/device_name',
+        'origin_url': 'output_group[1]/apple_live_group_settings/destination/uri',
+        'bitrate': 'stream_assembly/video_description/h264_settings/bitrate',
+    })
+    client.create_event(template.bind(device_name='HD-SDI 2', origin_url=url, bitrate=3000000))
+
+Parameters name ElementTree paths relative to live_event; every matching element
+gets the value as its text. The base document is parsed, checked and serialized
+once, so rendering only escapes the values and joins pre-built strings.
+"""
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+from xml.sax.saxutils import escape
+
+# Private use character delimiting parameter slots; base documents containing it are rejected
+_MARK = '\ue000'
+
+
+class EventTemplate:
+    def __init__(self, event_xml: Union[bytes, str], parameters: Mapping[str, str]) -> None:
+        root = ET.fromstring(event_xml)
+        if root.tag != 'live_event':
+            raise ValueError(f"Event template root must be live_event, got {root.tag}")
+
+        self.defaults: Dict[str, Optional[str]] = {}
+        claimed: Dict[ET.Element, str] = {}
+        for index, (name, path) in enumerate(parameters.items()):
+            elements = root.findall(path)
+            if not elements:
+                raise ValueError(f"Parameter {name} matches no element at {path}")
+            if len(elements[0]):
+                raise ValueError(f"Parameter {name} must target leaf elements, {path} has children")
+            self.defaults[name] = elements[0].text or None
+            for element in elements:
+                if element in claimed:
+                    raise ValueError(f"Parameters {claimed[element]} and {name} target the same element at {path}")
+                claimed[element] = name
+                element.text = f'{_MARK}{index}{_MARK}'
+        self.parameters = tuple(parameters)
+
+        parts = ET.tostring(root, encoding='unicode').split(_MARK)
+        if len(parts) != 2 * len(claimed) + 1:
+            raise ValueError("Event template must not contain U+E000, it delimits parameters")
+        # Odd parts are parameter indexes, even parts the literal XML between them
+        self._literals: List[str] = parts[0::2]
+        self._slots: Tuple[int, ...] = tuple(int(index) for index in parts[1::2])
+
+    def _values(self, values: Mapping[str, object]) -> Tuple[str, ...]:
+        unknown = set(values).difference(self.parameters)
+        if unknown:
+            raise TypeError(f"Unknown event template parameters: {', '.join(sorted(unknown))}")
+        rendered = []
+        for name in self.parameters:
+            value = values.get(name, self.defaults[name])
+            if value is None:
+                raise TypeError(f"Missing event template parameter: {name}")
+            rendered.append(escape(str(value)))
+        return tuple(rendered)
+
+    def _join(self, values: Tuple[str, ...]) -> str:
+        literals = self._literals
+        chunks = [literals[0]]
+        for slot, literal in zip(self._slots, literals[1:]):
+            chunks.append(values[slot])
+            chunks.append(literal)
+        return ''.join(chunks)
+
+    def render(self, **values: object) -> str:
+        """live_event XML with values substituted; parameters left out keep the base document's text"""
+        return self._join(self._values(values))
+
+    def bind(self, **values: object) -> 'BoundEventTemplate':
+        """Validate and escape values now, rendering only when the event is sent"""
+        return BoundEventTemplate(self, self._values(values))
+
+
+class BoundEventTemplate:
+    """Template with its parameter values, accepted wherever create_event and update_event take event_xml"""
+    __slots__ = ('template', '_values')
+
+    def __init__(self, template: EventTemplate, values: Tuple[str, ...]) -> None:
+        self.template = template
+        self._values = values
+
+    def render(self) -> str:
+        return self.template._join(self._values)
+
+
+def _event_body(event_xml: Union[str, BoundEventTemplate]) -> str:
+    return event_xml.render() if isinstance(event_xml, BoundEventTemplate) else event_xml
@@ -0,0 +1,149 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+from elemental.allocator import DeviceAllocator
+from elemental.client import DevicesUnavailable, ElementalLive
+
+
+def device(device_id, channel_type='HD-SDI', quad='false', availability=True):
+    return {'id': device_id, 'name': None, 'device_name': f'{channel_type} {device_id}', 'device_number': '0',
+            'device_type': 'AJA', 'description': 'AJA Capture Card', 'channel': device_id,
+            'channel_type': channel_type, 'quad': quad, 'availability': availability}
+
+
+def allocator_for(*devices, **kwargs):
+    client = mock.Mock(spec=ElementalLive)
+    client.server_url = 'http://elemental'
+    client.get_input_devices.return_value = list(devices)
+    return DeviceAllocator(client, **kwargs)
+
+
+def test_reserve_should_only_hand_out_free_matching_devices():
+    allocator = allocator_for(device('1'), device('2', availability=False), device('3', channel_type='SDI', quad='true'),
+                              device('4'))
+
+    assert allocator.free_count() == 3
+    assert allocator.free_count(channel_type='SDI', quad=True) == 1
+    reservations = allocator.reserve(2, device_type='AJA', channel_type='HD-SDI')
+
+    assert [reservation.device['id'] for reservation in reservations] == ['1', '4']
+    assert allocator.free_count(channel_type='HD-SDI') == 0
+    with pytest.raises(DevicesUnavailable):
+        allocator.reserve(channel_type='HD-SDI')
+    allocator.client.get_input_devices.assert_called_once_with(timeout=None)
+
+
+def test_reserve_should_be_all_or_nothing():
+    allocator = allocator_for(device('1'))
+
+    with pytest.raises(DevicesUnavailable):
+        allocator.reserve(2)
+
+    assert allocator.free_count() == 1
+
+
+def test_concurrent_workers_should_never_share_a_device():
+    allocator = allocator_for(*(device(str(i)) for i in range(50)))
+    barrier = threading.Barrier(8)
+
+    def grab(_):
+        barrier.wait()
+        taken = []
+        while True:
+            try:
+                taken.extend(reservation.device['id'] for reservation in allocator.reserve())
+            except DevicesUnavailable:
+                return taken
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        taken = [device_id for ids in executor.map(grab, range(8)) for device_id in ids]
+
+    assert sorted(taken, key=int) == [str(i) for i in range(50)]
+
+
+def test_reservations_should_expire_be_released_or_committed(clock):
+    allocator = allocator_for(device('1'), device('2'), device('3'), reservation_ttl=10, clock=clock)
+    expiring, released, committed = (allocator.reserve()[0] for _ in range(3))
+
+    allocator.release([released])
+    allocator.commit([committed])
+    assert allocator.free_count() == 1
+    clock.now = 10
+
+    assert allocator.free_count() == 2
+    assert committed.device['id'] not in {r.device['id'] for r in allocator.reserve(2)}
+
+
+def test_reserved_block_should_release_devices_when_it_raises():
+    allocator = allocator_for(device('1'))
+
+    with pytest.raises(RuntimeError):
+        with allocator.reserved():
+            raise RuntimeError('create_event failed')
+    assert allocator.free_count() == 1
+
+    with allocator.reserved() as [reservation]:
+        assert reservation.device['id'] == '1'
+    assert allocator.free_count() == 0
+
+
+def test_inventory_should_reload_once_stale(clock):
+    allocator = allocator_for(device('1'), inventory_ttl=30, clock=clock)
+    allocator.reserve()
+    allocator.client.get_input_devices.return_value = [device('1', availability=False), device('2')]
+
+    assert allocator.free_count() == 0
+    clock.now = 30
+
+    assert allocator.free_count() == 1
+    assert allocator.client.get_input_devices.call_count == 2
+
+
+def test_committed_devices_should_stay_taken_until_reported_in_use(clock):
+    allocator = allocator_for(device('1'), commit_ttl=300, clock=clock)
+    with allocator.reserved():
+        pass
+
+    # Created but not started: the appliance still reports the device as free
+    allocator.refresh()
+    assert allocator.free_count() == 0
+
+    allocator.client.get_input_devices.return_value = [device('1', availability=False)]
+    allocator.refresh()
+    allocator.client.get_input_devices.return_value = [device('1')]
+    allocator.refresh()
+    assert allocator.free_count() == 1
+
+
+def test_commitments_should_lapse_after_commit_ttl(clock):
+    allocator = allocator_for(device('1'), commit_ttl=300, clock=clock)
+    with allocator.reserved():
+        pass
+    clock.now = 300
+
+    allocator.refresh()
+
+    assert allocator.free_count() == 1
+
+
+def test_commit_should_refuse_reservations_that_lapsed(clock):
+    allocator = allocator_for(device('1'), reservation_ttl=10, clock=clock)
+    first = allocator.reserve()
+    clock.now = 10
+    second = allocator.reserve()
+
+    with pytest.raises(DevicesUnavailable, match='devices 1 .* lapsed'):
+        allocator.commit(first)
+    allocator.commit(second)
+
+
+def test_reserved_block_should_report_a_lapsed_reservation(clock):
+    allocator = allocator_for(device('1'), reservation_ttl=10, clock=clock)
+
+    with pytest.raises(DevicesUnavailable):
+        with allocator.reserved():
+            clock.now = 10
+    assert allocator.free_count() == 1
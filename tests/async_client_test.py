@@ -0,0 +1,166 @@
+import asyncio
+import os
+from unittest import mock
+
+import pytest
+
+from elemental.client import (ConnectionTimeout, ElementalException, InvalidRequest, InvalidResponse,
+                              NotFound)
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+from elemental.async_client import AsyncElementalLive, AsyncResponse  # noqa: E402
+
+USER = "FAKE"
+API_KEY = "FAKE"
+ELEMENTAL_ADDRESS = "FAKE_ADDRESS.com"
+HEADERS = {'Accept': 'application/xml', 'Content-Type': 'application/xml'}
+
+
+def file_fixture(file_name):
+    with open(os.path.join("tests/fixtures", file_name)) as f:
+        return f.read()
+
+
+def async_response(status=200, text=''):
+    return AsyncResponse(status_code=status, content=text.encode('utf-8'), text=text)
+
+
+def mocked_client(*responses):
+    client = AsyncElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
+    client.generate_headers = mock.Mock(return_value=dict(HEADERS))
+    client.send_request = mock.AsyncMock(side_effect=list(responses))
+    return client
+
+
+async def serve(handler, coro_factory, **client_kwargs):
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', handler)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        async with AsyncElementalLive(str(server.make_url('')).rstrip('/'), USER, API_KEY, **client_kwargs) as client:
+            return await coro_factory(client)
+    finally:
+        await server.close()
+
+
+def test_send_request_should_return_response_and_sign_request():
+    seen = {}
+
+    async def handler(request):
+        seen['method'] = request.method
+        seen['path'] = request.path
+        seen['user'] = request.headers.get('X-Auth-User')
+        seen['body'] = await request.text()
+        return web.Response(status=201, text=file_fixture('success_response_for_create.xml'))
+
+    result = asyncio.run(serve(handler, lambda client: client.create_event('<live_event/>')))
+
+    assert result == {'id': '53'}
+    assert seen == {'method': 'POST', 'path': '/live_events', 'user': USER, 'body': '<live_event/>'}
+
+
+def test_send_request_should_raise_NotFound_on_404():
+    async def handler(request):
+        return web.Response(status=404, text='missing')
+
+    with pytest.raises(NotFound) as exc_info:
+        asyncio.run(serve(handler, lambda client: client.describe_event('1')))
+
+    assert str(exc_info.value).endswith("Response: 404\nmissing")
+
+
+def test_send_request_should_raise_InvalidResponse_on_invalid_status_code():
+    async def handler(request):
+        return web.Response(status=500, text='boom')
+
+    with pytest.raises(InvalidResponse):
+        asyncio.run(serve(handler, lambda client: client.start_event('1')))
+
+
+def test_send_request_should_raise_InvalidRequest_on_read_timeout():
+    async def handler(request):
+        await asyncio.sleep(2)
+        return web.Response(text='late')
+
+    with pytest.raises(InvalidRequest) as exc_info:
+        asyncio.run(serve(handler, lambda client: client.get_event_status('1'), timeout=0.1))
+
+    assert not isinstance(exc_info.value, ConnectionTimeout)
+
+
+def test_send_request_should_raise_ConnectionTimeout_when_connecting_times_out():
+    session = mock.Mock()
+    session.request = mock.Mock(side_effect=aiohttp.ConnectionTimeoutError('Connection timeout to host'))
+    client = AsyncElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY, session=session)
+
+    with pytest.raises(ConnectionTimeout):
+        asyncio.run(client.get_event_status('1'))
+
+
+def test_close_should_leave_a_session_passed_in_open():
+    async def run():
+        async with aiohttp.ClientSession() as session:
+            async with AsyncElementalLive(ELEMENTAL_ADDRESS, session=session) as client:
+                assert client.session is session
+            return session.closed
+
+    assert asyncio.run(run()) is False
+
+
+def test_start_event_should_call_send_request_as_expected():
+    client = mocked_client(async_response())
+
+    asyncio.run(client.start_event('999'))
+
+    client.send_request.assert_awaited_once_with(
+        http_method='POST', url=f'{ELEMENTAL_ADDRESS}/live_events/999/start',
+        headers=HEADERS, body="<start></start>", timeout=None)
+
+
+def test_event_pause_output_should_call_send_request_as_expected():
+    client = mocked_client(async_response())
+
+    asyncio.run(client.event_pause_output(event_id='53', output_id='13'))
+
+    client.send_request.assert_awaited_once_with(
+        http_method='POST', url=f'{ELEMENTAL_ADDRESS}/live_events/53/pause_output',
+        headers=HEADERS, body='<output_id>13</output_id>', timeout=None)
+
+
+def test_describe_event_will_return_event_info_as_expected():
+    client = mocked_client(async_response(text=file_fixture('sample_event.xml')))
+
+    event_info = asyncio.run(client.describe_event('139'))
+
+    assert event_info == {'origin_url': 'https://vmjhch43nfkghi.data.mediastore.us-east-1.'
+                                        'amazonaws.com/mortyg3b4/master/mortyg3b4.m3u8',
+                          'backup_url': 'https://vmjhch43nfkghi.data.mediastore.us-east-1.'
+                                        'amazonaws.com/mortyg3b4/backup/mortyg3b4.m3u8',
+                          'status': 'complete'}
+
+
+def test_describe_event_should_raise_InvalidResponse_on_a_body_that_is_not_xml():
+    client = mocked_client(async_response(text='<html><body>Bad gateway</body>'))
+
+    with pytest.raises(InvalidResponse, match='unreadable response'):
+        asyncio.run(client.describe_event('139'))
+
+
+def test_get_input_devices_will_get_right_devices_info():
+    client = mocked_client(async_response(text=file_fixture('sample_device_list.xml')),
+                           async_response(text=file_fixture('sample_event_list.xml')))
+
+    devices = asyncio.run(client.get_input_devices())
+
+    assert [(d['id'], d['availability']) for d in devices] == [('1', False), ('2', True)]
+
+
+def test_generate_preview_will_raise_ElementalException_if_preview_unavailable():
+    client = mocked_client(async_response(text='{"type": "error", "message": "Device already in use."}'))
+
+    with pytest.raises(ElementalException):
+        asyncio.run(client.generate_preview('1'))
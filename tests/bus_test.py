@@ -0,0 +1,76 @@
+import asyncio
+import threading
+from unittest import mock
+
+from elemental.bus import CREATED, DELETED, DESTINATIONS_CHANGED, STATUS_CHANGED, EventBus
+from elemental.client import InvalidResponse
+
+
+def test_poll_should_set_a_baseline_then_publish_typed_changes(listing_client, summary):
+    client = listing_client('http://a',
+                            [summary('1', 'pending'), summary('2', 'running')],
+                            [summary('1', 'running', ['http://origin/b.m3u8']), summary('3', 'pending')])
+    bus = EventBus([client])
+    seen = []
+    bus.subscribe(seen.append)
+
+    assert bus.poll('http://a') == []
+    assert set(bus.snapshot('http://a')) == {'1', '2'}
+    bus.poll('http://a')
+
+    assert [(change.kind, change.event_id) for change in seen] == [
+        (STATUS_CHANGED, '1'), (DESTINATIONS_CHANGED, '1'), (CREATED, '3'), (DELETED, '2')]
+    assert seen[0].previous['status'] == 'pending' and seen[0].current['status'] == 'running'
+
+
+def test_subscribers_should_share_one_listing_and_filter_their_changes(listing_client, summary):
+    client = listing_client('http://a', [summary('1', 'pending')], [summary('1', 'running')])
+    bus = EventBus([client])
+    deleted, statuses, failing = mock.Mock(), mock.Mock(), mock.Mock(side_effect=RuntimeError('boom'))
+    bus.subscribe(deleted, kinds=[DELETED])
+    bus.subscribe(failing)
+    unsubscribe = bus.subscribe(statuses, kinds=[STATUS_CHANGED], server_urls=['http://a'])
+
+    bus.poll('http://a')
+    bus.poll('http://a')
+    unsubscribe()
+
+    deleted.assert_not_called()
+    assert statuses.call_args.args[0].kind == STATUS_CHANGED
+    assert client.iter_events.call_count == 2
+
+
+def test_stream_should_deliver_changes_from_the_polling_thread(listing_client, summary):
+    client = listing_client('http://a', [], InvalidResponse('boom'), [summary('1', 'pending')],
+                            *([[summary('1', 'pending')]] * 100))
+    bus = EventBus([client], interval=0.01)
+
+    async def first_change():
+        stream = bus.stream(kinds=[CREATED])
+        waiting = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        bus.start()
+        try:
+            return await asyncio.wait_for(waiting, 2)
+        finally:
+            bus.stop(timeout=2)
+            await stream.aclose()
+
+    change = asyncio.run(first_change())
+
+    assert (change.kind, change.server_url, change.event_id) == (CREATED, 'http://a', '1')
+
+
+def test_polling_thread_should_survive_errors_from_outside_the_client(listing_client, summary):
+    client = listing_client('http://a', [], ConnectionResetError('reset'), [summary('1', 'pending')],
+                            *([[summary('1', 'pending')]] * 100))
+    bus = EventBus([client], interval=0.01)
+    created = threading.Event()
+    bus.subscribe(lambda change: created.set(), kinds=[CREATED])
+
+    bus.start()
+    try:
+        assert created.wait(2)
+        assert all(thread.is_alive() for thread in bus._threads)
+    finally:
+        bus.stop(timeout=2)
@@ -0,0 +1,77 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from elemental.cache import MISSING, SingleFlight, TTLCache
+
+
+def test_get_should_return_value_until_ttl_expires(clock):
+    cache = TTLCache(ttl=5, clock=clock)
+    cache.set('key', 'value')
+
+    clock.now = 4.9
+    assert cache.get('key') == 'value'
+    clock.now = 5
+    assert cache.get('key') is MISSING
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_set_should_evict_least_recently_used_entry():
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('b') is MISSING
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_invalidate_should_drop_one_or_every_entry():
+    cache = TTLCache(ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+
+    cache.invalidate('a')
+    assert cache.get('a') is MISSING
+    assert len(cache) == 1
+
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_single_flight_should_share_a_running_call_and_its_exception():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise ValueError('boom')
+
+    with ThreadPoolExecutor(2) as executor:
+        leader = executor.submit(flight.run, 'a', fail)
+        started.wait(5)
+        follower = executor.submit(flight.run, 'a', lambda: 'not called')
+        while flight.shared < 1:
+            threading.Event().wait(0.01)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+
+    assert (flight.calls, flight.shared) == (1, 1)
+    assert flight.run('a', lambda: 'again') == 'again'
+
+
+def test_single_flight_should_reuse_results_within_ttl(clock):
+    flight = SingleFlight(ttl=1, clock=clock)
+    assert flight.run('a', lambda: 1) == 1
+    assert flight.run('a', lambda: 2) == 1
+    clock.now = 1
+    assert flight.run('a', lambda: 3) == 3
+    flight.invalidate()
+    assert flight.run('a', lambda: 4) == 4
+    assert (flight.calls, flight.shared) == (3, 1)
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from elemental.cli import main
+from elemental.client import ElementalLive, InvalidResponse
+from elemental.simulator import ElementalSimulator
+
+EVENT_XML = '''<live_event>
+  <name>{name}</name>
+  <input><device_input><device_name>HD-SDI {device}</device_name></device_input></input>
+  <output_group><output><destination><uri>http://origin/{name}.m3u8</uri></destination></output></output_group>
+</live_event>'''
+
+
+@pytest.fixture
+def appliances():
+    with ElementalSimulator(devices=2, preprocessing_time=0) as first, \
+            ElementalSimulator(devices=2, preprocessing_time=0) as second:
+        for index, simulator in enumerate((first, second)):
+            ElementalLive(simulator.url).create_event(EVENT_XML.format(name=f'event-{index}', device=1))
+        yield first, second
+
+
+def records(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_status_all_should_list_every_event_of_every_appliance(appliances, capsys, monkeypatch):
+    first, second = appliances
+    monkeypatch.setenv('ELEMENTAL_SERVERS', f'{first.url},{second.url}')
+
+    assert main(['--all', 'status']) == 0
+
+    assert sorted(records(capsys), key=lambda record: record['server_url']) == sorted([
+        {'server_url': first.url, 'event_id': '1', 'name': 'event-0', 'status': 'pending'},
+        {'server_url': second.url, 'event_id': '1', 'name': 'event-1', 'status': 'pending'},
+    ], key=lambda record: record['server_url'])
+
+
+def test_appliance_options_should_also_follow_the_command(appliances, capsys, monkeypatch):
+    first, second = appliances
+    monkeypatch.setenv('ELEMENTAL_SERVERS', first.url)
+
+    assert main(['status', '--all', '-s', second.url]) == 0
+
+    assert sorted(record['server_url'] for record in records(capsys)) == sorted([first.url, second.url])
+
+
+def test_records_should_be_printed_as_they_are_produced(appliances, capsys, monkeypatch):
+    first, _ = appliances
+
+    def iter_events(self, timeout=None):
+        yield {'id': '1', 'name': 'event-0', 'status': 'pending'}
+        raise InvalidResponse('connection dropped')
+    monkeypatch.setattr(ElementalLive, 'iter_events', iter_events)
+
+    assert main(['status', '-s', first.url]) == 1
+
+    assert records(capsys) == [
+        {'server_url': first.url, 'event_id': '1', 'name': 'event-0', 'status': 'pending'},
+        {'server_url': first.url, 'event_id': None, 'error': 'connection dropped', 'error_type': 'InvalidResponse'},
+    ]
+
+
+def test_start_should_report_each_event_and_fail_on_errors(appliances, capsys):
+    first, _ = appliances
+
+    assert main(['-s', first.url, 'start', '1', '2']) == 1
+
+    by_event = {record['event_id']: record for record in records(capsys)}
+    assert by_event['1'] == {'server_url': first.url, 'event_id': '1', 'action': 'start', 'ok': True}
+    assert by_event['2']['error_type'] == 'NotFound'
+    assert ElementalLive(first.url).get_event_status('1') == 'running'
+
+
+def test_output_pause_should_pause_the_output(appliances, capsys):
+    first, _ = appliances
+
+    assert main(['-s', first.url, 'output', 'pause', '1', '3']) == 0
+
+    assert records(capsys) == [{'server_url': first.url, 'event_id': '1', 'output_id': '3', 'action': 'pause',
+                                'ok': True}]
+    assert first.events['1'].paused_outputs == {'3'}
+
+
+def test_devices_should_print_one_line_per_device(appliances, capsys):
+    first, _ = appliances
+
+    assert main(['-s', first.url, 'devices']) == 0
+
+    assert [(record['server_url'], record['id']) for record in records(capsys)] == [
+        (first.url, '1'), (first.url, '2')]
+
+
+def test_no_appliance_should_be_a_usage_error(monkeypatch):
+    monkeypatch.delenv('ELEMENTAL_SERVERS', raising=False)
+    with pytest.raises(SystemExit) as exc_info:
+        main(['--all', 'status'])
+    assert exc_info.value.code == 2
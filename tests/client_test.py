@@ -1,12 +1,18 @@
+import hashlib
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 from unittest import mock
 import pytest
 import requests
 
-from elemental.client import (ElementalException, ElementalLive, InvalidRequest,
-                              InvalidResponse, NotFound)
+from elemental.client import (CircuitOpen, ConnectionTimeout, DeadlineExceeded, ElementalException,
+                              ElementalLive, InvalidRequest, InvalidResponse, NotFound, UnexpectedStatus)
+from elemental.resilience import CircuitBreaker, RetryPolicy
 
 USER = "FAKE"
 API_KEY = "FAKE"
@@ -32,7 +38,7 @@ def mock_response(status=200, content=None, text=None,
 
     # set status code and content
     mock_resp.status_code = status
-    mock_resp.content = content
+    mock_resp.content = text.encode('utf-8') if content is None and text is not None else content
     mock_resp.text = text
 
     # add json data if provided
@@ -202,6 +208,44 @@ def test_update_event_with_restart():
     assert send_mock_call['headers'] == {'Accept': 'application/xml', 'Content-Type': 'application/xml'}
 
 
+def test_update_event_if_changed_should_skip_put_for_equivalent_xml():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
+    client.get_event_xml = mock.Mock(return_value='<live_event href="/live_events/1"><id>1</id><name>a</name></live_event>')
+    client.update_event = mock.Mock()
+
+    assert client.update_event_if_changed('1', '<live_event>\n  <name>a</name>\n</live_event>') is False
+    assert client.update_event_if_changed('1', '<live_event><name>b</name></live_event>', restart=True) is True
+
+    client.update_event.assert_called_once_with('1', '<live_event><name>b</name></live_event>', restart=True,
+                                                timeout=None)
+
+
+def test_update_event_if_changed_should_ignore_settings_left_out_of_the_xml():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
+    client.get_event_xml = mock.Mock(return_value=file_fixture('sample_event.xml'))
+    client.update_event = mock.Mock()
+
+    assert client.update_event_if_changed('139', '<live_event><name>morty demo channel</name></live_event>',
+                                          restart=True) is False
+    assert client.update_event_if_changed('139', '<live_event><name>rick demo channel</name></live_event>') is True
+    assert client.update_event.call_count == 1
+
+
+def test_update_event_if_changed_should_remember_what_was_sent():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY, fingerprint_ttl=60)
+    client.get_event_xml = mock.Mock(return_value='<live_event><name>a</name></live_event>')
+    client.send_request = mock.Mock()
+
+    for _ in range(3):
+        client.update_event_if_changed('1', '<live_event><name>b</name></live_event>')
+
+    client.get_event_xml.assert_called_once_with('1', timeout=None)
+    assert client.send_request.call_count == 1
+    client.update_event('1', '<live_event><name>c</name></live_event>')
+    client.update_event_if_changed('1', '<live_event><name>b</name></live_event>')
+    assert client.get_event_xml.call_count == 2
+
+
 def test_delete_event_should_call_send_request_as_expect():
     client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
 
@@ -425,6 +469,17 @@ def test_get_input_device_by_id_will_get_right_devices_info():
                    "quad": "false", 'availability': True}
 
 
+def test_get_input_devices_should_handle_a_single_device_list_fed_in_chunks():
+    from elemental.client import _iter_devices
+    document = file_fixture('sample_device_list.xml').encode('utf-8')
+    single = document[:document.index(b'<device href="/devices/2">')] + b'</device_list>'
+
+    devices = list(_iter_devices(single[i:i + 7] for i in range(0, len(single), 7)))
+
+    assert devices == [{'id': '1', 'name': None, 'device_name': 'HD-SDI 1', 'device_number': '0', 'device_type': 'AJA',
+                        'description': 'AJA Capture Card', 'channel': '1', 'channel_type': 'HD-SDI', 'quad': 'false'}]
+
+
 def test_get_preview_will_parse_response_json_as_expect():
     client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
 
@@ -443,6 +498,30 @@ def test_get_preview_will_parse_response_json_as_expect():
                        f'images/thumbs/p_1563568669_job_0.jpg'}
 
 
+def test_generate_previews_should_report_failures_per_input():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
+
+    def generate_preview(input_id, timeout):
+        if input_id == '2':
+            raise ElementalException('Device already in use')
+        return {'preview_url': f'p_{input_id}'}
+
+    client.generate_preview = mock.Mock(side_effect=generate_preview)
+
+    previews = client.generate_previews(['1', '2', '3'])
+
+    assert previews['results'] == {'1': {'preview_url': 'p_1'}, '3': {'preview_url': 'p_3'}}
+    assert list(previews['errors']) == ['2']
+
+
+def test_get_preview_will_raise_InvalidResponse_for_a_body_that_is_not_json():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
+    client.send_request = mock.Mock(return_value=mock_response(status=200, text='<html>Bad gateway</html>'))
+
+    with pytest.raises(InvalidResponse, match='Bad gateway'):
+        client.generate_preview('1')
+
+
 def test_get_preview_will_raise_ElementalException_if_preview_unavailable():
     client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
 
@@ -557,6 +636,19 @@ def test_get_event_status():
         headers={'Accept': 'application/xml', 'Content-Type': 'application/xml'}, timeout=None)
 
 
+def test_get_event_should_return_live_event_parsed_from_response_bytes():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
+    client.generate_headers = mock.Mock(return_value=HEADERS)
+    client.send_request = mock.Mock(return_value=mock_response(
+        status=200, content=file_fixture('sample_event.xml').encode('utf-8')))
+
+    event = client.get_event('139')
+
+    assert (event.id, event.status, event.device_names) == ('139', 'complete', ('HD-SDI 2',))
+    client.send_request.assert_called_once_with(
+        http_method='GET', url=f'{ELEMENTAL_ADDRESS}/live_events/139', headers=HEADERS, timeout=None)
+
+
 def test_get_event_xml():
     client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
     client.generate_headers = mock.Mock()
@@ -626,6 +718,36 @@ def test_event_can_delete(status, expected_result):
     assert client.event_can_delete('123') is False
 
 
+def test_control_outputs_should_run_commands_concurrently_and_report_each_outcome():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
+    client.generate_headers = mock.Mock(return_value=HEADERS)
+    barrier = threading.Barrier(3, timeout=2)
+
+    def send_request(http_method, url, headers, body, timeout):
+        barrier.wait()
+        if '/live_events/2/' in url:
+            raise InvalidResponse('Response: 404')
+        return mock_response(status=200)
+
+    client.send_request = mock.Mock(side_effect=send_request)
+
+    outcomes = client.control_outputs([('1', '5', 'pause'), ('2', '5', 'pause'), ('3', '7', 'stop')], timeout=2)
+
+    assert [(o['event_id'], o['action'], o['error']) for o in outcomes[::2]] == [('1', 'pause', None), ('3', 'stop', None)]
+    assert isinstance(outcomes[1]['error'], InvalidResponse)
+    client.send_request.assert_any_call(http_method='POST', url=f'{ELEMENTAL_ADDRESS}/live_events/3/stop_output',
+                                        headers=HEADERS, body='<output_id>7</output_id>', timeout=2)
+
+
+def test_control_outputs_should_reject_unknown_actions_before_sending():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
+    client.send_request = mock.Mock()
+
+    with pytest.raises(ValueError):
+        client.control_outputs([('1', '5', 'pause'), ('1', '5', 'mute')])
+    client.send_request.assert_not_called()
+
+
 def test_event_pause_output():
     client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
     client.generate_headers = mock.Mock()
@@ -724,3 +846,416 @@ def test_event_stop_output():
     assert send_mock_call['http_method'] == 'POST'
     assert send_mock_call['url'] == f'{ELEMENTAL_ADDRESS}/live_events/53/stop_output'
     assert send_mock_call['headers'] == {'Accept': 'application/xml', 'Content-Type': 'application/xml'}
+
+
+def test_start_events_should_map_each_event_to_its_outcome():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
+
+    def start_event(event_id, timeout=None):
+        if event_id == '2':
+            raise InvalidResponse('already running')
+
+    client.start_event = mock.Mock(side_effect=start_event)
+
+    outcomes = client.start_events(['1', '2', '3'], max_workers=2)
+
+    assert list(outcomes) == ['1', '2', '3']
+    assert outcomes['1'] is None and outcomes['3'] is None
+    assert isinstance(outcomes['2'], InvalidResponse)
+    assert client.start_event.call_count == 3
+
+
+def test_stop_events_should_report_deadline_exceeded_for_unfinished_events():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
+    release = threading.Event()
+
+    def stop_event(event_id, timeout=None):
+        if event_id == 'slow':
+            release.wait(5)
+
+    client.stop_event = mock.Mock(side_effect=stop_event)
+
+    try:
+        outcomes = client.stop_events(['fast', 'slow'], deadline=0.2)
+    finally:
+        release.set()
+
+    assert outcomes['fast'] is None
+    assert isinstance(outcomes['slow'], DeadlineExceeded)
+
+
+@pytest.mark.parametrize('batch_method,method', [
+    ('cancel_events', 'cancel_event'),
+    ('reset_events', 'reset_event'),
+    ('delete_events', 'delete_event'),
+])
+def test_batch_methods_should_forward_timeout(batch_method, method):
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
+    setattr(client, method, mock.Mock())
+
+    outcomes = getattr(client, batch_method)(['1'], timeout=TIMEOUT)
+
+    assert outcomes == {'1': None}
+    getattr(client, method).assert_called_once_with('1', timeout=TIMEOUT)
+
+
+def test_generate_headers_should_reuse_signature_for_same_url():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
+    url = f'{ELEMENTAL_ADDRESS}/live_events/1'
+
+    with mock.patch('elemental.client.hashlib.md5', wraps=hashlib.md5) as md5:
+        first = client.generate_headers(url)
+        second = client.generate_headers(url)
+
+    assert first == second
+    assert md5.call_count == 2
+
+
+def test_generate_headers_should_sign_again_near_expiry():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY, header_refresh_margin=30)
+    url = f'{ELEMENTAL_ADDRESS}/live_events/1'
+
+    with mock.patch('elemental.client.time.time', return_value=1000):
+        first = client.generate_headers(url)
+    with mock.patch('elemental.client.time.time', return_value=1000 + 120 - 30):
+        second = client.generate_headers(url)
+
+    assert first['X-Auth-Expires'] == '1120'
+    assert second['X-Auth-Expires'] == '1210'
+    assert first['X-Auth-Key'] != second['X-Auth-Key']
+
+
+def test_generate_headers_should_not_let_callers_poison_the_cache():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
+    url = f'{ELEMENTAL_ADDRESS}/inputs/generate_preview'
+
+    client.generate_headers(url)['Accept'] = '*/*'
+
+    assert client.generate_headers(url)['Accept'] == 'application/xml'
+
+
+def test_find_devices_in_use_should_serve_cached_devices_within_ttl():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY, devices_in_use_ttl=60)
+    client.send_request = mock.Mock(
+        return_value=mock_response(status=200, text=file_fixture('sample_event_list.xml')))
+
+    assert client.find_devices_in_use() == {'HD-SDI 1'}
+    assert client.find_devices_in_use() == {'HD-SDI 1'}
+
+    assert client.send_request.call_count == 1
+    assert (client.devices_in_use_cache.hits, client.devices_in_use_cache.misses) == (1, 1)
+
+
+@pytest.mark.parametrize('method,args', [
+    ('create_event', ('<new-event />',)),
+    ('start_event', ('1',)),
+    ('stop_event', ('1',)),
+    ('cancel_event', ('1',)),
+    ('delete_event', ('1',)),
+])
+def test_event_changes_should_invalidate_devices_in_use_cache(method, args):
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY, devices_in_use_ttl=60)
+    client.send_request = mock.Mock(side_effect=[
+        mock_response(status=200, text=file_fixture('sample_event_list.xml')),
+        mock_response(status=201, content=file_fixture('success_response_for_create.xml')),
+        mock_response(status=200, text=file_fixture('sample_event_list.xml')),
+    ])
+
+    client.find_devices_in_use()
+    getattr(client, method)(*args)
+    client.find_devices_in_use()
+
+    assert client.send_request.call_count == 3
+
+
+def test_coalesce_reads_should_share_one_request_between_concurrent_callers():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY, coalesce_reads=True)
+    release = threading.Event()
+
+    def send_request(**kwargs):
+        release.wait(5)
+        return mock_response(status=200, text=file_fixture('sample_event.xml'))
+    client.send_request = mock.Mock(side_effect=send_request)
+
+    with ThreadPoolExecutor(8) as executor:
+        futures = [executor.submit(client.describe_event, '139') for _ in range(8)]
+        while client.read_coalescer.shared < 7 and not all(future.done() for future in futures):
+            threading.Event().wait(0.01)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert client.send_request.call_count == 1
+    assert all(result == results[0] for result in results)
+    assert results[0]['status'] == 'complete'
+    assert (client.read_coalescer.calls, client.read_coalescer.shared) == (1, 7)
+
+
+def test_coalesce_ttl_should_reuse_answers_until_the_client_changes_the_event():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY, coalesce_reads=True, coalesce_ttl=60)
+    client.send_request = mock.Mock(return_value=mock_response(status=200, text=file_fixture('sample_event.xml')))
+
+    client.describe_event('139')
+    client.describe_event('139')
+    assert client.get_event_xml('139') == file_fixture('sample_event.xml')
+    assert client.get_event('139').status == 'complete'
+    assert client.send_request.call_count == 1
+
+    client.start_event('139')
+    client.describe_event('139')
+    assert client.send_request.call_count == 3
+
+
+def event_list_xml(*events):
+    items = ''.join(f'<live_event href="/live_events/{event_id}"><name>event {event_id}</name>'
+                    f'<input><device_input><device_name>HD-SDI {event_id}</device_name></device_input></input>'
+                    f'<status>{status}</status></live_event>' for event_id, status in events)
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<live_event_list>{items}</live_event_list>'.encode('utf-8')
+
+
+def streamed_response(content, chunk_size=16):
+    response = mock_response(status=200)
+    response.iter_content = mock.Mock(
+        return_value=iter([content[i:i + chunk_size] for i in range(0, len(content), chunk_size)]))
+    return response
+
+
+def test_iter_events_should_walk_pages_until_a_short_page():
+    client = ElementalLive(ELEMENTAL_ADDRESS)
+    client.send_request = mock.Mock(side_effect=[
+        streamed_response(event_list_xml(('1', 'running'), ('2', 'pending'))),
+        streamed_response(event_list_xml(('3', 'complete'))),
+    ])
+
+    events = list(client.iter_events(filter='active', page_size=2))
+
+    assert [event['id'] for event in events] == ['1', '2', '3']
+    assert events[0] == {'id': '1', 'name': 'event 1', 'status': 'running',
+                         'destinations': [], 'device_names': ['HD-SDI 1']}
+    urls = [call[1]['url'] for call in client.send_request.call_args_list]
+    assert urls == [f'{ELEMENTAL_ADDRESS}/live_events?page=1&per_page=2&filter=active',
+                    f'{ELEMENTAL_ADDRESS}/live_events?page=2&per_page=2&filter=active']
+    assert client.send_request.call_args_list[0][1]['stream'] is True
+
+
+def test_iter_events_should_yield_before_the_page_is_fully_read():
+    client = ElementalLive(ELEMENTAL_ADDRESS)
+    content = event_list_xml(('1', 'running'), ('2', 'pending'))
+    head, tail = content[:content.index(b'</live_event>') + 20], content[content.index(b'</live_event>') + 20:]
+
+    def chunks():
+        yield head
+        raise AssertionError('second chunk read before first event was consumed')
+        yield tail
+
+    response = mock_response(status=200)
+    response.iter_content = mock.Mock(return_value=chunks())
+    client.send_request = mock.Mock(return_value=response)
+
+    assert next(client.iter_events())['id'] == '1'
+
+
+def test_iter_events_should_raise_InvalidRequest_when_the_connection_drops_mid_page():
+    client = ElementalLive(ELEMENTAL_ADDRESS)
+    content = event_list_xml(('1', 'running'), ('2', 'pending'))
+
+    def chunks():
+        yield content[:content.index(b'</live_event>') + 20]
+        raise requests.exceptions.ChunkedEncodingError('Connection broken: IncompleteRead')
+
+    response = mock_response(status=200)
+    response.iter_content = mock.Mock(return_value=chunks())
+    client.send_request = mock.Mock(return_value=response)
+
+    events = client.iter_events()
+    assert next(events)['id'] == '1'
+    with pytest.raises(InvalidRequest):
+        next(events)
+    response.close.assert_called_once_with()
+
+
+def test_iter_events_should_raise_InvalidResponse_on_a_garbled_list():
+    client = ElementalLive(ELEMENTAL_ADDRESS)
+    client.send_request = mock.Mock(return_value=streamed_response(b'<live_event_list><live_event></live_event_list>'))
+
+    with pytest.raises(InvalidResponse):
+        list(client.iter_events())
+
+
+def test_iter_events_should_parse_fixture_event_list():
+    client = ElementalLive(ELEMENTAL_ADDRESS)
+    client.send_request = mock.Mock(
+        return_value=streamed_response(file_fixture('sample_event_list.xml').encode('utf-8'), chunk_size=512))
+
+    events = list(client.iter_events())
+
+    assert [(event['id'], event['status'], event['device_names']) for event in events] == \
+        [('105', 'running', ['HD-SDI 1'])]
+
+
+def test_wait_for_status_should_back_off_until_target_is_reached():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
+    client.get_event_status = mock.Mock(side_effect=['pending', 'preprocessing', 'preprocessing', 'running'])
+    observed = []
+
+    with mock.patch('elemental.client.time.sleep') as sleep, \
+            mock.patch('elemental.client.random.uniform', side_effect=lambda low, high: high):
+        status = client.wait_for_status('1', ['running'], deadline=60, on_status=observed.append,
+                                        initial_interval=0.5, max_interval=1.5)
+
+    assert status == 'running'
+    assert observed == ['pending', 'preprocessing', 'running']
+    assert [call[0][0] for call in sleep.call_args_list] == [0.5, 1, 1.5]
+
+
+def test_wait_for_status_should_fail_fast_on_error_status():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
+    client.get_event_status = mock.Mock(side_effect=['pending', 'error'])
+
+    with mock.patch('elemental.client.time.sleep'), pytest.raises(UnexpectedStatus) as exc_info:
+        client.wait_until_running('1')
+
+    assert exc_info.value.status == 'error'
+    assert client.get_event_status.call_count == 2
+
+
+def test_wait_for_status_should_accept_a_failure_status_listed_as_target():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
+    client.get_event_status = mock.Mock(return_value='complete')
+
+    assert client.wait_for_status('1', ['complete']) == 'complete'
+
+
+def test_wait_for_status_should_raise_DeadlineExceeded():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY)
+    client.get_event_status = mock.Mock(return_value='pending')
+
+    with mock.patch('elemental.client.time.sleep'), \
+            mock.patch('elemental.client.time.monotonic', side_effect=[0, 1, 2, 31]), \
+            pytest.raises(DeadlineExceeded):
+        client.wait_for_status('1', ['running'], deadline=30)
+
+    assert client.get_event_status.call_count == 3
+
+
+def test_send_request_should_retry_idempotent_requests_on_5xx():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY, retry_policy=RetryPolicy(max_attempts=3))
+    client.session.request = mock.MagicMock(side_effect=[
+        mock_response(status=503, text='busy'),
+        requests.exceptions.ConnectionError(),
+        mock_response(status=200, text='ok'),
+    ])
+
+    with mock.patch('elemental.client.time.sleep') as sleep:
+        response = client.send_request('GET', f'{ELEMENTAL_ADDRESS}/live_events/1', HEADERS)
+
+    assert response.text == 'ok'
+    assert client.session.request.call_count == 3
+    assert sleep.call_count == 2
+
+
+def test_send_request_should_not_retry_non_idempotent_requests():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY, retry_policy=RetryPolicy(max_attempts=3))
+    client.session.request = mock.MagicMock(side_effect=requests.exceptions.ConnectTimeout())
+
+    with pytest.raises(ConnectionTimeout):
+        client.send_request('POST', f'{ELEMENTAL_ADDRESS}/live_events', HEADERS, REQUEST_BODY)
+
+    assert client.session.request.call_count == 1
+
+
+def test_send_request_should_fail_fast_while_circuit_is_open():
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY,
+                           circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    client.session.request = mock.MagicMock(return_value=mock_response(status=500, text='down'))
+
+    for _ in range(2):
+        with pytest.raises(InvalidResponse):
+            client.send_request('GET', f'{ELEMENTAL_ADDRESS}/live_events/1', HEADERS)
+    with pytest.raises(CircuitOpen):
+        client.send_request('GET', f'{ELEMENTAL_ADDRESS}/live_events/1', HEADERS)
+
+    assert client.session.request.call_count == 2
+
+
+def test_pool_options_should_configure_session_adapters():
+    client = ElementalLive(ELEMENTAL_ADDRESS, pool_connections=4, pool_maxsize=32, pool_block=True, keep_alive=False)
+
+    adapter = client.session.get_adapter('https://elemental.example.com')
+    assert adapter.poolmanager.connection_pool_kw['maxsize'] == 32
+    assert adapter.poolmanager.connection_pool_kw['block'] is True
+    assert client.session.headers['Connection'] == 'close'
+
+
+class EventRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.server.client_ports.add(self.client_address[1])
+        status, body = 200, file_fixture('sample_event.xml').encode('utf-8')
+        if self.path.endswith('/missing'):
+            status, body = 404, b'<errors><error>Not found</error></errors>'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def local_elemental():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), EventRequestHandler)
+    server.client_ports = set()
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_shared_client_should_be_safe_and_reuse_connections_across_threads():
+    with local_elemental() as server:
+        client = ElementalLive(f'http://127.0.0.1:{server.server_port}', USER, API_KEY, pool_maxsize=8)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            statuses = list(executor.map(lambda i: client.describe_event(str(i % 3))['status'], range(64)))
+
+    assert statuses == ['complete'] * 64
+    assert len(server.client_ports) <= 8
+
+
+def test_metrics_sink_should_receive_one_record_per_request():
+    records = []
+    with local_elemental() as server:
+        server_url = f'http://127.0.0.1:{server.server_port}'
+        client = ElementalLive(server_url, USER, API_KEY, metrics_sink=records.append)
+        client.describe_event('139')
+        with pytest.raises(NotFound):
+            client.get_event_xml('missing')
+
+    success, failure = records
+    assert success['operation'] == 'describe_event'
+    assert success['server_url'] == server_url
+    assert (success['http_method'], success['status_code'], success['exception']) == ('GET', 200, None)
+    assert success['response_bytes'] == len(file_fixture('sample_event.xml').encode('utf-8'))
+    assert success['request_bytes'] == 0
+    assert success['attempts'] == 1
+    assert 0 <= success['time_to_headers'] <= success['total_time']
+    assert (failure['operation'], failure['status_code'], failure['exception']) == ('get_event_xml', 404, 'NotFound')
+
+
+def test_metrics_sink_should_report_requests_that_never_got_a_response():
+    records = []
+    client = ElementalLive(ELEMENTAL_ADDRESS, USER, API_KEY, metrics_sink=records.append)
+    client.session.request = mock.MagicMock(side_effect=requests.exceptions.ConnectTimeout())
+
+    with pytest.raises(ConnectionTimeout):
+        client.start_event('1')
+
+    assert records[0]['operation'] == 'start_event'
+    assert records[0]['status_code'] is None
+    assert records[0]['request_bytes'] == len('<start></start>')
+    assert records[0]['exception'] == 'ConnectionTimeout'
@@ -0,0 +1,41 @@
+from unittest import mock
+
+import pytest
+
+from elemental.client import ElementalLive
+
+
+class FakeClock:
+    """Stands in for time.monotonic or time.time; tests move time by setting now"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _summary(event_id, status, destinations=('http://origin/a.m3u8',)):
+    return {'id': event_id, 'name': None, 'status': status, 'destinations': list(destinations), 'device_names': []}
+
+
+@pytest.fixture
+def summary():
+    """Builds an EventSummaryDict as iter_events yields it"""
+    return _summary
+
+
+@pytest.fixture
+def listing_client():
+    """Builds a mock ElementalLive answering one listing per iter_events call; exceptions among them are raised"""
+    def make(server_url, *ticks):
+        client = mock.Mock(spec=ElementalLive)
+        client.server_url = server_url
+        client.iter_events.side_effect = [tick if isinstance(tick, Exception) else iter(tick) for tick in ticks]
+        return client
+    return make
@@ -0,0 +1,54 @@
+import os
+
+from elemental.fingerprint import event_changed, event_covers, event_fingerprint
+
+
+def file_fixture(file_name):
+    with open(os.path.join("tests/fixtures", file_name), 'rb') as f:
+        return f.read()
+
+
+def test_fingerprint_should_ignore_order_whitespace_and_server_fields():
+    desired = '<live_event><name>a</name><input><order>1</order><device_name>HD-SDI 1</device_name></input></live_event>'
+    reported = '''<live_event href="/live_events/7" product="Elemental Live" version="2.14">
+      <id>7</id>
+      <status>running</status>
+      <input>
+        <id>9</id>
+        <device_name> HD-SDI 1 </device_name>
+        <order>1</order>
+      </input>
+      <name>a</name>
+      <user_data nil="true"/>
+    </live_event>'''
+
+    assert event_fingerprint(desired) == event_fingerprint(reported)
+
+
+def test_fingerprint_should_change_with_settings():
+    event = file_fixture('sample_event.xml')
+
+    assert event_fingerprint(event) == event_fingerprint(event.replace(b'<status>complete</status>',
+                                                                       b'<status>running</status>'))
+    assert event_fingerprint(event) != event_fingerprint(event.replace(b'HD-SDI 2', b'HD-SDI 3'))
+    assert event_fingerprint('<a><b>1</b><b>2</b></a>') != event_fingerprint('<a><b>1</b><b>1</b></a>')
+
+
+def test_event_covers_should_only_check_what_the_desired_document_sets():
+    event = file_fixture('sample_event.xml')
+    desired = '<live_event><name>morty demo channel</name><input><device_input><device_name>HD-SDI 2</device_name>' \
+              '</device_input></input><input_buffer_size nil="true"/></live_event>'
+
+    assert event_fingerprint(event) != event_fingerprint(desired)
+    assert event_covers(event, desired)
+    assert not event_covers(event, desired.replace('HD-SDI 2', 'HD-SDI 3'))
+    assert not event_covers(event, desired.replace('</live_event>', '<user_data>x</user_data></live_event>'))
+    assert not event_covers('<a><b>1</b></a>', '<a><b>1</b><b>1</b></a>')
+
+
+def test_event_changed_should_need_both_fingerprint_and_coverage_to_differ():
+    event = '<live_event><id>1</id><name>a</name><input><order>1</order></input></live_event>'
+
+    assert not event_changed(event, '<live_event><input><order>1</order></input><name>a</name></live_event>')
+    assert not event_changed(event, '<live_event><name>a</name></live_event>')
+    assert event_changed(event, '<live_event><name>b</name></live_event>')
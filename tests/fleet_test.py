@@ -0,0 +1,122 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from elemental.client import ConnectionTimeout, ElementalLive, InvalidResponse, NotFound
+from elemental.fleet import ElementalFleet
+
+DEVICE = {"id": "1", "name": None, "device_name": "HD-SDI 1", "device_number": "0", "device_type": "AJA",
+          "description": "AJA Capture Card", "channel": "1", "channel_type": "HD-SDI", "quad": "false",
+          "availability": True}
+
+
+def mock_client(server_url):
+    client = mock.Mock(spec=ElementalLive)
+    client.server_url = server_url
+    return client
+
+
+def test_from_urls_should_build_one_client_per_appliance():
+    fleet = ElementalFleet.from_urls(['http://a', 'http://b'], 'FAKE', 'FAKE')
+
+    assert len(fleet) == 2
+    assert fleet.clients['http://b'].server_url == 'http://b'
+
+
+def test_describe_event_should_key_results_and_errors_per_appliance():
+    healthy, broken = mock_client('http://a'), mock_client('http://b')
+    healthy.describe_event.return_value = {'status': 'running', 'origin_url': '', 'backup_url': None}
+    broken.describe_event.side_effect = ConnectionTimeout('timed out')
+
+    result = ElementalFleet([healthy, broken]).describe_event('7')
+
+    assert result['results'] == {'http://a': {'status': 'running', 'origin_url': '', 'backup_url': None}}
+    assert list(result['errors']) == ['http://b']
+    assert isinstance(result['errors']['http://b'], ConnectionTimeout)
+    healthy.describe_event.assert_called_once_with('7', timeout=None)
+
+
+def test_unreadable_answers_should_be_reported_per_appliance():
+    healthy, proxied = ElementalLive('http://a'), ElementalLive('http://b')
+    healthy.send_request = mock.Mock(return_value=mock.Mock(content=b'<live_event><status>running</status></live_event>'))
+    proxied.send_request = mock.Mock(return_value=mock.Mock(content=b'<html><body>Bad gateway</body>'))
+
+    result = ElementalFleet([healthy, proxied]).describe_event('7')
+
+    assert result['results']['http://a']['status'] == 'running'
+    assert isinstance(result['errors']['http://b'], InvalidResponse)
+
+
+def test_find_free_device_should_skip_busy_and_mismatched_devices():
+    busy, free = mock_client('http://a'), mock_client('http://b')
+    busy.get_input_devices.return_value = [dict(DEVICE, availability=False)]
+    free.get_input_devices.return_value = [dict(DEVICE, id='2', channel_type='3G-SDI'), dict(DEVICE, id='3')]
+
+    found = ElementalFleet([busy, free]).find_free_device(channel_type='HD-SDI')
+
+    assert found == {'server_url': 'http://b', 'device': dict(DEVICE, id='3')}
+
+
+def test_find_free_device_should_return_none_when_fleet_is_full():
+    busy = mock_client('http://a')
+    busy.get_input_devices.return_value = [dict(DEVICE, availability=False)]
+
+    assert ElementalFleet([busy]).find_free_device() is None
+
+
+def test_locate_event_should_drop_appliances_answering_not_found():
+    owner, other = mock_client('http://a'), mock_client('http://b')
+    owner.describe_event.return_value = {'status': 'running', 'origin_url': '', 'backup_url': None}
+    other.describe_event.side_effect = NotFound('404')
+
+    located = ElementalFleet([owner, other]).locate_event('7')
+
+    assert list(located['results']) == ['http://a']
+    assert located['errors'] == {}
+
+
+def test_control_outputs_should_group_commands_per_appliance_and_keep_input_order():
+    a, b = mock_client('http://a'), mock_client('http://b')
+    a.control_outputs.side_effect = lambda commands, **kwargs: [
+        {'server_url': 'http://a', 'event_id': e, 'output_id': o, 'action': act, 'error': None} for e, o, act in commands]
+    b.control_outputs.side_effect = lambda commands, **kwargs: [
+        {'server_url': 'http://b', 'event_id': e, 'output_id': o, 'action': act, 'error': None} for e, o, act in commands]
+
+    outcomes = ElementalFleet([a, b]).control_outputs(
+        [('http://a', '1', '1', 'pause'), ('http://b', '2', '1', 'pause'), ('http://a', '3', '1', 'pause')], timeout=1)
+
+    assert [(o['server_url'], o['event_id']) for o in outcomes] == [('http://a', '1'), ('http://b', '2'), ('http://a', '3')]
+    a.control_outputs.assert_called_once_with([('1', '1', 'pause'), ('3', '1', 'pause')], max_workers=10, deadline=None,
+                                              timeout=1)
+
+
+def test_control_outputs_should_reject_unknown_actions_before_sending_anything():
+    a, b = mock_client('http://a'), mock_client('http://b')
+
+    with pytest.raises(ValueError, match='Unknown output action paus'):
+        ElementalFleet([a, b]).control_outputs([('http://a', '1', '7', 'pause'), ('http://b', '1', '7', 'paus')])
+
+    a.control_outputs.assert_not_called()
+    b.control_outputs.assert_not_called()
+
+
+def test_control_outputs_should_run_every_appliance_at_once_under_one_deadline():
+    clients = [mock_client(f'http://{name}') for name in 'abc']
+    both_running = threading.Barrier(2, timeout=2)
+    deadlines = []
+
+    def control_outputs(commands, deadline, **kwargs):
+        deadlines.append(deadline)
+        both_running.wait()
+        return [{'server_url': None, 'event_id': e, 'output_id': o, 'action': act, 'error': None} for e, o, act in commands]
+    for client in clients:
+        client.control_outputs.side_effect = control_outputs
+    clients[2].control_outputs.side_effect = ConnectionTimeout('timed out')
+
+    outcomes = ElementalFleet(clients, max_workers=1).control_outputs(
+        [(client.server_url, '1', '1', 'pause') for client in clients], deadline=5)
+
+    assert [outcome['error'] for outcome in outcomes[:2]] == [None, None]
+    assert isinstance(outcomes[2]['error'], ConnectionTimeout)
+    assert all(0 < deadline <= 5 for deadline in deadlines)
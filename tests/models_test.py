@@ -0,0 +1,44 @@
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+from elemental.models import EventInput, LiveEvent
+
+
+def file_fixture(file_name):
+    with open(os.path.join("tests/fixtures", file_name), 'rb') as f:
+        return f.read()
+
+
+def test_live_event_should_read_summary_fields_from_bytes():
+    event = LiveEvent.from_xml(file_fixture('sample_event.xml'))
+
+    assert (event.id, event.name, event.status) == ('139', 'morty demo channel', 'complete')
+    assert event.origin_url == 'https://vmjhch43nfkghi.data.mediastore.us-east-1.amazonaws.com/mortyg3b4/master/mortyg3b4.m3u8'
+    assert event.backup_url == 'https://vmjhch43nfkghi.data.mediastore.us-east-1.amazonaws.com/mortyg3b4/backup/mortyg3b4.m3u8'
+
+
+def test_live_event_should_decode_every_section_without_keeping_the_document():
+    event = LiveEvent.from_xml(file_fixture('sample_event.xml'))
+
+    assert event.inputs == (EventInput(id='199', order='1', device_name='HD-SDI 2'),)
+    assert event.device_names == ('HD-SDI 2',)
+    assert [output.name_modifier for output in event.outputs[:2]] == ['_960x540_2997', '_400x224_2997']
+    assert event.outputs[0].id == '1436'
+    assert event.destinations[0] == event.origin_url
+    assert not any(isinstance(getattr(event, slot), ET.Element) for slot in LiveEvent.__slots__)
+
+
+def test_live_event_should_default_missing_fields():
+    event = LiveEvent.from_xml('<live_event href="/live_events/18"></live_event>')
+
+    assert (event.id, event.name, event.status) == ('18', None, 'unknown')
+    assert (event.origin_url, event.backup_url) == ('', None)
+    assert event.inputs == event.outputs == ()
+
+
+def test_live_event_should_not_carry_an_instance_dict():
+    event = LiveEvent.from_xml('<live_event><id>1</id></live_event>')
+
+    assert not hasattr(event, '__dict__')
+    assert sys.getsizeof(event) < 200
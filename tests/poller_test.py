@@ -0,0 +1,93 @@
+import threading
+from unittest import mock
+
+from elemental.client import ElementalLive, InvalidResponse
+from elemental.poller import EventStatusPoller
+
+
+def test_poll_should_report_first_observation_and_only_later_transitions(listing_client, summary):
+    client = listing_client(
+        'http://elemental',
+        [summary('1', 'pending'), summary('2', 'running')],
+        [summary('1', 'running'), summary('2', 'running')],
+    )
+    callback = mock.Mock()
+    poller = EventStatusPoller(client, ['1', '2'])
+    poller.on_change(callback)
+
+    assert poller.poll() == {'1': (None, 'pending'), '2': (None, 'running')}
+    assert poller.poll() == {'1': ('pending', 'running')}
+    callback.assert_called_with('1', 'pending', 'running')
+    assert callback.call_count == 3
+
+
+def test_poll_should_stop_listing_once_every_watched_event_was_seen(summary):
+    consumed = []
+
+    def events():
+        for event in [summary('1', 'running'), summary('2', 'pending'), summary('3', 'pending')]:
+            consumed.append(event['id'])
+            yield event
+
+    client = mock.Mock(spec=ElementalLive)
+    client.iter_events.return_value = events()
+
+    EventStatusPoller(client, ['1']).poll()
+
+    assert consumed == ['1']
+
+
+def test_poll_should_report_events_missing_from_the_list(listing_client, summary):
+    client = listing_client('http://elemental', [summary('1', 'running')], [])
+    poller = EventStatusPoller(client, ['1'])
+
+    poller.poll()
+
+    assert poller.poll() == {'1': ('running', None)}
+
+
+def test_poll_should_not_report_events_that_were_never_seen(listing_client, summary):
+    client = listing_client('http://elemental', [], [summary('1', 'pending')])
+    callback = mock.Mock()
+    poller = EventStatusPoller(client, ['1'])
+    poller.on_change(callback)
+
+    assert poller.poll() == {}
+    callback.assert_not_called()
+    assert poller.poll() == {'1': (None, 'pending')}
+
+
+def test_poll_should_skip_listing_without_watched_events(listing_client):
+    client = listing_client('http://elemental')
+
+    assert EventStatusPoller(client).poll() == {}
+    client.iter_events.assert_not_called()
+
+
+def test_start_should_keep_polling_after_errors(listing_client, summary):
+    polled = threading.Event()
+    client = listing_client('http://elemental', InvalidResponse('boom'), [summary('1', 'running')])
+    poller = EventStatusPoller(client, ['1'], interval=0.01)
+    poller.on_change(lambda *args: polled.set())
+
+    poller.start()
+    try:
+        assert polled.wait(2)
+    finally:
+        poller.stop(timeout=2)
+
+    assert poller.statuses == {'1': 'running'}
+
+
+def test_start_should_survive_errors_from_outside_the_client(listing_client, summary):
+    polled = threading.Event()
+    client = listing_client('http://elemental', ConnectionResetError('reset'), [summary('1', 'running')])
+    poller = EventStatusPoller(client, ['1'], interval=0.01)
+    poller.on_change(lambda *args: polled.set())
+
+    poller.start()
+    try:
+        assert polled.wait(2)
+        assert poller._thread.is_alive()
+    finally:
+        poller.stop(timeout=2)
@@ -0,0 +1,111 @@
+import pytest
+
+from elemental.client import ElementalLive
+from elemental.fleet import ElementalFleet
+from elemental.reconciler import Reconciler
+from elemental.simulator import ElementalSimulator
+
+
+def event_xml(name, device='HD-SDI 1'):
+    return f'<live_event><name>{name}</name><input><device_input><device_name>{device}</device_name></device_input></input></live_event>'
+
+
+def desired(server_url, name, device='HD-SDI 1', running=True):
+    return {'server_url': server_url, 'name': name, 'event_xml': event_xml(name, device), 'running': running}
+
+
+@pytest.fixture
+def appliance():
+    with ElementalSimulator(devices=4, preprocessing_time=0, postprocessing_time=0) as simulator:
+        client = ElementalLive(simulator.url)
+        yield simulator, client, Reconciler(ElementalFleet([client]), prune=True)
+
+
+def actions(plan):
+    return [(operation['event_name'], operation['action']) for operation in plan['operations']]
+
+
+def test_dry_run_should_plan_without_touching_the_appliance(appliance):
+    simulator, client, reconciler = appliance
+    client.create_event(event_xml('stale'))
+
+    result = reconciler.reconcile([desired(simulator.url, 'news')], dry_run=True)
+
+    assert actions(result['plan']) == [('stale', 'cancel'), ('stale', 'delete'), ('news', 'create'), ('news', 'start')]
+    assert result['applied'] == []
+    assert [event.document.findtext('name') for event in simulator.events.values()] == ['stale']
+
+
+def test_reconcile_should_converge_and_then_plan_nothing(appliance):
+    simulator, client, reconciler = appliance
+    stale = client.create_event(event_xml('stale', 'HD-SDI 2'))['id']
+    client.start_event(stale)
+    changed = client.create_event(event_xml('sports', 'HD-SDI 3'))['id']
+    state = [desired(simulator.url, 'news'), desired(simulator.url, 'sports', 'HD-SDI 4', running=False)]
+
+    result = reconciler.reconcile(state)
+
+    assert result['errors'] == []
+    assert sorted(actions(result['plan'])) == [('news', 'create'), ('news', 'start'), ('sports', 'update'),
+                                               ('stale', 'cancel'), ('stale', 'delete')]
+    assert {event['name']: event['status'] for event in client.iter_events()} == {'news': 'running', 'sports': 'pending'}
+    assert simulator.events[changed].device_names == ['HD-SDI 4']
+    assert reconciler.plan(state)['operations'] == []
+
+
+def test_reconcile_should_restart_finished_events_and_stop_unwanted_ones(appliance):
+    simulator, client, reconciler = appliance
+    finished = client.create_event(event_xml('news'))['id']
+    client.start_event(finished)
+    client.stop_event(finished)
+    running = client.create_event(event_xml('sports', 'HD-SDI 2'))['id']
+    client.start_event(running)
+
+    result = reconciler.reconcile([desired(simulator.url, 'news'),
+                                   desired(simulator.url, 'sports', 'HD-SDI 2', running=False)])
+
+    assert actions(result['plan']) == [('news', 'reset'), ('news', 'start'), ('sports', 'stop')]
+    assert (client.get_event_status(finished), client.get_event_status(running)) == ('running', 'complete')
+
+
+def test_settings_the_desired_xml_leaves_out_should_not_cause_updates(appliance):
+    simulator, client, reconciler = appliance
+    # An appliance reports every setting, defaults included
+    reported = event_xml('news').replace('</live_event>', '<loop_all_inputs>false</loop_all_inputs>'
+                                         '<output_group><order>1</order></output_group></live_event>')
+    client.start_event(client.create_event(reported)['id'])
+
+    assert reconciler.plan([desired(simulator.url, 'news')])['operations'] == []
+
+
+def test_plan_should_read_each_matched_event_once(appliance):
+    simulator, client, reconciler = appliance
+    for name in ('news', 'sports', 'weather'):
+        client.create_event(event_xml(name).replace('</live_event>', '<loop_all_inputs>false</loop_all_inputs></live_event>'))
+    requests_sent = simulator.requests
+
+    reconciler.plan([desired(simulator.url, name, running=False) for name in ('news', 'sports', 'weather')])
+
+    # One listing, then one read per event
+    assert simulator.requests - requests_sent == 4
+
+
+def test_failed_operations_should_stop_their_event_chain_only(appliance):
+    simulator, client, reconciler = appliance
+    busy = client.create_event(event_xml('busy'))['id']
+    client.start_event(busy)
+    reconciler.prune = False
+
+    result = reconciler.reconcile([desired(simulator.url, 'busy'), desired(simulator.url, 'clash'),
+                                   desired(simulator.url, 'free', 'HD-SDI 2')])
+
+    assert [(operation['event_name'], operation['action']) for operation, _ in result['errors']] == [('clash', 'start')]
+    assert sorted(actions({'operations': result['applied']})) == [
+        ('clash', 'create'), ('free', 'create'), ('free', 'start')]
+
+
+def test_plan_should_reject_appliances_outside_the_fleet(appliance):
+    simulator, client, reconciler = appliance
+
+    with pytest.raises(ValueError):
+        reconciler.plan([desired('http://elsewhere', 'news')])
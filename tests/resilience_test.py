@@ -0,0 +1,62 @@
+from unittest import mock
+
+import pytest
+
+from elemental.resilience import CircuitBreaker, RetryPolicy
+
+
+@pytest.mark.parametrize('method,attempt,status_code,expected', [
+    ('GET', 1, None, True),
+    ('GET', 1, 503, True),
+    ('DELETE', 2, 502, True),
+    ('GET', 3, 503, False),
+    ('GET', 1, 500, False),
+    ('POST', 1, None, False),
+])
+def test_should_retry_only_idempotent_methods_and_retryable_failures(method, attempt, status_code, expected):
+    assert RetryPolicy(max_attempts=3).should_retry(method, attempt, status_code) is expected
+
+
+def test_backoff_should_grow_exponentially_up_to_the_cap():
+    policy = RetryPolicy(backoff_base=0.5, backoff_max=3)
+
+    with mock.patch('elemental.resilience.random.uniform', side_effect=lambda low, high: high):
+        assert [policy.backoff(attempt) for attempt in (1, 2, 3, 4)] == [0.5, 1, 2, 3]
+
+
+def test_circuit_breaker_should_open_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_circuit_breaker_should_let_one_probe_through_when_half_open(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_circuit_breaker_should_reopen_when_probe_fails(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.allow_request()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
@@ -0,0 +1,96 @@
+import pytest
+
+from elemental.client import ElementalLive, InvalidResponse, NotFound
+from elemental.simulator import THUMBNAIL, ElementalSimulator
+
+EVENT_XML = '''<live_event>
+  <name>simulated</name>
+  <input><device_input><device_name>HD-SDI 1</device_name></device_input></input>
+  <output_group><output><destination><uri>http://origin/primary.m3u8</uri></destination></output></output_group>
+</live_event>'''
+
+
+@pytest.fixture
+def simulation(clock):
+    with ElementalSimulator(devices=2, preprocessing_time=1, postprocessing_time=1, clock=clock) as simulator:
+        yield simulator, clock, ElementalLive(simulator.url, 'FAKE', 'FAKE')
+
+
+def test_event_should_follow_the_live_state_machine(simulation):
+    simulator, clock, client = simulation
+    event_id = client.create_event(EVENT_XML)['id']
+    assert client.get_event_status(event_id) == 'pending'
+
+    client.start_event(event_id)
+    assert client.get_event_status(event_id) == 'preprocessing'
+    clock.now = 1
+    assert client.get_event_status(event_id) == 'running'
+
+    client.stop_event(event_id)
+    assert client.get_event_status(event_id) == 'postprocessing'
+    clock.now = 2
+    assert client.describe_event(event_id) == {'status': 'complete', 'origin_url': 'http://origin/primary.m3u8',
+                                               'backup_url': None}
+
+
+def test_running_event_should_occupy_its_device(simulation):
+    simulator, clock, client = simulation
+    first = client.create_event(EVENT_XML)['id']
+    second = client.create_event(EVENT_XML)['id']
+    client.start_event(first)
+
+    assert [device['availability'] for device in client.get_input_devices()] == [False, True]
+    assert client.find_devices_in_use() == {'HD-SDI 1'}
+    with pytest.raises(InvalidResponse):
+        client.start_event(second)
+    with pytest.raises(Exception, match='already in use'):
+        client.generate_preview('1')
+    assert client.generate_preview('2')['preview_url'].endswith('/images/thumbs/p_1_job_0.jpg')
+
+
+def test_active_event_should_not_be_deletable(simulation):
+    simulator, clock, client = simulation
+    event_id = client.create_event(EVENT_XML)['id']
+    client.start_event(event_id)
+
+    with pytest.raises(InvalidResponse, match='not deletable'):
+        client.delete_event(event_id)
+    client.cancel_event(event_id)
+    client.delete_event(event_id)
+
+    with pytest.raises(NotFound):
+        client.get_event_status(event_id)
+
+
+def test_outputs_and_listing_should_work_through_the_client(simulation):
+    simulator, clock, client = simulation
+    ids = [client.create_event(EVENT_XML)['id'] for _ in range(5)]
+
+    client.event_pause_output(ids[0], '7')
+    assert simulator.events[ids[0]].paused_outputs == {'7'}
+    client.event_unpause_output(ids[0], '7')
+    assert simulator.events[ids[0]].paused_outputs == set()
+    assert [event['id'] for event in client.iter_events(page_size=2)] == ids
+
+
+def test_error_injection_should_fail_requests():
+    with ElementalSimulator(error_rate=1.0, seed=1) as simulator:
+        client = ElementalLive(simulator.url)
+        with pytest.raises(InvalidResponse, match='Injected failure'):
+            client.get_input_devices()
+        assert simulator.requests == 1
+
+
+def test_generate_previews_should_cache_thumbnails_per_input():
+    with ElementalSimulator(devices=2) as simulator:
+        client = ElementalLive(simulator.url, thumbnail_ttl=60)
+
+        previews = client.generate_previews(['1', '2', '9'], fetch_thumbnails=True)
+        requests_sent = simulator.requests
+        again = client.generate_previews(['1', '2'], fetch_thumbnails=True)
+
+    assert set(previews['results']) == {'1', '2'}
+    assert previews['results']['1']['thumbnail'] == THUMBNAIL
+    assert 'Device not found' in str(previews['errors']['9'])
+    assert again['results'] == {input_id: previews['results'][input_id] for input_id in ('1', '2')}
+    assert simulator.requests == requests_sent
@@ -0,0 +1,125 @@
+import time
+from concurrent.futures import wait
+
+import pytest
+
+from elemental.client import ElementalLive, NotFound
+from elemental.simulator import ElementalSimulator
+from elemental.snapshots import SnapshotStore
+
+EVENT_XML = '''<live_event>
+  <name>{name}</name>
+  <input><device_input><device_name>HD-SDI 1</device_name></device_input></input>
+  <output_group><output><destination><uri>{origin}</uri></destination></output></output_group>
+</live_event>'''
+
+
+def wait_for_refreshes(client):
+    wait(list(client._snapshot_refreshes.values()))
+
+
+@pytest.fixture
+def simulator():
+    with ElementalSimulator(devices=2, preprocessing_time=0) as simulator:
+        ElementalLive(simulator.url).create_event(EVENT_XML.format(name='news', origin='http://origin/news.m3u8'))
+        yield simulator
+
+
+def test_find_events_should_filter_by_status_and_destination(clock):
+    clock.now = 1000.0
+    store = SnapshotStore(clock=clock)
+    store.record_event('http://a', '1', EVENT_XML.format(name='news', origin='http://origin/news.m3u8')
+                       .replace('<name>', '<status>running</status><name>'))
+    store.record_event('http://a', '2', EVENT_XML.format(name='sports', origin='http://origin/sports.m3u8'))
+    store.record_event('http://b', '1', EVENT_XML.format(name='news', origin='http://origin/news.m3u8'))
+
+    news = store.find_events(destination='http://origin/news.m3u8')
+    assert [(event['server_url'], event['id']) for event in news] == [('http://a', '1'), ('http://b', '1')]
+    assert store.find_events(status='running', destination='http://origin/news.m3u8') == [{
+        'server_url': 'http://a', 'id': '1', 'name': 'news', 'status': 'running',
+        'destinations': ['http://origin/news.m3u8'], 'device_names': ['HD-SDI 1'], 'fetched_at': 1000.0,
+    }]
+
+    store.record_event('http://a', '1', EVENT_XML.format(name='news', origin='http://origin/moved.m3u8'))
+    assert [event['server_url'] for event in store.find_events(destination='http://origin/news.m3u8')] == ['http://b']
+    store.forget_event('http://b', '1')
+    assert store.find_events(destination='http://origin/news.m3u8') == []
+    assert store.describe_event('http://b', '1') is None
+
+
+def test_store_should_survive_reopening(tmp_path):
+    path = str(tmp_path / 'snapshots.db')
+    store = SnapshotStore(path)
+    store.record_event('http://a', '1', EVENT_XML.format(name='news', origin='http://origin/news.m3u8'), fetched_at=5)
+    store.record_devices('http://a', [], fetched_at=6)
+    store.close()
+
+    reopened = SnapshotStore(path)
+    assert reopened.describe_event('http://a', '1') == (
+        {'status': 'unknown', 'origin_url': 'http://origin/news.m3u8', 'backup_url': None}, 5)
+    assert reopened.get_input_devices('http://a') == ([], 6)
+
+
+def test_client_should_fetch_what_the_store_has_never_seen_and_reuse_it_while_fresh(simulator, clock):
+    store = SnapshotStore(clock=clock)
+    client = ElementalLive(simulator.url, snapshot_store=store, snapshot_ttl=30)
+
+    assert client.describe_event('1')['status'] == 'pending'
+    requests_sent = simulator.requests
+    assert client.get_event_xml('1') == store.get_event_xml(simulator.url, '1')[0]
+    assert client.describe_event('1')['origin_url'] == 'http://origin/news.m3u8'
+    assert simulator.requests == requests_sent
+
+
+def test_client_should_serve_stale_snapshot_and_revalidate_in_background(simulator, clock):
+    store = SnapshotStore(clock=clock)
+    ElementalLive(simulator.url, snapshot_store=store).get_input_devices()
+    ElementalLive(simulator.url).start_event('1')
+
+    # A restarted process answers from the store at once
+    client = ElementalLive(simulator.url, snapshot_store=store, snapshot_ttl=30)
+    clock.now += 60
+    assert [device['availability'] for device in client.get_input_devices()] == [True, True]
+    wait_for_refreshes(client)
+    devices, fetched_at = store.get_input_devices(simulator.url)
+    assert [device['availability'] for device in devices] == [False, True]
+    assert fetched_at == clock.now
+
+
+def test_client_should_not_read_its_own_writes_from_the_store(simulator, clock):
+    store = SnapshotStore(clock=clock)
+    client = ElementalLive(simulator.url, snapshot_store=store, snapshot_ttl=30)
+    assert client.describe_event('1')['status'] == 'pending'
+    client.get_input_devices()
+
+    client.start_event('1')
+
+    assert client.describe_event('1')['status'] == 'running'
+    assert [device['availability'] for device in client.get_input_devices()] == [False, True]
+
+
+def test_client_should_forget_events_deleted_behind_its_back(simulator, clock):
+    store = SnapshotStore(clock=clock)
+    client = ElementalLive(simulator.url, snapshot_store=store, snapshot_ttl=30)
+    client.describe_event('1')
+    ElementalLive(simulator.url).cancel_event('1')
+    ElementalLive(simulator.url).delete_event('1')
+    clock.now += 60
+
+    assert client.describe_event('1')['status'] == 'pending'
+    deadline = time.monotonic() + 2
+    while store.describe_event(simulator.url, '1') is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert store.describe_event(simulator.url, '1') is None
+    with pytest.raises(NotFound):
+        client.describe_event('1')
+
+
+def test_event_can_delete_should_not_trust_the_store(simulator, clock):
+    store = SnapshotStore(clock=clock)
+    store.record_event(simulator.url, '1', EVENT_XML.format(name='news', origin='http://origin/news.m3u8')
+                       .replace('<name>', '<status>complete</status><name>'))
+    client = ElementalLive(simulator.url, snapshot_store=store, snapshot_ttl=30)
+
+    assert client.event_can_delete('1') is False
@@ -0,0 +1,71 @@
+import xml.etree.ElementTree as ET
+from unittest import mock
+
+import pytest
+
+from elemental.client import ElementalLive
+from elemental.templates import EventTemplate
+
+BASE_EVENT = '''<?xml version="1.0" encoding="UTF-8"?>
+<live_event>
+  <name>base</name>
+  <input><device_input><device_name>HD-SDI 1</device_name></device_input></input>
+  <stream_assembly><video_description><h264_settings><bitrate>5000000</bitrate></h264_settings></video_description></stream_assembly>
+  <stream_assembly><video_description><h264_settings><bitrate>1000000</bitrate></h264_settings></video_description></stream_assembly>
+  <output_group><destination><uri/></destination></output_group>
+</live_event>'''
+
+PARAMETERS = {
+    'name': 'name',
+    'device_name': 'input/device_input/device_name',
+    'top_bitrate': 'stream_assembly[1]/video_description/h264_settings/bitrate',
+    'origin_url': 'output_group/destination/uri',
+}
+
+
+def test_render_should_substitute_and_escape_values():
+    template = EventTemplate(BASE_EVENT, PARAMETERS)
+
+    event = ET.fromstring(template.render(name='a & <b>', origin_url='http://origin/live.m3u8?a=1&b=2',
+                                          top_bitrate=6000000))
+
+    assert event.findtext('name') == 'a & <b>'
+    assert event.findtext('input/device_input/device_name') == 'HD-SDI 1'
+    assert [bitrate.text for bitrate in event.iter('bitrate')] == ['6000000', '1000000']
+    assert event.findtext('output_group/destination/uri') == 'http://origin/live.m3u8?a=1&b=2'
+
+
+def test_render_should_reject_unknown_and_missing_parameters():
+    template = EventTemplate(BASE_EVENT, PARAMETERS)
+
+    with pytest.raises(TypeError, match='Missing event template parameter: origin_url'):
+        template.render()
+    with pytest.raises(TypeError, match='Unknown event template parameters: bitrate'):
+        template.bind(origin_url='http://origin', bitrate=1)
+
+
+@pytest.mark.parametrize('event_xml,parameters,message', [
+    ('<live_event_list/>', {}, 'root must be live_event'),
+    (BASE_EVENT, {'origin_url': 'output/destination/uri'}, 'matches no element'),
+    (BASE_EVENT, {'input': 'input'}, 'must target leaf elements'),
+    ('<live_event><name>a&#xE000;0&#xE000;b</name></live_event>', {}, r'must not contain U\+E000'),
+    ('<live_event><name>a</name></live_event>', {'name': 'name', 'title': './name'},
+     'Parameters name and title target the same element'),
+])
+def test_template_should_be_validated_when_compiled(event_xml, parameters, message):
+    with pytest.raises(ValueError, match=message):
+        EventTemplate(event_xml, parameters)
+
+
+def test_create_and_update_event_should_accept_bound_templates():
+    template = EventTemplate(BASE_EVENT, PARAMETERS)
+    client = ElementalLive('http://elemental')
+    client.send_request = mock.Mock(return_value=mock.Mock(content=b'<live_event><id>7</id></live_event>'))
+    bound = template.bind(origin_url='http://origin/7.m3u8')
+
+    assert client.create_event(bound) == {'id': '7'}
+    client.update_event('7', bound)
+
+    for call in client.send_request.call_args_list:
+        assert call.kwargs['body'] == bound.render()
+        assert '<uri>http://origin/7.m3u8</uri>' in call.kwargs['body']